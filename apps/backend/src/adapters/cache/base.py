@@ -15,11 +15,17 @@ Uzinex Boost — Cache Backend Base
 from __future__ import annotations
 
 import abc
-import json
 import asyncio
 from datetime import timedelta
 from typing import Any, Optional, Union
 
+import msgspec
+
+
+# JSON кодируется msgspec (C-расширение): чтение кэша на горячих путях без json.loads
+_json_encoder = msgspec.json.Encoder()
+_json_decoder = msgspec.json.Decoder()
+
 
 class CacheBackend(abc.ABC):
     """
@@ -44,6 +50,23 @@ class CacheBackend(abc.ABC):
     async def delete(self, key: str) -> int:
         """Удаляет ключ (возвращает кол-во удалённых записей)."""
 
+    async def delete_many(self, *keys: str) -> int:
+        """Удаляет несколько ключей (реализации могут сделать это одной командой)."""
+        deleted = 0
+        for key in keys:
+            deleted += await self.delete(key)
+        return deleted
+
+    async def set_nx(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """
+        Сохраняет значение, только если ключа ещё нет (для коротких блокировок).
+        Возвращает True, если значение записано. Реализация по умолчанию не атомарна —
+        бэкенды переопределяют её одной командой.
+        """
+        if await self.exists(key):
+            return False
+        return await self.set(key, value, expire=expire)
+
     @abc.abstractmethod
     async def exists(self, key: str) -> bool:
         """Проверяет существование ключа."""
@@ -75,16 +98,16 @@ class CacheBackend(abc.ABC):
     @staticmethod
     def to_json(value: Any) -> str:
         """Сериализация Python-объекта в JSON."""
-        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return _json_encoder.encode(value).decode()
 
     @staticmethod
-    def from_json(value: Optional[str]) -> Any:
-        """Десериализация JSON в Python-объект."""
+    def from_json(value: Optional[Union[str, bytes]]) -> Any:
+        """Десериализация JSON (str или bytes) в Python-объект."""
         if value is None:
             return None
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return _json_decoder.decode(value)
+        except msgspec.DecodeError:
             return value
 
     @staticmethod
@@ -143,6 +166,15 @@ class MemoryCache(CacheBackend):
             self._ttl.pop(key, None)
             return int(existed)
 
+    async def set_nx(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        async with self._lock:
+            if key in self._store:
+                return False
+            self._store[key] = value
+            if expire:
+                self._ttl[key] = asyncio.get_event_loop().time() + expire
+            return True
+
     async def exists(self, key: str) -> bool:
         async with self._lock:
             return key in self._store
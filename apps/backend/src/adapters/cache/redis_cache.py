@@ -123,6 +123,17 @@ class RedisCache(CacheBackend):
         except Exception as e:
             raise CacheInternalError(f"SET failed for {key}", cause=e)
 
+    async def set_nx(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        client = await self.ensure_connection()
+        try:
+            if not isinstance(value, str):
+                value = self.to_json(value)
+            return bool(await client.set(key, value, ex=self.ttl(expire), nx=True))
+        except TypeError as e:
+            raise CacheSerializationError(f"Invalid type for key {key}", cause=e)
+        except Exception as e:
+            raise CacheInternalError(f"SET NX failed for {key}", cause=e)
+
     async def delete(self, key: str) -> int:
         client = await self.ensure_connection()
         try:
@@ -130,6 +141,15 @@ class RedisCache(CacheBackend):
         except Exception as e:
             raise CacheInternalError(f"DELETE failed for {key}", cause=e)
 
+    async def delete_many(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        client = await self.ensure_connection()
+        try:
+            return await client.delete(*keys)
+        except Exception as e:
+            raise CacheInternalError(f"DELETE failed for {', '.join(keys)}", cause=e)
+
     async def exists(self, key: str) -> bool:
         client = await self.ensure_connection()
         try:
@@ -11,13 +11,18 @@ Uzinex Boost — Cache Utilities
 
 from __future__ import annotations
 
-import json
 import time
 import hashlib
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union
 
+import msgspec
+
+
+_json_encoder = msgspec.json.Encoder()
+_json_decoder = msgspec.json.Decoder()
+
 
 # ----------------------------
 # 🔹 Формирование ключей
@@ -68,17 +73,17 @@ def is_expired(created_at: float, ttl: int) -> bool:
 def to_json(value: Any) -> str:
     """Безопасная сериализация Python → JSON."""
     try:
-        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return _json_encoder.encode(value).decode()
     except Exception as e:
         raise ValueError(f"JSON serialization error: {e}")
 
 
-def from_json(value: Optional[str]) -> Any:
-    """Безопасная десериализация JSON → Python."""
+def from_json(value: Optional[Union[str, bytes]]) -> Any:
+    """Безопасная десериализация JSON (str или bytes) → Python."""
     if value is None:
         return None
     try:
-        return json.loads(value)
+        return _json_decoder.decode(value)
     except Exception:
         return value
 
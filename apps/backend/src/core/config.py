@@ -52,6 +52,12 @@ class Settings(BaseSettings):
     DB_USER: str = Field("postgres", description="Имя пользователя базы данных")
     DB_PASSWORD: str = Field("postgres", description="Пароль пользователя базы данных")
     DB_NAME: str = Field("uzinex_boost", description="Имя базы данных")
+    DB_POOL_SIZE: int = Field(20, description="Размер пула соединений SQLAlchemy")
+    DB_MAX_OVERFLOW: int = Field(40, description="Допустимое превышение пула соединений")
+    DB_POOL_RECYCLE: int = Field(1800, description="Время жизни соединения в пуле (сек)")
+    DB_POOL_TIMEOUT: int = Field(5, description="Ожидание свободного соединения пула (сек)")
+    DB_STATEMENT_CACHE_SIZE: int = Field(1024, description="Размер кэша prepared statements asyncpg")
+    OUTBOX_RETENTION_HOURS: int = Field(72, description="Хранение отправленных событий outbox (ч)")
 
     # --- ⚙️ Redis / Cache ---
     REDIS_HOST: str = Field("localhost", description="Хост Redis")
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from core.config import settings
 from db.base import Base  # безопасно, т.к. теперь db/base не тянет core обратно
@@ -18,11 +19,28 @@ logger = logging.getLogger("uzinex.core.database")
 # -------------------------------------------------
 # 🔹 Асинхронный движок
 # -------------------------------------------------
+# TCP keepalive на стороне PostgreSQL не даёт NAT / k8s молча рвать простаивающие соединения пула.
+# Пул задан явно: выдача соединений не блокирует event loop, а короткий pool_timeout
+# превращает исчерпание пула в быструю ошибку вместо зависания запросов.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "server_settings": {
+            "tcp_keepalives_idle": "30",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
+            "application_name": "uzinex-backend",
+        },
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
 # -------------------------------------------------
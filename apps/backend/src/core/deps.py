@@ -18,6 +18,8 @@ from __future__ import annotations
 import logging
 from typing import AsyncGenerator
 
+from sqlalchemy import text
+
 from core import settings, get_logger
 from core.database import get_async_session
 from adapters.cache.redis_cache import RedisCache
@@ -87,7 +89,7 @@ async def system_health_check() -> dict[str, bool]:
 
     try:
         async for session in get_async_session():
-            await session.execute("SELECT 1")
+            await session.execute(text("SELECT 1"))
             db_ok = True
             break
     except Exception as e:
@@ -12,7 +12,8 @@ Uzinex Boost Core — Logging Configuration
 - цветное форматирование в DEV;
 - структурированные логи в PROD;
 - совместимость с Railway / Docker;
-- автоматическая настройка логгеров FastAPI и Uvicorn.
+- автоматическая настройка логгеров FastAPI и Uvicorn;
+- запись логов loguru (сервисы домена) из фонового потока, вне event loop.
 """
 
 from __future__ import annotations
@@ -20,6 +21,9 @@ import logging
 import sys
 import os
 from datetime import datetime
+
+from loguru import logger as loguru_logger
+
 from core.config import settings
 
 
@@ -105,6 +109,12 @@ def setup_logging(force: bool = False) -> None:
 
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+    # Loguru: записи кладутся в очередь и пишутся в stderr отдельным потоком —
+    # self.log(...) в сервисах не блокирует event loop на выводе.
+    # Остаток очереди дописывается при остановке (`await logger.complete()`).
+    loguru_logger.remove()
+    loguru_logger.add(sys.stderr, level=settings.LOG_LEVEL.upper(), enqueue=True)
+
     # Итоговое сообщение
     env = settings.APP_ENV.upper()
     root_logger.info(f"🔧 Logging configured (level={settings.LOG_LEVEL}, env={env})")
@@ -0,0 +1,74 @@
+"""user counters, last_active_ts and outbox
+
+Revision ID: 3f2a9c1d7b40
+Revises: None
+Create Date: 2026-10-16 09:00:00.000000
+
+Author: Uzinex Engineering Team
+App: Uzinex Boost v2.0
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply database schema changes."""
+    # Схема могла быть создана create_all на старте приложения — операции идемпотентны
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN IF NOT EXISTS rating DOUBLE PRECISION NOT NULL DEFAULT 5.0, "
+        "ADD COLUMN IF NOT EXISTS active_tasks_count INTEGER NOT NULL DEFAULT 0, "
+        "ADD COLUMN IF NOT EXISTS last_active_ts BIGINT"
+    )
+
+    # Счётчик заданий исполнителя: число его заданий в статусе PENDING
+    op.execute(
+        """
+        UPDATE users SET active_tasks_count = COALESCE(
+            (SELECT COUNT(*) FROM tasks
+             WHERE tasks.user_id = users.id AND tasks.status = 'PENDING'),
+            0
+        )
+        """
+    )
+    # last_active_at хранится как naive UTC: EXTRACT(EPOCH) даёт секунды от эпохи UTC
+    op.execute(
+        "UPDATE users SET last_active_ts = EXTRACT(EPOCH FROM last_active_at)::bigint "
+        "WHERE last_active_at IS NOT NULL AND last_active_ts IS NULL"
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_balance_transactions_user_type_created "
+        "ON balance_transactions (user_id, type, created_at)"
+    )
+
+    if not sa.inspect(op.get_bind()).has_table("outbox"):
+        op.create_table(
+            "outbox",
+            sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+            sa.Column("aggregate_id", sa.BigInteger(), nullable=True),
+            sa.Column("event_type", sa.String(length=64), nullable=False),
+            sa.Column("payload_json", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("sent_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_outbox_unsent ON outbox (id) WHERE sent_at IS NULL")
+
+
+def downgrade():
+    """Revert database schema changes."""
+    op.drop_index("ix_outbox_unsent", table_name="outbox")
+    op.drop_table("outbox")
+    op.drop_index("ix_balance_transactions_user_type_created", table_name="balance_transactions")
+    op.drop_column("users", "last_active_ts")
+    op.drop_column("users", "active_tasks_count")
+    op.drop_column("users", "rating")
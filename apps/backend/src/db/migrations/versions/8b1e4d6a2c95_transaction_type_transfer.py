@@ -0,0 +1,36 @@
+"""transactiontype: TRANSFER
+
+Revision ID: 8b1e4d6a2c95
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-16 10:00:00.000000
+
+Author: Uzinex Engineering Team
+App: Uzinex Boost v2.0
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic.
+revision = '8b1e4d6a2c95'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply database schema changes."""
+    # Enum хранит имена членов TransactionType; ADD VALUE выполняется вне транзакции
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE transactiontype ADD VALUE IF NOT EXISTS 'TRANSFER'")
+
+
+def downgrade():
+    """Revert database schema changes."""
+    # PostgreSQL не удаляет значения enum; старые переводы возвращаются к прежним типам
+    op.execute(
+        "UPDATE balance_transactions "
+        "SET type = CASE WHEN amount < 0 THEN 'WITHDRAW' ELSE 'DEPOSIT' END::transactiontype "
+        "WHERE type = 'TRANSFER'"
+    )
@@ -0,0 +1,35 @@
+"""transactiontype: ESCROW
+
+Revision ID: c47d0e93a1f2
+Revises: 8b1e4d6a2c95
+Create Date: 2026-10-16 11:00:00.000000
+
+Author: Uzinex Engineering Team
+App: Uzinex Boost v2.0
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic.
+revision = 'c47d0e93a1f2'
+down_revision = '8b1e4d6a2c95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply database schema changes."""
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE transactiontype ADD VALUE IF NOT EXISTS 'ESCROW'")
+
+
+def downgrade():
+    """Revert database schema changes."""
+    # PostgreSQL не удаляет значения enum; удержания и возвраты переводятся в прежние типы
+    op.execute(
+        "UPDATE balance_transactions "
+        "SET type = CASE WHEN amount < 0 THEN 'WITHDRAW' ELSE 'DEPOSIT' END::transactiontype "
+        "WHERE type = 'ESCROW'"
+    )
@@ -0,0 +1,42 @@
+"""outbox: dead letter columns
+
+Revision ID: e5b93f27c8d1
+Revises: c47d0e93a1f2
+Create Date: 2026-10-16 12:00:00.000000
+
+Author: Uzinex Engineering Team
+App: Uzinex Boost v2.0
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic.
+revision = 'e5b93f27c8d1'
+down_revision = 'c47d0e93a1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply database schema changes."""
+    op.execute(
+        "ALTER TABLE outbox "
+        "ADD COLUMN IF NOT EXISTS failed_at TIMESTAMP WITHOUT TIME ZONE, "
+        "ADD COLUMN IF NOT EXISTS error TEXT"
+    )
+    # Релей больше не берёт события из dead letter — они исключаются из частичного индекса
+    op.execute("DROP INDEX IF EXISTS ix_outbox_unsent")
+    op.execute(
+        "CREATE INDEX ix_outbox_unsent ON outbox (id) "
+        "WHERE sent_at IS NULL AND failed_at IS NULL"
+    )
+
+
+def downgrade():
+    """Revert database schema changes."""
+    op.execute("DROP INDEX IF EXISTS ix_outbox_unsent")
+    op.execute("CREATE INDEX ix_outbox_unsent ON outbox (id) WHERE sent_at IS NULL")
+    op.drop_column("outbox", "error")
+    op.drop_column("outbox", "failed_at")
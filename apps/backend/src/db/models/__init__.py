@@ -24,6 +24,7 @@ from .order_model import Order
 from .task_model import Task
 from .payment_model import Payment
 from .referral_model import Referral
+from .outbox_model import OutboxEvent
 
 __all__ = [
     "Base",
@@ -33,4 +34,5 @@ __all__ = [
     "Task",
     "Payment",
     "Referral",
+    "OutboxEvent",
 ]
@@ -25,6 +25,7 @@ from typing import Optional
 from sqlalchemy import (
     Enum,
     ForeignKey,
+    Index,
     String,
     Float,
     DateTime,
@@ -45,6 +46,8 @@ class TransactionType(str, enum.Enum):
     TASK_REWARD = "task_reward" # Заработок за выполнение
     REFERRAL_BONUS = "ref_bonus" # Бонус за приглашение
     ADMIN_ADJUST = "admin"      # Ручное изменение админом
+    TRANSFER = "transfer"       # Перевод между пользователями (обе стороны)
+    ESCROW = "escrow"           # Удержание под заказ/задание (-) и возврат из него (+)
 
 
 # -------------------------------------------------
@@ -57,6 +60,10 @@ class BalanceTransaction(Base):
     """
 
     __tablename__ = "balance_transactions"
+    __table_args__ = (
+        # Лимиты вывода: агрегаты по (user_id, type) за период без чтения всей истории
+        Index("ix_balance_transactions_user_type_created", "user_id", "type", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
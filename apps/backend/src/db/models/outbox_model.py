@@ -0,0 +1,63 @@
+"""
+Uzinex Boost — Outbox Model
+===========================
+
+ORM-модель транзакционного outbox доменных событий.
+
+Назначение:
+- событие записывается в ту же транзакцию, что и бизнес-изменение
+  (откат транзакции — нет «призрачных» событий);
+- фоновый релей читает неотправленные строки и публикует их в шину событий;
+- `sent_at` отмечает доставленные события (удаляются релеем по сроку хранения);
+- `failed_at` / `error` — события, которые не удалось декодировать (dead letter).
+
+Используется в:
+- domain.services.base (BaseService.publish_event)
+- domain.events.outbox (OutboxRelay)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+# -------------------------------------------------
+# 🔹 Модель события outbox
+# -------------------------------------------------
+
+class OutboxEvent(Base):
+    """
+    Таблица доменных событий, ожидающих публикации.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Частичный индекс: релей сканирует только ожидающие доставки события
+        Index(
+            "ix_outbox_unsent", "id", postgresql_where=text("sent_at IS NULL AND failed_at IS NULL")
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    aggregate_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Dead letter: событие не удалось декодировать — релей его больше не берёт,
+    # строка остаётся для разбора вместе с причиной
+    failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<OutboxEvent(id={self.id}, event_type={self.event_type}, "
+            f"sent_at={self.sent_at}, failed_at={self.failed_at})>"
+        )
@@ -17,16 +17,18 @@ ORM-модель Telegram-пользователя платформы Boost v2.0
 """
 
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     String,
     Float,
     DateTime,
     Boolean,
     ForeignKey,
     Integer,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -52,12 +54,23 @@ class User(Base):
     balance: Mapped[float] = mapped_column(Float, default=0.0)
     is_banned: Mapped[bool] = mapped_column(Boolean, default=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Денормализованный счётчик заданий исполнителя в статусе PENDING (tasks.user_id):
+    # меняется вместе со статусом задания в OrderService/TaskService,
+    # правила читают его вместо COUNT(*) по таблице заданий
+    active_tasks_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     referrer_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_active_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Денормализованная копия last_active_at в секундах от эпохи (UTC):
+    # правила сравнивают целые числа без создания datetime/timedelta
+    last_active_ts: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    # Рейтинг по 5-балльной шкале: новый пользователь начинает с максимума,
+    # поэтому пороги правил (UserRules, TaskRules, OrderRules) его не блокируют
+    rating: Mapped[float] = mapped_column(Float, default=5.0, server_default="5.0")
 
     # --- Связи ---
     referrer = relationship("User", remote_side=[id], back_populates="referrals_invited_parent")
@@ -105,3 +118,20 @@ class User(Base):
     def mark_active(self) -> None:
         """Обновляет время последней активности."""
         self.last_active_at = datetime.utcnow()
+
+
+# -------------------------------------------------
+# 🔹 Синхронизация last_active_ts
+# -------------------------------------------------
+def epoch_seconds(value: Optional[datetime]) -> Optional[int]:
+    """Naive datetime (UTC, как в БД) → целые секунды от эпохи."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+@event.listens_for(User.last_active_at, "set")
+def _sync_last_active_ts(target: User, value, oldvalue, initiator) -> None:
+    target.last_active_ts = epoch_seconds(value)
@@ -15,9 +15,9 @@ Uzinex Boost — Base Repository
 """
 
 from __future__ import annotations
-from typing import Generic, TypeVar, Type, List, Optional, Any, Dict
+from typing import Generic, TypeVar, Type, List, Optional, Any, Dict, Iterable, Tuple
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import inspect, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -55,10 +55,36 @@ class BaseRepository(Generic[T]):
     # -------------------------------------------------
     async def get(self, obj_id: int) -> Optional[T]:
         """
-        Возвращает запись по ID.
+        Возвращает запись по ID (через identity map сессии, SQL только при промахе).
         """
-        result = await self.session.execute(select(self.model).where(self.model.id == obj_id))
-        return result.scalar_one_or_none()
+        return await self.session.get(self.model, obj_id)
+
+    async def get_by_id(self, obj_id: int) -> Optional[T]:
+        """
+        То же, что `get`: повторное чтение в рамках сессии не обращается к БД.
+        """
+        return await self.session.get(self.model, obj_id)
+
+    async def get_many_by_ids(self, ids: Iterable[int]) -> Dict[int, T]:
+        """
+        Возвращает записи по списку ID: найденные в identity map сессии — без SQL,
+        остальные — одним запросом `WHERE id IN (...)`.
+        """
+        found: Dict[int, T] = {}
+        missing: List[int] = []
+        for obj_id in set(ids):
+            obj = self.session.identity_map.get(self.session.identity_key(self.model, obj_id))
+            # Просроченные (после commit/expire) перечитываем запросом, как и session.get
+            if obj is not None and not inspect(obj).expired_attributes:
+                found[obj_id] = obj
+            else:
+                missing.append(obj_id)
+        if missing:
+            result = await self.session.execute(
+                select(self.model).where(self.model.id.in_(missing))
+            )
+            found.update((obj.id, obj) for obj in result.scalars())
+        return found
 
     async def list(self, skip: int = 0, limit: int = 100) -> List[T]:
         """
@@ -67,6 +93,23 @@ class BaseRepository(Generic[T]):
         result = await self.session.execute(select(self.model).offset(skip).limit(limit))
         return result.scalars().all()
 
+    async def _keyset_page(
+        self, *criteria: Any, limit: int = 50, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Страница записей по keyset-пагинации (`WHERE id < :cursor ORDER BY id DESC LIMIT n`).
+        Строки читаются потоково (server-side cursor) сразу в словари колонок —
+        ORM-объекты не создаются. Возвращает (записи, курсор следующей страницы или None).
+        """
+        table = self.model.__table__
+        query = select(*table.columns).where(*criteria)
+        if cursor is not None:
+            query = query.where(table.c.id < cursor)
+        result = await self.session.stream(query.order_by(table.c.id.desc()).limit(limit))
+        items = [dict(row) async for row in result.mappings()]
+        next_cursor = items[-1]["id"] if len(items) == limit else None
+        return items, next_cursor
+
     async def get_by_field(self, field_name: str, value: Any) -> Optional[T]:
         """
         Универсальный поиск по указанному полю.
@@ -17,14 +17,60 @@ Uzinex Boost — Order Repository
 """
 
 from __future__ import annotations
-from typing import List, Optional
-from sqlalchemy import select, update, func
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import (
+    DateTime, Integer, bindparam, exists, insert, literal, select, update, func,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models.order_model import Order, OrderStatus
+from db.models.task_model import Task, TaskStatus
+from db.models.user_model import User
 from db.repositories.base import BaseRepository
 
 
+# Принятие заказа: исполнитель получает задание (Task) по цене одного действия.
+# Задание создаётся INSERT ... SELECT только при выполнении всех условий заказа:
+# заказ активен, с учётом ожидающих заданий не превышен лимит действий и хватает
+# бюджета на ещё одно вознаграждение, у исполнителя нет ожидающего задания по заказу.
+_tasks = Task.__table__
+
+_PENDING_FOR_ORDER = (_tasks.c.order_id == Order.id, _tasks.c.status == TaskStatus.PENDING)
+
+_ACCEPT_STMT = (
+    insert(_tasks)
+    .from_select(
+        ["order_id", "user_id", "reward_amount", "status", "created_at"],
+        select(
+            Order.id,
+            bindparam("performer_id", type_=Integer),
+            Order.price_per_action,
+            literal(TaskStatus.PENDING, _tasks.c.status.type),
+            bindparam("accepted_at", type_=DateTime),
+        ).where(
+            Order.id == bindparam("order_id"),
+            Order.status == OrderStatus.ACTIVE,
+            func.coalesce(Order.completed_actions, 0)
+            + select(func.count()).where(*_PENDING_FOR_ORDER).scalar_subquery()
+            < Order.max_actions,
+            Order.total_budget
+            - func.coalesce(Order.spent_budget, 0)
+            - select(func.coalesce(func.sum(_tasks.c.reward_amount), 0))
+            .where(*_PENDING_FOR_ORDER)
+            .scalar_subquery()
+            >= Order.price_per_action,
+            ~exists().where(*_PENDING_FOR_ORDER, _tasks.c.user_id == bindparam("performer_id")),
+        ),
+    )
+    .returning(_tasks.c.id)
+)
+
+# Блокировка строки заказа перед принятием: конкурентные принятия одного заказа
+# выполняются по очереди, и INSERT видит ожидающие задания, созданные перед ним
+_LOCK_ORDER_STMT = select(Order.id).where(Order.id == bindparam("order_id")).with_for_update()
+
+
 class OrderRepository(BaseRepository[Order]):
     """
     Репозиторий заказов — расширяет базовые CRUD-функции.
@@ -45,6 +91,45 @@ class OrderRepository(BaseRepository[Order]):
         )
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Атомарная смена статуса (compare-and-set)
+    # -------------------------------------------------
+    async def transition(
+        self, order_id: int, from_status: OrderStatus, to_status: OrderStatus, **fields: Any
+    ) -> Optional[Order]:
+        """
+        Переводит заказ из `from_status` в `to_status` одним условным UPDATE
+        (`WHERE id = :id AND status = :from_status RETURNING ...`), заодно записывая `fields`.
+        Возвращает обновлённый заказ или None, если заказа нет или его статус уже изменился —
+        конкурентный переход не пройдёт без блокировок и SERIALIZABLE.
+        """
+        result = await self.session.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.status == from_status)
+            .values(status=to_status, **fields)
+            .returning(Order)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def accept(
+        self, order_id: int, performer_id: int, accepted_at: datetime
+    ) -> Optional[int]:
+        """
+        Создаёт исполнителю задание по заказу. Статус, лимит действий, остаток бюджета
+        (за вычетом вознаграждений ожидающих заданий) и отсутствие у исполнителя другого
+        ожидающего задания по заказу проверяются в самом INSERT ... SELECT;
+        строка заказа предварительно блокируется (`SELECT ... FOR UPDATE`).
+        Возвращает ID задания или None, если заказ не найден или недоступен.
+        Коммит остаётся за вызывающим кодом.
+        """
+        await self.session.execute(_LOCK_ORDER_STMT, {"order_id": order_id})
+        result = await self.session.execute(
+            _ACCEPT_STMT,
+            {"order_id": order_id, "performer_id": performer_id, "accepted_at": accepted_at},
+        )
+        return result.scalar_one_or_none()
+
     # -------------------------------------------------
     # 🔹 Получить заказы конкретного пользователя
     # -------------------------------------------------
@@ -58,6 +143,67 @@ class OrderRepository(BaseRepository[Order]):
         result = await self.session.execute(query.order_by(Order.created_at.desc()))
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Постраничные списки заказов (keyset)
+    # -------------------------------------------------
+    async def get_page_by_client(
+        self, user_id: int, limit: int = 50, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Возвращает страницу заказов клиента (новые первыми) и курсор следующей.
+        """
+        return await self._keyset_page(Order.user_id == user_id, limit=limit, cursor=cursor)
+
+    async def get_page_by_performer(
+        self, performer_id: int, limit: int = 50, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Возвращает страницу заказов, по которым исполнитель брал задания, и курсор следующей.
+        """
+        return await self._keyset_page(
+            Order.id.in_(select(Task.order_id).where(Task.user_id == performer_id)),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    # -------------------------------------------------
+    # 🔹 Контекст для создания / принятия заказа (один запрос)
+    # -------------------------------------------------
+    async def load_creation_context(self, client_id: int) -> Optional[Tuple[User, int, float]]:
+        """
+        Возвращает (клиент, число его активных заказов, баланс) одним SELECT
+        с коррелированным подзапросом вместо трёх отдельных запросов.
+        None — если клиент не найден.
+        """
+        active_orders = (
+            select(func.count(Order.id))
+            .where(Order.user_id == User.id, Order.status == OrderStatus.ACTIVE)
+            .correlate(User)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(select(User, active_orders).where(User.id == client_id))
+        row = result.one_or_none()
+        if row is None:
+            return None
+        client, active_count = row
+        return client, active_count, float(client.balance)
+
+    async def load_acceptance_context(
+        self, performer_id: int, order_id: int
+    ) -> Optional[Tuple[User, Order, int]]:
+        """
+        Возвращает (исполнитель, заказ, число его незавершённых заданий) одним SELECT.
+        Нагрузка берётся из денормализованного users.active_tasks_count, без COUNT(*)
+        по заданиям. None — если исполнитель или заказ не найден.
+        """
+        result = await self.session.execute(
+            select(User, Order, User.active_tasks_count).where(
+                User.id == performer_id, Order.id == order_id
+            )
+        )
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
     # -------------------------------------------------
     # 🔹 Обновить статус заказа
     # -------------------------------------------------
@@ -74,27 +220,6 @@ class OrderRepository(BaseRepository[Order]):
         await self.session.commit()
         return await self.get(order_id)
 
-    # -------------------------------------------------
-    # 🔹 Списать средства из бюджета
-    # -------------------------------------------------
-    async def spend_budget(self, order_id: int, amount: float) -> Optional[Order]:
-        """
-        Уменьшает доступный бюджет заказа после выполненного задания.
-        """
-        result = await self.session.execute(select(Order).where(Order.id == order_id))
-        order = result.scalar_one_or_none()
-        if not order:
-            return None
-
-        order.spent += amount
-        order.actions_completed += 1
-        if order.spent >= order.total_budget:
-            order.status = OrderStatus.COMPLETED
-
-        await self.session.commit()
-        await self.session.refresh(order)
-        return order
-
     # -------------------------------------------------
     # 🔹 Подсчёт заказов по статусам
     # -------------------------------------------------
@@ -16,10 +16,10 @@ Uzinex Boost — Payment Repository
 """
 
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, update, func
+from sqlalchemy import Row, select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models.payment_model import Payment, PaymentStatus, PaymentMethod
@@ -47,6 +47,36 @@ class PaymentRepository(BaseRepository[Payment]):
         result = await self.session.execute(query.order_by(Payment.created_at.desc()))
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Постраничная история платежей (keyset)
+    # -------------------------------------------------
+    async def get_page_by_user(
+        self, user_id: int, limit: int = 50, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Возвращает страницу платежей пользователя (новые первыми) и курсор следующей.
+        """
+        return await self._keyset_page(Payment.user_id == user_id, limit=limit, cursor=cursor)
+
+    # -------------------------------------------------
+    # 🔹 Платёжная активность пользователя за период
+    # -------------------------------------------------
+    async def get_activity_since(
+        self, user_id: int, since: datetime
+    ) -> Tuple[List[datetime], List[float]]:
+        """
+        Возвращает время создания и суммы платежей пользователя начиная с `since`
+        двумя параллельными списками, отсортированными по времени.
+        Выбираются только две колонки — ORM-объекты Payment не создаются.
+        """
+        result = await self.session.execute(
+            select(Payment.created_at, Payment.amount)
+            .where(Payment.user_id == user_id, Payment.created_at >= since)
+            .order_by(Payment.created_at.asc())
+        )
+        rows = result.all()
+        return [row[0] for row in rows], [row[1] for row in rows]
+
     # -------------------------------------------------
     # 🔹 Получить все ожидающие подтверждения платежи
     # -------------------------------------------------
@@ -103,6 +133,48 @@ class PaymentRepository(BaseRepository[Payment]):
         await self.session.commit()
         return await self.get(payment_id)
 
+    # -------------------------------------------------
+    # 🔹 Смена статуса с возвратом данных (UPDATE ... RETURNING)
+    # -------------------------------------------------
+    async def complete_and_return(
+        self, payment_id: int, at: Optional[datetime] = None
+    ) -> Optional[Row]:
+        """
+        Подтверждает ожидающий платёж и возвращает (user_id, amount, method) одним запросом.
+        None — платёж не найден или уже обработан. `at` — время подтверждения (по умолчанию сейчас).
+        """
+        return await self._transition(
+            payment_id,
+            status=PaymentStatus.VERIFIED,
+            verified_at=at or datetime.utcnow(),
+        )
+
+    async def fail_and_return(
+        self, payment_id: int, reason: str, at: Optional[datetime] = None
+    ) -> Optional[Row]:
+        """
+        Отклоняет ожидающий платёж и возвращает (user_id, amount, method) одним запросом.
+        None — платёж не найден или уже обработан. `at` — время отклонения (по умолчанию сейчас).
+        """
+        return await self._transition(
+            payment_id,
+            status=PaymentStatus.REJECTED,
+            verified_at=at or datetime.utcnow(),
+            comment=reason,
+        )
+
+    async def _transition(self, payment_id: int, **values) -> Optional[Row]:
+        # Условие по статусу в самом UPDATE: повторное подтверждение не пройдёт
+        # даже при гонке двух запросов (без чтения перед записью)
+        result = await self.session.execute(
+            update(Payment)
+            .where(Payment.id == payment_id, Payment.status == PaymentStatus.PENDING)
+            .values(**values)
+            .returning(Payment.user_id, Payment.amount, Payment.method)
+            .execution_options(synchronize_session=False)
+        )
+        return result.one_or_none()
+
     # -------------------------------------------------
     # 🔹 Статистика по платежам
     # -------------------------------------------------
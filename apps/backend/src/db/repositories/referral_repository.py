@@ -17,14 +17,88 @@ Uzinex Boost — Referral Repository
 """
 
 from __future__ import annotations
-from typing import List, Optional
-from sqlalchemy import select, func, update
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import ARRAY, Integer, any_, bindparam, select, func, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.models.balance_model import BalanceTransaction, TransactionType
 from db.models.referral_model import Referral
 from db.repositories.base import BaseRepository
 
 
+# Зачисление бонуса, учёт в referrals и транзакция баланса — один запрос.
+# Баланс меняется только при существующей связи, транзакция — только при зачислении.
+_GRANT_BONUS_STMT = text(
+    """
+    WITH ref AS (
+        UPDATE referrals SET bonus_amount = COALESCE(bonus_amount, 0) + :amount
+        WHERE referrer_id = :inviter_id AND referred_id = :referral_id
+        RETURNING id
+    ),
+    upd AS (
+        UPDATE users SET balance = balance + :amount
+        WHERE id = :inviter_id AND EXISTS (SELECT 1 FROM ref)
+        RETURNING balance
+    ),
+    tx AS (
+        INSERT INTO balance_transactions
+            (user_id, amount, type, description, created_at, balance_after)
+        SELECT :inviter_id, :amount, :tx_type, :description, :created_at, balance FROM upd
+        RETURNING id
+    )
+    SELECT (SELECT balance FROM upd), (SELECT id FROM ref), (SELECT id FROM tx)
+    """
+).bindparams(bindparam("tx_type", type_=BalanceTransaction.__table__.c.type.type))
+
+
+# Пакетный вариант того же начисления: входные массивы разворачиваются через unnest,
+# баланс каждого пригласившего увеличивается одним UPDATE на сумму его бонусов.
+# Несколько бонусов по одной связи складываются до UPDATE referrals.
+_GRANT_BONUSES_BULK_STMT = text(
+    """
+    WITH v AS (
+        SELECT * FROM unnest(
+            CAST(:inviter_ids AS integer[]),
+            CAST(:referral_ids AS integer[]),
+            CAST(:amounts AS double precision[]),
+            CAST(:bonus_types AS text[])
+        ) AS v(inviter_id, referral_id, amount, bonus_type)
+    ),
+    g AS (
+        SELECT inviter_id, referral_id, SUM(amount) AS amount
+        FROM v GROUP BY inviter_id, referral_id
+    ),
+    ref AS (
+        UPDATE referrals AS r SET bonus_amount = COALESCE(r.bonus_amount, 0) + g.amount
+        FROM g
+        WHERE r.referrer_id = g.inviter_id AND r.referred_id = g.referral_id
+        RETURNING g.inviter_id, g.referral_id
+    ),
+    granted AS (
+        SELECT v.* FROM v JOIN ref USING (inviter_id, referral_id)
+    ),
+    pay AS (
+        UPDATE users SET balance = users.balance + d.delta
+        FROM (SELECT inviter_id, SUM(amount) AS delta FROM granted GROUP BY inviter_id) AS d
+        WHERE users.id = d.inviter_id
+        RETURNING users.id, users.balance
+    ),
+    tx AS (
+        INSERT INTO balance_transactions
+            (user_id, amount, type, description, created_at, balance_after)
+        SELECT granted.inviter_id, granted.amount, :tx_type,
+               'Реферальный бонус (' || granted.bonus_type || ')', :created_at, pay.balance
+        FROM granted JOIN pay ON pay.id = granted.inviter_id
+        RETURNING id
+    )
+    SELECT granted.inviter_id, granted.referral_id, granted.amount, granted.bonus_type,
+           pay.balance
+    FROM granted JOIN pay ON pay.id = granted.inviter_id
+    """
+).bindparams(bindparam("tx_type", type_=BalanceTransaction.__table__.c.type.type))
+
+
 class ReferralRepository(BaseRepository[Referral]):
     """
     Репозиторий для управления реферальными связями.
@@ -47,6 +121,19 @@ class ReferralRepository(BaseRepository[Referral]):
         )
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Постраничный список приглашённых (keyset)
+    # -------------------------------------------------
+    async def get_page_by_referrer(
+        self, referrer_id: int, limit: int = 50, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Возвращает страницу реферальных связей пользователя (новые первыми) и курсор следующей.
+        """
+        return await self._keyset_page(
+            Referral.referrer_id == referrer_id, limit=limit, cursor=cursor
+        )
+
     # -------------------------------------------------
     # 🔹 Проверить, есть ли реферальная связь
     # -------------------------------------------------
@@ -75,6 +162,83 @@ class ReferralRepository(BaseRepository[Referral]):
         await self.session.commit()
         return await self.get_by_referred(referred_id)
 
+    # -------------------------------------------------
+    # 🔹 Атомарное начисление реферального бонуса
+    # -------------------------------------------------
+    async def grant_bonus_atomic(
+        self,
+        inviter_id: int,
+        referral_id: int,
+        amount: float,
+        bonus_type: str,
+    ) -> Tuple[Optional[float], Optional[int], Optional[int]]:
+        """
+        Начисляет бонус пригласившему одним запросом: пополняет баланс,
+        увеличивает `bonus_amount` связи и записывает транзакцию баланса.
+        Возвращает (новый баланс, id связи, id транзакции); баланс None —
+        связь или пользователь не найдены, ничего не изменено.
+        """
+        result = await self.session.execute(
+            _GRANT_BONUS_STMT,
+            {
+                "inviter_id": inviter_id,
+                "referral_id": referral_id,
+                "amount": amount,
+                "tx_type": TransactionType.REFERRAL_BONUS,
+                "description": f"Реферальный бонус ({bonus_type})",
+                "created_at": datetime.utcnow(),
+            },
+        )
+        balance, bonus_id, tx_id = result.one()
+        return balance, bonus_id, tx_id
+
+    # -------------------------------------------------
+    # 🔹 Пакетное начисление реферальных бонусов
+    # -------------------------------------------------
+    async def get_today_bonus_sums(self, inviter_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        Возвращает сумму реферальных бонусов за текущие сутки (UTC) по каждому
+        пригласившему — одним агрегирующим запросом. Пользователи без бонусов не попадают.
+        """
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        result = await self.session.execute(
+            select(BalanceTransaction.user_id, func.sum(BalanceTransaction.amount))
+            .where(
+                BalanceTransaction.user_id == any_(
+                    bindparam("uids", list(set(inviter_ids)), type_=ARRAY(Integer))
+                ),
+                BalanceTransaction.type == TransactionType.REFERRAL_BONUS,
+                BalanceTransaction.created_at >= today,
+            )
+            .group_by(BalanceTransaction.user_id)
+        )
+        return {user_id: float(total or 0) for user_id, total in result}
+
+    async def grant_bonuses_bulk(
+        self, items: Sequence[Tuple[int, int, float, str]]
+    ) -> List[Tuple[int, int, float, str, float]]:
+        """
+        Начисляет пачку бонусов `(inviter_id, referral_id, amount, bonus_type)` одним запросом:
+        увеличивает `bonus_amount` связей, балансы пригласивших и пишет транзакции баланса.
+        Возвращает начисленные позиции с итоговым балансом пригласившего;
+        позиции без реферальной связи пропускаются.
+        """
+        if not items:
+            return []
+        inviter_ids, referral_ids, amounts, bonus_types = zip(*items)
+        result = await self.session.execute(
+            _GRANT_BONUSES_BULK_STMT,
+            {
+                "inviter_ids": list(inviter_ids),
+                "referral_ids": list(referral_ids),
+                "amounts": [float(amount) for amount in amounts],
+                "bonus_types": list(bonus_types),
+                "tx_type": TransactionType.REFERRAL_BONUS,
+                "created_at": datetime.utcnow(),
+            },
+        )
+        return [tuple(row) for row in result]
+
     # -------------------------------------------------
     # 🔹 Статистика по рефералам пользователя
     # -------------------------------------------------
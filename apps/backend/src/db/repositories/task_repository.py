@@ -17,15 +17,44 @@ Uzinex Boost — Task Repository
 
 from __future__ import annotations
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import select, update, func
+from sqlalchemy import ARRAY, Integer, any_, bindparam, select, text, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.models.order_model import Order
 from db.models.task_model import Task, TaskStatus
+from db.models.user_model import User
 from db.repositories.base import BaseRepository
 
 
+# Колонки списка заданий: читаются через Core, без создания ORM-объектов
+_TASK_ROW_COLUMNS = (
+    Task.id,
+    Task.order_id,
+    Task.user_id,
+    Task.reward_amount,
+    Task.status,
+    Task.created_at,
+    Task.completed_at,
+)
+
+
+# Выплаты по одобренным заданиям — в бюджет и счётчик выполненных действий заказов
+_SPEND_BUDGETS_STMT = text(
+    """
+    UPDATE orders
+    SET spent_budget = COALESCE(orders.spent_budget, 0) + v.amount,
+        completed_actions = COALESCE(orders.completed_actions, 0) + v.actions,
+        updated_at = :updated_at
+    FROM unnest(
+        CAST(:ids AS integer[]), CAST(:amounts AS double precision[]), CAST(:actions AS integer[])
+    ) AS v(order_id, amount, actions)
+    WHERE orders.id = v.order_id
+    """
+)
+
+
 class TaskRepository(BaseRepository[Task]):
     """
     Репозиторий для управления заданиями пользователей.
@@ -47,6 +76,33 @@ class TaskRepository(BaseRepository[Task]):
         result = await self.session.execute(query.order_by(Task.created_at.desc()))
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Списки заданий для чтения (словари колонок)
+    # -------------------------------------------------
+    async def get_rows_by_creator(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Возвращает задания по заказам пользователя (он — заказчик) словарями колонок.
+        Только для чтения: ORM-объекты и identity map не задействуются.
+        """
+        return await self._rows(
+            Task.order_id.in_(select(Order.id).where(Order.user_id == user_id)), limit=limit
+        )
+
+    async def get_rows_by_performer(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Возвращает задания, назначенные пользователю, словарями колонок.
+        """
+        return await self._rows(Task.user_id == user_id, limit=limit)
+
+    async def _rows(self, *criteria: Any, limit: int) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            select(*_TASK_ROW_COLUMNS)
+            .where(*criteria)
+            .order_by(Task.created_at.desc())
+            .limit(limit)
+        )
+        return [dict(row) for row in result.mappings()]
+
     # -------------------------------------------------
     # 🔹 Получить задания по заказу
     # -------------------------------------------------
@@ -61,6 +117,103 @@ class TaskRepository(BaseRepository[Task]):
         )
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Контекст для принятия задания (один запрос)
+    # -------------------------------------------------
+    async def get_task_with_context(
+        self, task_id: int, user_id: int
+    ) -> Optional[Tuple[User, Task, int]]:
+        """
+        Возвращает (пользователь, задание, число его незавершённых заданий) одним SELECT:
+        нагрузка берётся из денормализованного users.active_tasks_count.
+        None — если пользователь или задание не найдены.
+        """
+        result = await self.session.execute(
+            select(User, Task, User.active_tasks_count).where(
+                User.id == user_id, Task.id == task_id
+            )
+        )
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
+    # -------------------------------------------------
+    # 🔹 Пакетное одобрение заданий
+    # -------------------------------------------------
+    async def approve_many(
+        self, task_ids: Iterable[int], completed_at: datetime
+    ) -> List[Tuple[int, int, int, float]]:
+        """
+        Переводит ожидающие задания в COMPLETED одним
+        `UPDATE tasks ... WHERE id = ANY(:ids) AND status = PENDING RETURNING ...`
+        и в той же транзакции учитывает выплаты в заказах: `spent_budget` растёт
+        на сумму вознаграждений, `completed_actions` — на число одобренных заданий
+        (один `UPDATE orders ... FROM unnest(...)`).
+        Возвращает (task_id, исполнитель, order_id, reward_amount) одобренных заданий;
+        пропущенные в списке отсутствуют. Коммит остаётся за вызывающим кодом.
+        """
+        result = await self.session.execute(
+            update(Task)
+            .where(
+                Task.id == any_(bindparam("ids", sorted(set(task_ids)), type_=ARRAY(Integer))),
+                Task.status == TaskStatus.PENDING,
+            )
+            .values(status=TaskStatus.COMPLETED, completed_at=completed_at)
+            .returning(Task.id, Task.user_id, Task.order_id, Task.reward_amount)
+            .execution_options(synchronize_session=False)
+        )
+        approved = [tuple(row) for row in result]
+        if not approved:
+            return approved
+
+        spent: Dict[int, Tuple[float, int]] = {}
+        for _, _, order_id, reward in approved:
+            amount, actions = spent.get(order_id, (0.0, 0))
+            spent[order_id] = (amount + reward, actions + 1)
+        order_ids = sorted(spent)  # единый порядок блокировок строк
+        await self.session.execute(
+            _SPEND_BUDGETS_STMT,
+            {
+                "ids": order_ids,
+                "amounts": [spent[oid][0] for oid in order_ids],
+                "actions": [spent[oid][1] for oid in order_ids],
+                "updated_at": completed_at,
+            },
+        )
+        return approved
+
+    # -------------------------------------------------
+    # 🔹 Отклонение ожидающего задания
+    # -------------------------------------------------
+    async def reject_pending(self, task_id: int) -> Optional[Tuple[int, int, int, float]]:
+        """
+        Переводит задание PENDING → REJECTED условным UPDATE и возвращает его
+        вознаграждение из бюджета заказа: `total_budget` уменьшается на `reward_amount`,
+        деньги возвращаются заказчику вызывающим кодом.
+        Возвращает (исполнитель, order_id, заказчик — владелец заказа, reward_amount)
+        или None, если задания нет или оно уже не ожидает проверки.
+        Коммит остаётся за вызывающим кодом.
+        """
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.status == TaskStatus.PENDING)
+            .values(status=TaskStatus.REJECTED)
+            .returning(Task.user_id, Task.order_id, Task.reward_amount)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        performer_id, order_id, reward = row
+
+        result = await self.session.execute(
+            update(Order)
+            .where(Order.id == order_id)
+            .values(total_budget=func.greatest(Order.total_budget - reward, 0))
+            .returning(Order.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return performer_id, order_id, result.scalar_one(), reward
+
     # -------------------------------------------------
     # 🔹 Отметить задание как выполненное
     # -------------------------------------------------
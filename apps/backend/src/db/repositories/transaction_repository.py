@@ -17,16 +17,24 @@ Uzinex Boost — Transaction Repository
 """
 
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, func, update
+from sqlalchemy import case, insert, select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models.balance_model import BalanceTransaction
+from db.models.balance_model import BalanceTransaction, TransactionType
+from db.models.user_model import User
 from db.repositories.base import BaseRepository
 
 
+# Многострочный INSERT строится один раз при импорте: переиспользуемый объект
+# запроса попадает в кэш компиляции SQLAlchemy
+_INSERT_RETURNING_ID = insert(BalanceTransaction).returning(
+    BalanceTransaction.id, sort_by_parameter_order=True
+)
+
+
 class TransactionRepository(BaseRepository[BalanceTransaction]):
     """
     Репозиторий для управления всеми движениями UZT.
@@ -55,6 +63,44 @@ class TransactionRepository(BaseRepository[BalanceTransaction]):
         )
         return result.scalars().all()
 
+    # -------------------------------------------------
+    # 🔹 Агрегаты для проверки лимитов вывода
+    # -------------------------------------------------
+    async def get_withdraw_stats_since(
+        self,
+        user_id: int,
+        since: datetime,
+    ) -> Tuple[int, float, Optional[datetime]]:
+        """
+        Возвращает (количество, сумму по модулю, время последнего) выводов
+        пользователя начиная с `since` — одним агрегирующим запросом.
+        """
+        result = await self.session.execute(
+            select(
+                func.count(BalanceTransaction.id),
+                func.coalesce(func.sum(func.abs(BalanceTransaction.amount)), 0),
+                func.max(BalanceTransaction.created_at),
+            ).where(
+                BalanceTransaction.user_id == user_id,
+                BalanceTransaction.type == TransactionType.WITHDRAW,
+                BalanceTransaction.created_at >= since,
+            )
+        )
+        count, total, last_at = result.one()
+        return int(count or 0), float(total or 0), last_at
+
+    async def get_last_tx_time(self, user_id: int) -> Optional[datetime]:
+        """
+        Возвращает время последней транзакции пользователя (любого типа).
+        """
+        result = await self.session.execute(
+            select(BalanceTransaction.created_at)
+            .where(BalanceTransaction.user_id == user_id)
+            .order_by(BalanceTransaction.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     # -------------------------------------------------
     # 🔹 Создать новую транзакцию
     # -------------------------------------------------
@@ -70,6 +116,8 @@ class TransactionRepository(BaseRepository[BalanceTransaction]):
     ) -> BalanceTransaction:
         """
         Создаёт запись о транзакции: начисление, списание или бонус.
+        Запись только сбрасывается в БД (flush, чтобы получить ID); коммит остаётся
+        за вызывающим сервисом — вместе с изменением баланса и событиями outbox.
         """
         tx = BalanceTransaction(
             user_id=user_id,
@@ -82,10 +130,22 @@ class TransactionRepository(BaseRepository[BalanceTransaction]):
             created_at=datetime.utcnow(),
         )
         self.session.add(tx)
-        await self.session.commit()
-        await self.session.refresh(tx)
+        await self.session.flush()
         return tx
 
+    async def create_transactions_bulk(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Создаёт несколько транзакций одним `INSERT ... VALUES (...), (...) RETURNING id`.
+        Ключи строк — колонки BalanceTransaction (`user_id`, `amount`, `type`, ...).
+        ID возвращаются в порядке `rows`. Коммит остаётся за вызывающим кодом.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            _INSERT_RETURNING_ID,
+            [{"created_at": now, **row} for row in rows],
+        )
+        return list(result.scalars())
+
     # -------------------------------------------------
     # 🔹 Агрегированная статистика по пользователю
     # -------------------------------------------------
@@ -119,6 +179,37 @@ class TransactionRepository(BaseRepository[BalanceTransaction]):
             "net_balance": round(float((total_in or 0) + (total_out or 0)), 2),
         }
 
+    async def get_summary_with_balance(self, user_id: int) -> Optional[dict]:
+        """
+        То же, что get_summary_by_user, плюс текущий баланс и число транзакций —
+        одним запросом (`users LEFT JOIN balance_transactions ... GROUP BY users.id`).
+        Возвращает None, если пользователь не найден.
+        """
+        amount = BalanceTransaction.amount
+        result = await self.session.execute(
+            select(
+                User.balance,
+                func.coalesce(func.sum(case((amount > 0, amount))), 0).label("total_in"),
+                func.coalesce(func.sum(case((amount < 0, -amount))), 0).label("total_out"),
+                func.count(BalanceTransaction.id).label("tx_count"),
+            )
+            .select_from(User)
+            .outerjoin(BalanceTransaction, BalanceTransaction.user_id == User.id)
+            .where(User.id == user_id)
+            .group_by(User.id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        balance, total_in, total_out, tx_count = row
+        return {
+            "total_in": round(float(total_in), 2),
+            "total_out": round(float(total_out), 2),
+            "net_balance": round(float(total_in - total_out), 2),
+            "tx_count": tx_count,
+            "current_balance": float(balance),
+        }
+
     # -------------------------------------------------
     # 🔹 Статистика по типам транзакций
     # -------------------------------------------------
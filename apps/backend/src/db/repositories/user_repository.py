@@ -17,16 +17,93 @@ Uzinex Boost — User Repository
 """
 
 from __future__ import annotations
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Iterable, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, update, func
+from sqlalchemy import ARRAY, Integer, any_, bindparam, select, text, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from db.models.user_model import User
+from db.models.user_model import User, epoch_seconds
 from db.repositories.base import BaseRepository
 
 
+# -------------------------------------------------
+# 🔹 Запросы горячего пути баланса (строятся один раз при импорте)
+# -------------------------------------------------
+# Параметры передаются через bindparam: объект запроса переиспользуется, поэтому
+# SQLAlchemy берёт скомпилированный SQL из кэша, а asyncpg — prepared statement.
+_ADJUST_STMT = (
+    update(User)
+    .where(User.id == bindparam("uid"))
+    .values(balance=User.balance + bindparam("delta"))
+    .returning(User.balance)
+)
+_ADJUST_FUNDED_STMT = _ADJUST_STMT.where(User.balance + bindparam("delta") >= 0)
+
+# `id = ANY(:uids)` с массивом — один SQL-текст для любого числа пользователей
+_BULK_ADJUST_STMT = (
+    update(User)
+    .where(User.id == any_(bindparam("uids", type_=ARRAY(Integer))))
+    .values(balance=User.balance + bindparam("delta"))
+    .returning(User.id, User.balance)
+)
+
+# Разные дельты для разных пользователей — массивы вместо VALUES (...), (...):
+# один SQL-текст для пакета любого размера
+_BULK_CREDIT_STMT = text(
+    """
+    UPDATE users SET balance = users.balance + v.delta
+    FROM unnest(CAST(:ids AS integer[]), CAST(:deltas AS double precision[]))
+        AS v(user_id, delta)
+    WHERE users.id = v.user_id
+    RETURNING users.id, users.balance
+    """
+)
+
+# Счётчик заданий исполнителя (users.active_tasks_count) — тот же приём.
+# Новые значения возвращаются через RETURNING и переносятся в уже загруженные объекты;
+# GREATEST(..., 0): повторное снятие задания не уводит счётчик в минус
+_ADJUST_ACTIVE_TASKS_STMT = (
+    update(User)
+    .where(User.id == bindparam("uid"))
+    .values(active_tasks_count=func.greatest(User.active_tasks_count + bindparam("delta"), 0))
+    .returning(User.id, User.active_tasks_count)
+    .execution_options(synchronize_session=False)
+)
+
+_BULK_ACTIVE_TASKS_STMT = text(
+    """
+    UPDATE users SET active_tasks_count = GREATEST(users.active_tasks_count + v.delta, 0)
+    FROM unnest(CAST(:ids AS integer[]), CAST(:deltas AS integer[])) AS v(user_id, delta)
+    WHERE users.id = v.user_id
+    RETURNING users.id, users.active_tasks_count
+    """
+)
+
+_TRANSFER_STMT = text(
+    """
+    WITH locked AS (
+        SELECT id FROM users WHERE id IN (:sender_id, :receiver_id)
+        ORDER BY id FOR UPDATE
+    ),
+    found AS (SELECT count(*) AS n FROM locked),
+    s AS (
+        UPDATE users SET balance = balance - :amount
+        WHERE id = :sender_id AND balance >= :amount
+          AND (SELECT n FROM found) = 2
+        RETURNING balance
+    ),
+    r AS (
+        UPDATE users SET balance = balance + :amount
+        WHERE id = :receiver_id AND EXISTS (SELECT 1 FROM s)
+        RETURNING balance
+    )
+    SELECT (SELECT n FROM found), (SELECT balance FROM s), (SELECT balance FROM r)
+    """
+)
+
+
 class UserRepository(BaseRepository[User]):
     """
     Репозиторий для работы с данными пользователей Uzinex.
@@ -41,11 +118,10 @@ class UserRepository(BaseRepository[User]):
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """
         Возвращает пользователя по ID.
+        Сначала проверяется identity map сессии — повторные запросы в рамках
+        одного запроса не обращаются к БД.
         """
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await self.session.get(User, user_id)
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Возвращает пользователя по Telegram ID."""
@@ -136,7 +212,8 @@ class UserRepository(BaseRepository[User]):
             update_data["bio"] = bio
 
         if not update_data:
-            return await self.get_by_id(user_id)
+            # Пустой PATCH: берём объект из identity map сессии (без SQL, если уже загружен)
+            return await self.session.get(User, user_id)
 
         await self.session.execute(
             update(User)
@@ -165,6 +242,111 @@ class UserRepository(BaseRepository[User]):
         await self.session.commit()
         return await self.get_by_id(user_id)
 
+    # -------------------------------------------------
+    # 🔹 Атомарное изменение баланса
+    # -------------------------------------------------
+    async def atomic_adjust(
+        self, user_id: int, delta: float, *, require_funds: bool = False
+    ) -> Optional[float]:
+        """
+        Меняет баланс одним `UPDATE ... RETURNING balance` на стороне БД
+        (без предварительного SELECT). При `require_funds=True` строка обновляется,
+        только если баланс не уходит в минус — проверка выполняется в БД, без гонок.
+        Возвращает новый баланс или None, если пользователь не найден / средств недостаточно.
+        Коммит остаётся за вызывающим кодом.
+        """
+        stmt = _ADJUST_FUNDED_STMT if require_funds else _ADJUST_STMT
+        result = await self.session.execute(stmt, {"uid": user_id, "delta": delta})
+        return result.scalar_one_or_none()
+
+    async def bulk_adjust(self, user_ids: Iterable[int], delta: float) -> Dict[int, float]:
+        """
+        Меняет баланс нескольких пользователей на `delta` одним
+        `UPDATE ... WHERE id = ANY(:uids) RETURNING id, balance`.
+        Возвращает {user_id: новый баланс}; отсутствующих пользователей в словаре нет.
+        Коммит остаётся за вызывающим кодом.
+        """
+        result = await self.session.execute(
+            _BULK_ADJUST_STMT, {"uids": sorted(set(user_ids)), "delta": delta}
+        )
+        return {user_id: balance for user_id, balance in result}
+
+    async def bulk_credit(self, deltas: Dict[int, float]) -> Dict[int, float]:
+        """
+        Меняет баланс нескольких пользователей на свои суммы ({user_id: delta})
+        одним `UPDATE ... FROM unnest(...) RETURNING id, balance`.
+        Возвращает {user_id: новый баланс}; отсутствующих пользователей в словаре нет.
+        Коммит остаётся за вызывающим кодом.
+        """
+        if not deltas:
+            return {}
+        ids = sorted(deltas)  # единый порядок блокировок строк
+        result = await self.session.execute(
+            _BULK_CREDIT_STMT, {"ids": ids, "deltas": [deltas[uid] for uid in ids]}
+        )
+        return {user_id: balance for user_id, balance in result}
+
+    async def adjust_active_tasks(self, user_id: int, delta: int) -> None:
+        """
+        Меняет счётчик незавершённых заданий пользователя на `delta`.
+        Коммит остаётся за вызывающим кодом (та же транзакция, что и смена статуса).
+        """
+        result = await self.session.execute(
+            _ADJUST_ACTIVE_TASKS_STMT, {"uid": user_id, "delta": delta}
+        )
+        self._sync_loaded("active_tasks_count", dict(result.all()))
+
+    async def bulk_adjust_active_tasks(self, deltas: Dict[int, int]) -> None:
+        """
+        Меняет счётчики незавершённых заданий нескольких пользователей ({user_id: delta})
+        одним `UPDATE ... FROM unnest(...)`. Коммит остаётся за вызывающим кодом.
+        """
+        deltas = {uid: delta for uid, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        ids = sorted(deltas)  # единый порядок блокировок строк
+        result = await self.session.execute(
+            _BULK_ACTIVE_TASKS_STMT, {"ids": ids, "deltas": [deltas[uid] for uid in ids]}
+        )
+        self._sync_loaded("active_tasks_count", dict(result.all()))
+
+    def _sync_loaded(self, attr: str, values: Dict[int, Any]) -> None:
+        """
+        Переносит значения колонки из RETURNING в пользователей, уже загруженных в сессию:
+        UPDATE мимо ORM не синхронизирует identity map, а истёкший атрибут
+        в асинхронной сессии нельзя дочитать неявно.
+        """
+        for uid, value in values.items():
+            user = self.session.identity_map.get(self.session.identity_key(User, uid))
+            if user is not None:
+                set_committed_value(user, attr, value)
+
+    async def atomic_transfer(
+        self, sender_id: int, receiver_id: int, amount: float
+    ) -> Tuple[int, Optional[float], Optional[float]]:
+        """
+        Переводит средства одним запросом: два `UPDATE ... RETURNING` в CTE.
+        Строки обоих пользователей сначала блокируются в порядке возрастания ID
+        (чтобы конкурентные переводы не попадали в deadlock), затем списание выполняется только при достаточном балансе,
+        а зачисление — только если списание прошло.
+
+        Возвращает (найдено пользователей, баланс отправителя, баланс получателя);
+        балансы равны None, если перевод не выполнен.
+        """
+        result = await self.session.execute(
+            _TRANSFER_STMT,
+            {"sender_id": sender_id, "receiver_id": receiver_id, "amount": amount},
+        )
+        found, sender_balance, receiver_balance = result.one()
+
+        # Текстовый UPDATE не синхронизирует identity map — обновляем уже загруженные объекты
+        if sender_balance is not None:
+            for uid, balance in ((sender_id, sender_balance), (receiver_id, receiver_balance)):
+                user = self.session.identity_map.get(self.session.identity_key(User, uid))
+                if user is not None:
+                    set_committed_value(user, "balance", balance)
+        return found, sender_balance, receiver_balance
+
     # -------------------------------------------------
     # 🔹 Подтверждение email
     # -------------------------------------------------
@@ -233,6 +415,8 @@ class UserRepository(BaseRepository[User]):
                 update_data["language_code"] = language_code
 
             update_data["last_active_at"] = now
+            # Core UPDATE не вызывает ORM-события — денормализованное поле задаём явно
+            update_data["last_active_ts"] = epoch_seconds(now)
             update_data["updated_at"] = now
 
             await self.session.execute(
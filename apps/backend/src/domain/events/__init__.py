@@ -25,21 +25,25 @@ event = UserRegisteredEvent(user_id=42, email="user@example.com")
 await EventDispatcher.publish(event)
 """
 
-from domain.events.base import DomainEvent
+from domain.events.base import DomainEvent, get_event_class
 from domain.events.dispatcher import EventDispatcher
+from domain.events.bus import EventBatcher, event_batcher
 
 # Импортируем основные события домена (по мере добавления)
 from domain.events.user_events import UserRegisteredEvent, UserVerifiedEvent
 from domain.events.balance_events import BalanceUpdatedEvent
-from domain.events.payment_events import PaymentCreatedEvent, PaymentConfirmedEvent
-from domain.events.task_events import TaskCompletedEvent
-from domain.events.referral_events import ReferralRewardedEvent
+from domain.events.payment_events import PaymentCreatedEvent, PaymentConfirmedEvent, PaymentEvent
+from domain.events.task_events import TaskCompletedEvent, TaskEvent
+from domain.events.referral_events import ReferralRewardedEvent, ReferralEvent
 from domain.events.order_events import OrderCreatedEvent, OrderCompletedEvent
 
 __all__ = [
     # Базовые элементы
     "DomainEvent",
+    "get_event_class",
     "EventDispatcher",
+    "EventBatcher",
+    "event_batcher",
 
     # Пользователи
     "UserRegisteredEvent",
@@ -51,12 +55,15 @@ __all__ = [
     # Платежи
     "PaymentCreatedEvent",
     "PaymentConfirmedEvent",
+    "PaymentEvent",
 
     # Задания
     "TaskCompletedEvent",
+    "TaskEvent",
 
     # Рефералы
     "ReferralRewardedEvent",
+    "ReferralEvent",
 
     # Заказы
     "OrderCreatedEvent",
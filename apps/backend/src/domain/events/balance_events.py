@@ -19,91 +19,83 @@ Uzinex Boost — Balance Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, ShortReason, now_ms
 
 
 # =================================================
 # 🔹 Событие: Баланс изменён
 # =================================================
-class BalanceUpdatedEvent(DomainEvent):
+class BalanceUpdatedEvent(DomainEvent, kw_only=True):
     """Генерируется при любом изменении баланса пользователя."""
 
-    event_type: str = "balance.updated"
-    user_id: int = Field(..., description="ID пользователя, чей баланс изменён")
-    amount: float = Field(..., description="Сумма изменения (может быть отрицательной)")
-    balance_before: float = Field(..., description="Баланс до изменения")
-    balance_after: float = Field(..., description="Баланс после изменения")
-    source: str = Field(..., description="Источник операции (task, order, referral, admin и т.д.)")
-    transaction_id: int | None = Field(None, description="ID транзакции, связанной с событием")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "balance.updated"
+    user_id: Annotated[int, Meta(description="ID пользователя, чей баланс изменён")]
+    amount: Annotated[float, Meta(description="Сумма изменения (может быть отрицательной)")]
+    balance_before: Annotated[float, Meta(description="Баланс до изменения")]
+    balance_after: Annotated[float, Meta(description="Баланс после изменения")]
+    source: Annotated[str, Meta(description="Источник операции (task, order, referral, admin и т.д.)")]
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции, связанной с событием")] = None
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
 
 # =================================================
 # 🔹 Событие: Баланс пополнен
 # =================================================
-class BalanceDepositedEvent(DomainEvent):
+class BalanceDepositedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователь успешно пополнил баланс."""
 
-    event_type: str = "balance.deposited"
+    event_type: ClassVar[str] = "balance.deposited"
     user_id: int
     amount: float
-    payment_id: int
-    method: str = Field(..., description="Метод пополнения (click, payme, uzcard, crypto и т.п.)")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    payment_id: int | None = None
+    method: Annotated[str | None, Meta(description="Метод пополнения (click, payme, uzcard, crypto и т.п.)")] = None
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции пополнения")] = None
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
 
 # =================================================
 # 🔹 Событие: Баланс списан
 # =================================================
-class BalanceWithdrawnEvent(DomainEvent):
+class BalanceWithdrawnEvent(DomainEvent, kw_only=True):
     """Генерируется при списании средств (например, при оплате заказа или выводе средств)."""
 
-    event_type: str = "balance.withdrawn"
+    event_type: ClassVar[str] = "balance.withdrawn"
     user_id: int
     amount: float
-    reason: str = Field(..., description="Причина списания (order, withdraw, fee и т.п.)")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    reason: Annotated[str, Meta(description="Причина списания (order, withdraw, fee и т.п.)")]
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции списания")] = None
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
 
 # =================================================
 # 🔹 Событие: Средства переведены
 # =================================================
-class BalanceTransferredEvent(DomainEvent):
+class BalanceTransferredEvent(DomainEvent, kw_only=True):
     """Генерируется при переводе средств между пользователями."""
 
-    event_type: str = "balance.transferred"
-    sender_id: int = Field(..., description="ID отправителя")
-    receiver_id: int = Field(..., description="ID получателя")
-    amount: float = Field(..., gt=0, description="Сумма перевода")
-    currency: str = Field("UZT", description="Тип валюты")
-    transaction_id: int | None = Field(None, description="ID связанной транзакции")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "balance.transferred"
+    sender_id: Annotated[int, Meta(description="ID отправителя")]
+    receiver_id: Annotated[int, Meta(description="ID получателя")]
+    amount: Annotated[float, Meta(gt=0, description="Сумма перевода")]
+    currency: Annotated[str, Meta(description="Тип валюты")] = "UZT"
+    transaction_id: Annotated[int | None, Meta(description="ID связанной транзакции")] = None
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
 
 # =================================================
 # 🔹 Событие: Ошибка при изменении баланса
 # =================================================
-class BalanceFailedEvent(DomainEvent):
+class BalanceFailedEvent(DomainEvent, kw_only=True):
     """Генерируется при ошибке или откате финансовой операции."""
 
-    event_type: str = "balance.failed"
+    event_type: ClassVar[str] = "balance.failed"
     user_id: int
     amount: float
-    error_message: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
+    error_message: ShortReason
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
-# =================================================
-# 🔹 Общие настройки модели
-# =================================================
-for cls in (
-    BalanceUpdatedEvent,
-    BalanceDepositedEvent,
-    BalanceWithdrawnEvent,
-    BalanceTransferredEvent,
-    BalanceFailedEvent,
-):
-    cls.model_config = {"from_attributes": True}
@@ -21,43 +21,126 @@ await EventDispatcher.publish(event)
 """
 
 from __future__ import annotations
+import sys
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Annotated, Any, ClassVar, Dict, Type
+
+import msgspec
+from msgspec import Meta
+
+from domain.events.codec import encode
+
+
+# Имя класса события → event_type. Значение используется как тег msgspec:
+# попадает в JSON (`tag_field="event_type"`), но не хранится в экземпляре.
+_EVENT_TAGS: Dict[str, str] = {}
+
+
+# Свободный текст (причины, ошибки): длина ограничена, чтобы не гонять по шине
+# произвольно большие строки. Ограничение проверяется при декодировании payload'ов,
+# поэтому сервисы обрезают пользовательский текст через short_reason() до публикации.
+SHORT_REASON_MAX_LENGTH = 512
+ShortReason = Annotated[str, Meta(max_length=SHORT_REASON_MAX_LENGTH)]
+
+
+def short_reason(text: str | None) -> str | None:
+    """
+    Обрезает текст до SHORT_REASON_MAX_LENGTH символов (с «…» в конце):
+    иначе событие закодируется, но релей не сможет его декодировать.
+    """
+    if text is None or len(text) <= SHORT_REASON_MAX_LENGTH:
+        return text
+    return text[: SHORT_REASON_MAX_LENGTH - 1] + "…"
+
+
+# event_type → класс события (заполняется автоматически в __init_subclass__)
+_REGISTRY: Dict[str, Type["DomainEvent"]] = {}
+
+
+def _new_event_id() -> str:
+    return str(uuid.uuid4())
+
+
+def now_ms() -> int:
+    """Текущее время UTC в миллисекундах от эпохи (метка времени событий)."""
+    return time.time_ns() // 1_000_000
+
+
+def to_ms(value: datetime) -> int:
+    """
+    Переводит момент времени в миллисекунды от эпохи (UTC).
+    Naive datetime считается UTC: так сервисы передают в событие тот же момент,
+    что записали в поля `*_at`.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def _event_tag(class_name: str) -> str:
+    return _EVENT_TAGS.get(class_name, class_name)
 
 
 # -------------------------------------------------
 # 🔹 Базовый доменный ивент
 # -------------------------------------------------
-class DomainEvent(BaseModel):
+class DomainEvent(
+    msgspec.Struct,
+    frozen=True,
+    kw_only=True,
+    forbid_unknown_fields=True,
+    tag_field="event_type",
+    tag=_event_tag,
+):
     """
     Базовый класс для всех событий домена Uzinex Boost.
+
+    События — неизменяемые `msgspec.Struct` без валидации при создании:
+    типы проверяются только при декодировании входящих payload'ов,
+    неизвестные поля при этом отклоняются (`forbid_unknown_fields`).
     """
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Уникальный идентификатор события")
-    event_type: str = Field(..., description="Тип события (например: balance.updated, user.registered)")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Время генерации события (UTC)")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Дополнительные метаданные события")
+    id: Annotated[str, Meta(description="Уникальный идентификатор события")] = msgspec.field(
+        default_factory=_new_event_id
+    )
+    # Тип события (например: balance.updated, user.registered) — константа класса
+    event_type: ClassVar[str] = "domain.event"
+
+    timestamp: Annotated[int, Meta(description="Время генерации события (UTC, мс от эпохи)")] = msgspec.field(
+        default_factory=now_ms
+    )
+    metadata: Annotated[Dict[str, Any], Meta(description="Дополнительные метаданные события")] = msgspec.field(
+        default_factory=dict
+    )
 
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
-        orm_mode = True
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Вызывается до того, как msgspec вычислит тег класса.
+        # event_type интернируется: сравнения и поиск подписчиков идут по указателю.
+        super().__init_subclass__(**kwargs)
+        cls.event_type = sys.intern(cls.event_type)
+        _EVENT_TAGS[cls.__qualname__] = cls.event_type
+        _REGISTRY[cls.event_type] = cls
 
     # -------------------------------------------------
     # 🔹 Утилиты
     # -------------------------------------------------
     def to_dict(self) -> Dict[str, Any]:
         """Преобразует событие в словарь для логирования или публикации."""
-        return self.model_dump()
+        return {"event_type": self.event_type, **msgspec.structs.asdict(self)}
 
-    def to_json(self) -> str:
-        """Возвращает JSON-представление события."""
-        return self.model_dump_json(indent=2)
+    def to_json(self, pretty: bool = False) -> bytes:
+        """
+        Возвращает JSON-представление события (компактное, для брокера).
+        `pretty=True` — форматированный вывод для логов и отладки.
+        """
+        data = encode(self)
+        return msgspec.json.format(data, indent=2) if pretty else data
 
     def __str__(self) -> str:
-        return f"<DomainEvent {self.event_type} id={self.id} at={self.timestamp.isoformat()}>"
+        at = datetime.fromtimestamp(self.timestamp / 1000, tz=timezone.utc).isoformat()
+        return f"<DomainEvent {self.event_type} id={self.id} at={at}>"
 
     # -------------------------------------------------
     # 🔹 Фабричный метод
@@ -66,5 +149,19 @@ class DomainEvent(BaseModel):
     def from_payload(cls, payload: Dict[str, Any]) -> "DomainEvent":
         """
         Создаёт событие из словаря данных (например, из брокера сообщений).
+        Типы полей проверяются msgspec при конвертации.
+        Вызов на базовом `DomainEvent` выбирает класс по `payload["event_type"]`.
         """
-        return cls(**payload)
+        target = get_event_class(payload["event_type"]) if cls is DomainEvent else cls
+        return msgspec.convert(payload, target)
+
+
+# -------------------------------------------------
+# 🔹 Реестр событий
+# -------------------------------------------------
+def get_event_class(event_type: str) -> Type[DomainEvent]:
+    """
+    Возвращает класс события по его `event_type` (один поиск в словаре).
+    Бросает KeyError для неизвестного типа.
+    """
+    return _REGISTRY[sys.intern(event_type)]
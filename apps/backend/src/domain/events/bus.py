@@ -0,0 +1,127 @@
+"""
+Uzinex Boost — Event Batcher
+============================
+
+Пакетная публикация доменных событий.
+
+Назначение:
+- накапливает события в буфере вместо публикации по одному;
+- сбрасывает буфер по размеру (`flush_n`) или по таймеру (`flush_ms`);
+- сериализует пакет одним вызовом (NDJSON через msgspec) и отдаёт его
+  во внешний продюсер (`sink`) за один round-trip;
+- доставляет события локальным подписчикам через EventDispatcher.
+
+Используется в:
+- domain.events.outbox (OutboxRelay — события из outbox после коммита)
+- main (flush при остановке приложения)
+"""
+
+from __future__ import annotations
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+from loguru import logger
+
+from domain.events.base import DomainEvent
+from domain.events.codec import encode_batch
+from domain.events.dispatcher import EventDispatcher
+
+
+# -------------------------------------------------
+# 🔹 Типы
+# -------------------------------------------------
+EventSink = Callable[[bytes], Awaitable[None]]
+
+
+# -------------------------------------------------
+# 🔹 Пакетный публикатор событий
+# -------------------------------------------------
+class EventBatcher:
+    """
+    Буферизует доменные события и публикует их пакетами.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[EventSink] = None,
+        flush_n: int = 256,
+        flush_ms: int = 20,
+    ):
+        self.sink = sink
+        self.flush_n = flush_n
+        self.flush_ms = flush_ms
+        self._buf: List[DomainEvent] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------
+    # 🔹 Публикация
+    # -------------------------------------------------
+    async def publish(self, event: DomainEvent) -> None:
+        """
+        Добавляет событие в буфер; при достижении `flush_n` сразу сбрасывает пакет.
+        """
+        self._buf.append(event)
+        if len(self._buf) >= self.flush_n:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._periodic_flush())
+
+    # -------------------------------------------------
+    # 🔹 Сброс буфера
+    # -------------------------------------------------
+    async def flush(self) -> None:
+        """
+        Публикует все накопленные события одним пакетом.
+        Ошибка записи в `sink` пробрасывается вызывающему.
+        """
+        if not self._buf:
+            return
+
+        batch, self._buf = self._buf, []
+        await self.publish_batch(batch)
+
+    async def publish_batch(self, batch: List[DomainEvent]) -> None:
+        """
+        Публикует готовый пакет напрямую, минуя буфер и таймер.
+        Если `sink` не принял пакет, исключение пробрасывается, а локальные подписчики
+        не вызываются: OutboxRelay не фиксирует `sent_at`, и пакет будет отправлен повторно.
+        """
+        if self.sink is not None:
+            try:
+                await self.sink(encode_batch(batch))
+            except Exception as e:
+                logger.error(
+                    "[EventBatcher] Failed to write batch of {} event(s): {}", len(batch), e
+                )
+                raise
+
+        for event in batch:
+            await EventDispatcher.publish(event)
+
+    async def _periodic_flush(self) -> None:
+        await asyncio.sleep(self.flush_ms / 1000)
+        try:
+            await self.flush()
+        except Exception:
+            pass  # уже залогировано в publish_batch; фоновой задаче пробрасывать некуда
+
+    # -------------------------------------------------
+    # 🔹 Остановка
+    # -------------------------------------------------
+    async def close(self) -> None:
+        """
+        Останавливает таймер и сбрасывает остаток буфера (graceful shutdown).
+        """
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            pass  # уже залогировано в publish_batch; остановку приложения не прерываем
+
+
+# -------------------------------------------------
+# 🔹 Глобальный экземпляр
+# -------------------------------------------------
+event_batcher = EventBatcher()
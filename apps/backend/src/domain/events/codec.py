@@ -0,0 +1,52 @@
+"""
+Uzinex Boost — Event Codec
+==========================
+
+Сериализация доменных событий в байты для публикации.
+
+Назначение:
+- единый переиспользуемый msgspec JSON-энкодер на процесс;
+- кодирование одного события (`encode`) и пакета в NDJSON (`encode_batch`);
+- декодирование в конкретный класс или tagged union (`decode`);
+- результат сразу `bytes` — без промежуточного str → bytes на пути в сокет.
+
+Используется в:
+- domain.events.base (DomainEvent.to_json)
+- domain.events.bus (EventBatcher)
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Iterable
+
+import msgspec
+
+if TYPE_CHECKING:
+    from domain.events.base import DomainEvent
+
+
+# Создаётся один раз: энкодер кэширует внутренние буферы между вызовами
+_ENCODER = msgspec.json.Encoder()
+
+# Декодеры по целевому типу (класс события или tagged union) — собираются один раз
+_DECODERS: Dict[Any, msgspec.json.Decoder] = {}
+
+
+def encode(event: "DomainEvent") -> bytes:
+    """Кодирует событие в компактный JSON (тег `event_type` включается автоматически)."""
+    return _ENCODER.encode(event)
+
+
+def encode_batch(events: Iterable["DomainEvent"]) -> bytes:
+    """Кодирует пакет событий в NDJSON (одна строка — одно событие)."""
+    return _ENCODER.encode_lines(events)
+
+
+def decode(data: bytes, type_: Any) -> Any:
+    """
+    Декодирует JSON в событие указанного типа.
+    Для tagged union (например, `PaymentEvent`) класс выбирается по `event_type`.
+    """
+    decoder = _DECODERS.get(type_)
+    if decoder is None:
+        decoder = _DECODERS[type_] = msgspec.json.Decoder(type_)
+    return decoder.decode(data)
@@ -24,6 +24,7 @@ Uzinex Boost — Event Dispatcher
 
 from __future__ import annotations
 import asyncio
+import sys
 from typing import Any, Awaitable, Callable, Dict, List, Type, Union
 from loguru import logger
 
@@ -54,6 +55,7 @@ class EventDispatcher:
         """
         Регистрирует обработчик на определённый тип события.
         """
+        event_type = sys.intern(event_type)
         if event_type not in cls._subscribers:
             cls._subscribers[event_type] = []
         cls._subscribers[event_type].append(handler)
@@ -18,119 +18,121 @@ Uzinex Boost — Order Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, ShortReason, now_ms
 
 
 # -------------------------------------------------
 # 🔹 Событие: Заказ создан
 # -------------------------------------------------
-class OrderCreatedEvent(DomainEvent):
+class OrderCreatedEvent(DomainEvent, kw_only=True):
     """
     Генерируется при создании нового заказа заказчиком.
     """
 
-    event_type: str = "order.created"
-    order_id: int = Field(..., description="ID заказа")
-    client_id: int = Field(..., description="ID заказчика")
-    performer_id: int | None = Field(None, description="ID исполнителя, если уже выбран")
-    title: str = Field(..., description="Название или описание заказа")
-    price: float = Field(..., description="Стоимость заказа (UZT)")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "order.created"
+    order_id: Annotated[int, Meta(description="ID заказа")]
+    client_id: Annotated[int, Meta(description="ID заказчика")]
+    performer_id: Annotated[int | None, Meta(description="ID исполнителя, если уже выбран")] = None
+    title: Annotated[str, Meta(description="Название или описание заказа")]
+    price: Annotated[float, Meta(description="Стоимость заказа (UZT)")]
+    created_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Заказ принят исполнителем
 # -------------------------------------------------
-class OrderAcceptedEvent(DomainEvent):
+class OrderAcceptedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда исполнитель подтверждает участие в заказе.
     """
 
-    event_type: str = "order.accepted"
+    event_type: ClassVar[str] = "order.accepted"
     order_id: int
     performer_id: int
-    accepted_at: datetime = Field(default_factory=datetime.utcnow)
+    accepted_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Заказ выполнен исполнителем
 # -------------------------------------------------
-class OrderCompletedEvent(DomainEvent):
+class OrderCompletedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда исполнитель завершает выполнение заказа.
     """
 
-    event_type: str = "order.completed"
+    event_type: ClassVar[str] = "order.completed"
     order_id: int
-    performer_id: int
-    price: float = Field(..., description="Оплата за выполнение заказа")
-    completed_at: datetime = Field(default_factory=datetime.utcnow)
+    performer_id: Annotated[int | None, Meta(description="ID исполнителя, если он один")] = None
+    price: Annotated[float, Meta(description="Оплата за выполнение заказа")]
+    completed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Заказ подтверждён заказчиком
 # -------------------------------------------------
-class OrderConfirmedEvent(DomainEvent):
+class OrderConfirmedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда заказчик подтверждает выполнение заказа.
     """
 
-    event_type: str = "order.confirmed"
+    event_type: ClassVar[str] = "order.confirmed"
     order_id: int
     client_id: int
     performer_id: int
-    confirmed_at: datetime = Field(default_factory=datetime.utcnow)
+    confirmed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Заказ отменён
 # -------------------------------------------------
-class OrderCancelledEvent(DomainEvent):
+class OrderCancelledEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда заказ отменяется (клиентом, исполнителем или системой).
     """
 
-    event_type: str = "order.cancelled"
+    event_type: ClassVar[str] = "order.cancelled"
     order_id: int
-    cancelled_by: int = Field(..., description="ID пользователя, отменившего заказ")
-    reason: str | None = Field(None, description="Причина отмены")
-    refunded: bool = Field(default=False, description="Возврат средств выполнен?")
-    cancelled_at: datetime = Field(default_factory=datetime.utcnow)
+    cancelled_by: Annotated[int, Meta(description="ID пользователя, отменившего заказ")]
+    reason: Annotated[ShortReason | None, Meta(description="Причина отмены")] = None
+    refunded: Annotated[bool, Meta(description="Возврат средств выполнен?")] = False
+    cancelled_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж за заказ подтверждён
 # -------------------------------------------------
-class OrderPaidEvent(DomainEvent):
+class OrderPaidEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда платёж за заказ успешно проведён.
     """
 
-    event_type: str = "order.paid"
+    event_type: ClassVar[str] = "order.paid"
     order_id: int
     payment_id: int
     client_id: int
-    performer_id: int | None = Field(None, description="ID исполнителя (если известен)")
-    amount: float = Field(..., description="Сумма платежа")
-    paid_at: datetime = Field(default_factory=datetime.utcnow)
+    performer_id: Annotated[int | None, Meta(description="ID исполнителя (если известен)")] = None
+    amount: Annotated[float, Meta(description="Сумма платежа")]
+    paid_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Исполнитель получил оплату
 # -------------------------------------------------
-class OrderRewardedEvent(DomainEvent):
+class OrderRewardedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда исполнителю начислены средства за выполненный заказ.
     """
 
-    event_type: str = "order.rewarded"
+    event_type: ClassVar[str] = "order.rewarded"
     order_id: int
     performer_id: int
     amount: float
     balance_before: float
     balance_after: float
-    transaction_id: int | None = Field(None, description="ID транзакции начисления")
-    rewarded_at: datetime = Field(default_factory=datetime.utcnow)
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции начисления")] = None
+    rewarded_at: int = msgspec.field(default_factory=now_ms)
@@ -0,0 +1,189 @@
+"""
+Uzinex Boost — Outbox Relay
+===========================
+
+Фоновая доставка доменных событий из таблицы `outbox`.
+
+Назначение:
+- читает неотправленные события пачками (`FOR UPDATE SKIP LOCKED` —
+  несколько воркеров не берут одни и те же строки);
+- декодирует их в классы событий и передаёт пакет в EventBatcher;
+- отмечает `sent_at` в той же транзакции, только если шина приняла пакет;
+- переводит недекодируемые события в dead letter (`failed_at`, `error`);
+- удаляет отправленные события старше OUTBOX_RETENTION_HOURS;
+- ограничивает число одновременных пачек семафором (по размеру пула БД).
+
+Доставка — at-least-once: при падении между публикацией и коммитом
+пачка будет отправлена повторно, обработчики должны быть идемпотентны.
+
+Используется в:
+- main (запуск и остановка вместе с приложением, `outbox_relay`)
+"""
+
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.database import async_session_factory
+from db.models.outbox_model import OutboxEvent
+from domain.events.base import get_event_class
+from domain.events.bus import event_batcher
+from domain.events.codec import decode
+
+
+# -------------------------------------------------
+# 🔹 Релей outbox
+# -------------------------------------------------
+class OutboxRelay:
+    """
+    Периодически переносит события из outbox в шину событий.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 100,
+        poll_interval_s: float = 0.5,
+        max_concurrency: Optional[int] = None,
+        purge_interval_s: float = 600.0,
+        purge_batch_size: int = 5_000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval_s = poll_interval_s
+        self.purge_interval_s = purge_interval_s
+        self.purge_batch_size = purge_batch_size
+        # drain_once может вызываться извне (финальный дренаж, ручной запуск)
+        # параллельно с фоновым циклом — не даём пачкам занять весь пул
+        self._sem = asyncio.Semaphore(max_concurrency or max(1, settings.DB_POOL_SIZE - 2))
+        self._task: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------
+    # 🔹 Одна пачка
+    # -------------------------------------------------
+    async def drain_once(self) -> int:
+        """
+        Публикует одну пачку неотправленных событий.
+        Возвращает количество обработанных строк.
+        Если шина не приняла пачку, исключение пробрасывается и транзакция
+        откатывается: строки останутся неотправленными до следующей попытки.
+        """
+        async with self._sem, self.session_factory() as session:
+            result = await session.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.sent_at.is_(None), OutboxEvent.failed_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return 0
+
+            now = datetime.utcnow()
+            batch = []
+            for row in rows:
+                try:
+                    event = decode(row.payload_json, get_event_class(row.event_type))
+                except Exception as e:
+                    # Неизвестный тип / битый payload не должен блокировать очередь:
+                    # строка уходит в dead letter и остаётся для разбора
+                    logger.error(
+                        "[Outbox] Dead-lettering event #{} ({}): {}", row.id, row.event_type, e
+                    )
+                    row.failed_at = now
+                    row.error = str(e)
+                    continue
+                batch.append(event)
+                row.sent_at = now
+
+            if batch:
+                await event_batcher.publish_batch(batch)
+            await session.commit()
+            return len(rows)
+
+    # -------------------------------------------------
+    # 🔹 Очистка отправленных событий
+    # -------------------------------------------------
+    async def purge_sent_once(self) -> int:
+        """
+        Удаляет одну пачку отправленных событий старше срока хранения
+        (`OUTBOX_RETENTION_HOURS`). Старые строки — в начале по id, поэтому выборка
+        идёт по первичному ключу. Возвращает количество удалённых строк.
+        """
+        cutoff = datetime.utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        async with self._sem, self.session_factory() as session:
+            expired = (
+                select(OutboxEvent.id)
+                .where(OutboxEvent.sent_at < cutoff)
+                .order_by(OutboxEvent.id)
+                .limit(self.purge_batch_size)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                delete(OutboxEvent)
+                .where(OutboxEvent.id.in_(expired))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+    # -------------------------------------------------
+    # 🔹 Фоновый цикл
+    # -------------------------------------------------
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_purge = loop.time() + self.purge_interval_s
+        while True:
+            try:
+                drained = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("[Outbox] Drain failed: {}", e)
+                drained = 0
+            if loop.time() >= next_purge:
+                next_purge = loop.time() + self.purge_interval_s
+                try:
+                    purged = await self.purge_sent_once()
+                    if purged:
+                        logger.info("[Outbox] Purged {} sent event(s)", purged)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("[Outbox] Purge failed: {}", e)
+            # Полная пачка — сразу берём следующую, иначе ждём новых событий
+            if drained < self.batch_size:
+                await asyncio.sleep(self.poll_interval_s)
+
+    def start(self) -> None:
+        """Запускает фоновую задачу релея (повторный вызов игнорируется)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает релей и дренирует остаток outbox (graceful shutdown)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        try:
+            while await self.drain_once() == self.batch_size:
+                pass
+        except Exception as e:
+            logger.error("[Outbox] Final drain failed: {}", e)
+
+
+# -------------------------------------------------
+# 🔹 Глобальный экземпляр
+# -------------------------------------------------
+outbox_relay = OutboxRelay(async_session_factory)
@@ -20,82 +20,97 @@ Uzinex Boost — Payment Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar, Union
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, ShortReason, now_ms
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж создан
 # -------------------------------------------------
-class PaymentCreatedEvent(DomainEvent):
+class PaymentCreatedEvent(DomainEvent, kw_only=True):
     """Генерируется при инициализации нового платежа."""
 
-    event_type: str = "payment.created"
-    payment_id: int = Field(..., description="ID платежа")
-    user_id: int = Field(..., description="ID пользователя, инициировавшего платёж")
-    amount: float = Field(..., description="Сумма платежа (UZT)")
-    method: str = Field(..., description="Метод оплаты (click, payme, uzcard, crypto и т.д.)")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "payment.created"
+    payment_id: Annotated[int, Meta(description="ID платежа")]
+    user_id: Annotated[int, Meta(description="ID пользователя, инициировавшего платёж")]
+    amount: Annotated[float, Meta(description="Сумма платежа (UZT)")]
+    method: Annotated[str, Meta(description="Метод оплаты (click, payme, uzcard, crypto и т.д.)")]
+    created_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж подтверждён
 # -------------------------------------------------
-class PaymentConfirmedEvent(DomainEvent):
+class PaymentConfirmedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда внешний провайдер подтвердил платёж."""
 
-    event_type: str = "payment.confirmed"
+    event_type: ClassVar[str] = "payment.confirmed"
     payment_id: int
     user_id: int
     amount: float
     method: str
-    provider_txn_id: str | None = Field(None, description="ID транзакции у провайдера")
-    confirmed_at: datetime = Field(default_factory=datetime.utcnow)
+    provider_txn_id: Annotated[str | None, Meta(description="ID транзакции у провайдера")] = None
+    confirmed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж успешно завершён
 # -------------------------------------------------
-class PaymentCompletedEvent(DomainEvent):
+class PaymentCompletedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда платёж полностью обработан и баланс пополнен."""
 
-    event_type: str = "payment.completed"
+    event_type: ClassVar[str] = "payment.completed"
     payment_id: int
     user_id: int
     amount: float
     method: str
-    transaction_id: int | None = Field(None, description="ID транзакции в системе баланса")
-    completed_at: datetime = Field(default_factory=datetime.utcnow)
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции в системе баланса")] = None
+    completed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж неуспешен / отклонён
 # -------------------------------------------------
-class PaymentFailedEvent(DomainEvent):
+class PaymentFailedEvent(DomainEvent, kw_only=True):
     """Генерируется при ошибке или отмене платежа."""
 
-    event_type: str = "payment.failed"
+    event_type: ClassVar[str] = "payment.failed"
     payment_id: int
     user_id: int
     amount: float
     method: str
-    error_code: str | None = Field(None, description="Код ошибки от платёжной системы")
-    error_message: str | None = Field(None, description="Описание ошибки")
-    failed_at: datetime = Field(default_factory=datetime.utcnow)
+    error_code: Annotated[str | None, Meta(description="Код ошибки от платёжной системы")] = None
+    error_message: Annotated[ShortReason | None, Meta(description="Описание ошибки")] = None
+    failed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Платёж возвращён (Refund)
 # -------------------------------------------------
-class PaymentRefundedEvent(DomainEvent):
+class PaymentRefundedEvent(DomainEvent, kw_only=True):
     """Генерируется при возврате средств пользователю."""
 
-    event_type: str = "payment.refunded"
+    event_type: ClassVar[str] = "payment.refunded"
     payment_id: int
     user_id: int
     amount: float
     method: str
-    reason: str | None = Field(None, description="Причина возврата")
-    refunded_at: datetime = Field(default_factory=datetime.utcnow)
+    reason: Annotated[ShortReason | None, Meta(description="Причина возврата")] = None
+    refunded_at: int = msgspec.field(default_factory=now_ms)
+
+
+# -------------------------------------------------
+# 🔹 Tagged union всех событий платежей
+# -------------------------------------------------
+# msgspec выбирает класс по тегу `event_type` одним поиском — без перебора вариантов.
+PaymentEvent = Union[
+    PaymentCreatedEvent,
+    PaymentConfirmedEvent,
+    PaymentCompletedEvent,
+    PaymentFailedEvent,
+    PaymentRefundedEvent,
+]
@@ -19,83 +19,97 @@ Uzinex Boost — Referral Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar, Union
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, now_ms
 
 
 # -------------------------------------------------
 # 🔹 Событие: Новый реферал приглашён
 # -------------------------------------------------
-class ReferralInvitedEvent(DomainEvent):
+class ReferralInvitedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователь отправил приглашение новому участнику."""
 
-    event_type: str = "referral.invited"
-    inviter_id: int = Field(..., description="ID пользователя, пригласившего нового участника")
-    invitee_email: str = Field(..., description="Email приглашённого пользователя")
-    invite_code: str = Field(..., description="Код приглашения или ссылка")
-    invited_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "referral.invited"
+    inviter_id: Annotated[int, Meta(description="ID пользователя, пригласившего нового участника")]
+    invitee_email: Annotated[str, Meta(description="Email приглашённого пользователя")]
+    invite_code: Annotated[str, Meta(description="Код приглашения или ссылка")]
+    invited_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Новый реферал зарегистрировался (добавлено)
 # -------------------------------------------------
-class ReferralRegisteredEvent(DomainEvent):
+class ReferralRegisteredEvent(DomainEvent, kw_only=True):
     """Генерируется, когда приглашённый пользователь завершает регистрацию."""
 
-    event_type: str = "referral.registered"
-    inviter_id: int = Field(..., description="ID пользователя, пригласившего реферала")
-    referral_id: int = Field(..., description="ID нового зарегистрированного пользователя")
-    referral_email: str | None = Field(None, description="Email нового пользователя (если есть)")
-    registered_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "referral.registered"
+    inviter_id: Annotated[int, Meta(description="ID пользователя, пригласившего реферала")]
+    referral_id: Annotated[int, Meta(description="ID нового зарегистрированного пользователя")]
+    referral_email: Annotated[str | None, Meta(description="Email нового пользователя (если есть)")] = None
+    registered_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Новый реферал присоединился
 # -------------------------------------------------
-class ReferralJoinedEvent(DomainEvent):
+class ReferralJoinedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда приглашённый пользователь успешно зарегистрировался."""
 
-    event_type: str = "referral.joined"
+    event_type: ClassVar[str] = "referral.joined"
     inviter_id: int
-    referral_id: int = Field(..., description="ID нового реферала")
-    joined_at: datetime = Field(default_factory=datetime.utcnow)
+    referral_id: Annotated[int, Meta(description="ID нового реферала")]
+    joined_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Реферальный бонус начислен
 # -------------------------------------------------
-class ReferralRewardedEvent(DomainEvent):
+class ReferralRewardedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователю начисляется бонус за активность его реферала."""
 
-    event_type: str = "referral.rewarded"
-    inviter_id: int = Field(..., description="ID пользователя, получившего бонус")
-    referral_id: int = Field(..., description="ID реферала, за которого начислен бонус")
-    amount: float = Field(..., description="Сумма бонуса (UZT)")
-    reason: str = Field(..., description="Причина бонуса (signup, task_completed, deposit и т.д.)")
-    transaction_id: int | None = Field(None, description="ID связанной транзакции")
-    rewarded_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "referral.rewarded"
+    inviter_id: Annotated[int, Meta(description="ID пользователя, получившего бонус")]
+    referral_id: Annotated[int, Meta(description="ID реферала, за которого начислен бонус")]
+    amount: Annotated[float, Meta(description="Сумма бонуса (UZT)")]
+    reason: Annotated[str, Meta(description="Причина бонуса (signup, task_completed, deposit и т.д.)")]
+    transaction_id: Annotated[int | None, Meta(description="ID связанной транзакции")] = None
+    rewarded_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Достигнут новый уровень реферальной программы
 # -------------------------------------------------
-class ReferralLevelUpEvent(DomainEvent):
+class ReferralLevelUpEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователь достигает нового уровня реферальной программы."""
 
-    event_type: str = "referral.level_up"
-    user_id: int = Field(..., description="ID пользователя, достигшего нового уровня")
-    new_level: int = Field(..., description="Новый уровень в реферальной системе")
-    bonus_amount: float = Field(default=0.0, description="Бонус за повышение уровня, если есть")
-    achieved_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "referral.level_up"
+    user_id: Annotated[int, Meta(description="ID пользователя, достигшего нового уровня")]
+    new_level: Annotated[int, Meta(description="Новый уровень в реферальной системе")]
+    bonus_amount: Annotated[float, Meta(description="Бонус за повышение уровня, если есть")] = 0.0
+    achieved_at: int = msgspec.field(default_factory=now_ms)
 
 # -------------------------------------------------
 # 🔹 Алиас для совместимости со старыми сервисами
 # -------------------------------------------------
-class ReferralBonusGrantedEvent(ReferralRewardedEvent):
+class ReferralBonusGrantedEvent(ReferralRewardedEvent, kw_only=True):
     """Событие-синоним для обратной совместимости (referral.rewarded)."""
 
-    event_type: str = "referral.bonus_granted"
+    event_type: ClassVar[str] = "referral.bonus_granted"
 
 
+# -------------------------------------------------
+# 🔹 Tagged union всех событий реферальной системы
+# -------------------------------------------------
+# msgspec выбирает класс по тегу `event_type` одним поиском — без перебора вариантов.
+ReferralEvent = Union[
+    ReferralInvitedEvent,
+    ReferralRegisteredEvent,
+    ReferralJoinedEvent,
+    ReferralRewardedEvent,
+    ReferralLevelUpEvent,
+    ReferralBonusGrantedEvent,
+]
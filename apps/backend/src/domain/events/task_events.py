@@ -19,103 +19,120 @@ Uzinex Boost — Task Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar, Union
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, ShortReason, now_ms
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание создано
 # -------------------------------------------------
-class TaskCreatedEvent(DomainEvent):
+class TaskCreatedEvent(DomainEvent, kw_only=True):
     """Генерируется при создании нового задания пользователем или системой."""
 
-    event_type: str = "task.created"
-    task_id: int = Field(..., description="ID задания")
-    creator_id: int = Field(..., description="ID пользователя, создавшего задание")
-    title: str = Field(..., description="Название задания")
-    reward: float = Field(..., description="Вознаграждение за выполнение (UZT)")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "task.created"
+    task_id: Annotated[int, Meta(description="ID задания")]
+    creator_id: Annotated[int, Meta(description="ID пользователя, создавшего задание")]
+    title: Annotated[str, Meta(description="Название задания")]
+    reward: Annotated[float, Meta(description="Вознаграждение за выполнение (UZT)")]
+    created_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание принято исполнителем (новое)
 # -------------------------------------------------
-class TaskAcceptedEvent(DomainEvent):
+class TaskAcceptedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда исполнитель принимает задание и начинает его выполнение."""
 
-    event_type: str = "task.accepted"
+    event_type: ClassVar[str] = "task.accepted"
     task_id: int
-    user_id: int = Field(..., description="ID исполнителя, принявшего задание")
-    accepted_at: datetime = Field(default_factory=datetime.utcnow)
+    user_id: Annotated[int, Meta(description="ID исполнителя, принявшего задание")]
+    accepted_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание взято в работу
 # -------------------------------------------------
-class TaskAssignedEvent(DomainEvent):
+class TaskAssignedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда система назначает задание конкретному исполнителю."""
 
-    event_type: str = "task.assigned"
+    event_type: ClassVar[str] = "task.assigned"
     task_id: int
-    user_id: int = Field(..., description="ID исполнителя")
-    assigned_at: datetime = Field(default_factory=datetime.utcnow)
+    user_id: Annotated[int, Meta(description="ID исполнителя")]
+    assigned_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание выполнено
 # -------------------------------------------------
-class TaskCompletedEvent(DomainEvent):
+class TaskCompletedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователь успешно завершает задание."""
 
-    event_type: str = "task.completed"
+    event_type: ClassVar[str] = "task.completed"
     task_id: int
     user_id: int
-    reward: float = Field(..., description="Вознаграждение за выполнение")
-    verified: bool = Field(default=False, description="Подтверждено ли модератором")
-    completed_at: datetime = Field(default_factory=datetime.utcnow)
+    reward: Annotated[float, Meta(description="Вознаграждение за выполнение")]
+    verified: Annotated[bool, Meta(description="Подтверждено ли модератором")] = False
+    completed_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание проверено и одобрено
 # -------------------------------------------------
-class TaskApprovedEvent(DomainEvent):
+class TaskApprovedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда модератор одобрил выполненное задание."""
 
-    event_type: str = "task.approved"
+    event_type: ClassVar[str] = "task.approved"
     task_id: int
     user_id: int
     reward: float
-    approved_by: int = Field(..., description="ID модератора, одобрившего задание")
-    approved_at: datetime = Field(default_factory=datetime.utcnow)
+    approved_by: Annotated[int | None, Meta(description="ID модератора, одобрившего задание")] = None
+    approved_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Задание отклонено (ошибка/мошенничество)
 # -------------------------------------------------
-class TaskRejectedEvent(DomainEvent):
+class TaskRejectedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда задание отклонено модератором."""
 
-    event_type: str = "task.rejected"
+    event_type: ClassVar[str] = "task.rejected"
     task_id: int
     user_id: int
-    reason: str = Field(..., description="Причина отклонения задания")
-    rejected_by: int = Field(..., description="ID модератора, отклонившего задание")
-    rejected_at: datetime = Field(default_factory=datetime.utcnow)
+    reason: Annotated[ShortReason, Meta(description="Причина отклонения задания")]
+    rejected_by: Annotated[int | None, Meta(description="ID модератора, отклонившего задание")] = None
+    rejected_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Вознаграждение за задание начислено
 # -------------------------------------------------
-class TaskRewardedEvent(DomainEvent):
+class TaskRewardedEvent(DomainEvent, kw_only=True):
     """Генерируется, когда пользователю начисляется вознаграждение за выполненное задание."""
 
-    event_type: str = "task.rewarded"
+    event_type: ClassVar[str] = "task.rewarded"
     task_id: int
     user_id: int
     reward: float
     balance_before: float
     balance_after: float
-    transaction_id: int | None = Field(None, description="ID транзакции начисления")
-    rewarded_at: datetime = Field(default_factory=datetime.utcnow)
+    transaction_id: Annotated[int | None, Meta(description="ID транзакции начисления")] = None
+    rewarded_at: int = msgspec.field(default_factory=now_ms)
+
+
+# -------------------------------------------------
+# 🔹 Tagged union всех событий заданий
+# -------------------------------------------------
+# msgspec выбирает класс по тегу `event_type` одним поиском — без перебора вариантов.
+TaskEvent = Union[
+    TaskCreatedEvent,
+    TaskAcceptedEvent,
+    TaskAssignedEvent,
+    TaskCompletedEvent,
+    TaskApprovedEvent,
+    TaskRejectedEvent,
+    TaskRewardedEvent,
+]
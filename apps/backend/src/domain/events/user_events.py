@@ -17,82 +17,84 @@ Uzinex Boost — User Events
 """
 
 from __future__ import annotations
-from datetime import datetime
-from pydantic import Field
+from typing import Annotated, ClassVar
 
-from domain.events.base import DomainEvent
+import msgspec
+from msgspec import Meta
+
+from domain.events.base import DomainEvent, ShortReason, now_ms
 
 
 # -------------------------------------------------
 # 🔹 Событие: Пользователь зарегистрирован
 # -------------------------------------------------
-class UserRegisteredEvent(DomainEvent):
+class UserRegisteredEvent(DomainEvent, kw_only=True):
     """
     Генерируется при успешной регистрации нового пользователя.
     Используется для приветственных уведомлений, активации бонусов и аналитики.
     """
 
-    event_type: str = "user.registered"
-    user_id: int = Field(..., description="ID нового пользователя")
-    email: str = Field(..., description="Email пользователя")
-    username: str = Field(..., description="Username пользователя")
-    referral_id: int | None = Field(None, description="Если регистрация по реферальной ссылке")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    event_type: ClassVar[str] = "user.registered"
+    user_id: Annotated[int, Meta(description="ID нового пользователя")]
+    email: Annotated[str, Meta(description="Email пользователя")]
+    username: Annotated[str, Meta(description="Username пользователя")]
+    referral_id: Annotated[int | None, Meta(description="Если регистрация по реферальной ссылке")] = None
+    timestamp: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Пользователь подтвердил email
 # -------------------------------------------------
-class UserVerifiedEvent(DomainEvent):
+class UserVerifiedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда пользователь успешно подтвердил свой email.
     """
 
-    event_type: str = "user.verified"
+    event_type: ClassVar[str] = "user.verified"
     user_id: int
     email: str
-    verified_at: datetime = Field(default_factory=datetime.utcnow)
+    verified_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Пользователь обновил профиль
 # -------------------------------------------------
-class UserProfileUpdatedEvent(DomainEvent):
+class UserProfileUpdatedEvent(DomainEvent, kw_only=True):
     """
     Генерируется при обновлении профиля пользователя.
     """
 
-    event_type: str = "user.profile_updated"
+    event_type: ClassVar[str] = "user.profile_updated"
     user_id: int
-    username: str | None = Field(None, description="Новый username, если был изменён")
-    full_name: str | None = Field(None, description="Полное имя пользователя")
-    bio: str | None = Field(None, description="Описание профиля")
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    username: Annotated[str | None, Meta(description="Новый username, если был изменён")] = None
+    full_name: Annotated[str | None, Meta(description="Полное имя пользователя")] = None
+    bio: Annotated[str | None, Meta(description="Описание профиля")] = None
+    updated_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Пользователь деактивирован / заблокирован
 # -------------------------------------------------
-class UserDeactivatedEvent(DomainEvent):
+class UserDeactivatedEvent(DomainEvent, kw_only=True):
     """
     Генерируется, когда пользователь временно заблокирован или деактивирован.
     """
 
-    event_type: str = "user.deactivated"
+    event_type: ClassVar[str] = "user.deactivated"
     user_id: int
-    reason: str | None = Field(None, description="Причина деактивации")
-    deactivated_at: datetime = Field(default_factory=datetime.utcnow)
+    reason: Annotated[ShortReason | None, Meta(description="Причина деактивации")] = None
+    deactivated_at: int = msgspec.field(default_factory=now_ms)
 
 
 # -------------------------------------------------
 # 🔹 Событие: Пользователь удалён
 # -------------------------------------------------
-class UserDeletedEvent(DomainEvent):
+class UserDeletedEvent(DomainEvent, kw_only=True):
     """
     Генерируется при полном удалении пользователя из системы.
     """
 
-    event_type: str = "user.deleted"
+    event_type: ClassVar[str] = "user.deleted"
     user_id: int
-    deleted_by_admin: bool = Field(default=False, description="Удалён ли администратором")
-    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+    deleted_by_admin: Annotated[bool, Meta(description="Удалён ли администратором")] = False
+    deleted_at: int = msgspec.field(default_factory=now_ms)
@@ -20,10 +20,10 @@ Uzinex Boost — Balance Rules
 """
 
 from __future__ import annotations
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Final
 
-from domain.rules.base import BaseRule
+from domain.rules.base import BaseRule, RuleResult, to_epoch
 from db.repositories.transaction_repository import TransactionRepository
 
 
@@ -36,6 +36,21 @@ MAX_DAILY_WITHDRAW_COUNT = 3        # максимум операций выво
 MAX_DAILY_WITHDRAW_SUM = 10_000_000.0  # лимит общей суммы выводов в день
 MIN_DEPOSIT_AMOUNT = 5_000.0        # минимальная сумма пополнения
 COOLDOWN_BETWEEN_TX = timedelta(seconds=30)  # пауза между транзакциями
+COOLDOWN_BETWEEN_TX_S = int(COOLDOWN_BETWEEN_TX.total_seconds())
+WITHDRAW_WINDOW = timedelta(hours=24)        # окно для суточных лимитов
+
+_UTC = timezone.utc
+_INF = float("inf")
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_INVALID_AMOUNT = "Некорректная сумма"
+_MSG_MIN_WITHDRAW = f"Минимальная сумма вывода — {MIN_WITHDRAW_AMOUNT:.0f} UZT"
+_MSG_MAX_WITHDRAW = f"Сумма превышает лимит {MAX_WITHDRAW_AMOUNT:.0f} UZT за одну операцию"
+_MSG_MIN_DEPOSIT = f"Минимальная сумма пополнения — {MIN_DEPOSIT_AMOUNT:.0f} UZT"
+_MSG_MAX_DEPOSIT = f"Превышен лимит пополнения — {MAX_WITHDRAW_AMOUNT:.0f} UZT"
 
 
 # -------------------------------------------------
@@ -46,7 +61,8 @@ class BalanceRules(BaseRule):
     Набор правил для проверки допустимости операций с балансом.
     """
 
-    rule_name = "BalanceRules"
+    __slots__ = ()
+    rule_name: Final[str] = "BalanceRules"
 
     # -------------------------------------------------
     # 🔸 Проверка вывода средств
@@ -61,33 +77,38 @@ class BalanceRules(BaseRule):
         """
         Проверяет, может ли пользователь вывести указанную сумму.
         """
+        # 0️⃣ Мусорный ввод (<= 0, NaN, inf) — отказ до любых обращений к БД
+        if not (amount > 0 and amount == amount and amount != _INF):
+            return RuleResult.cached(cls.rule_name, False, _MSG_INVALID_AMOUNT)
+
         # 1️⃣ Минимальная и максимальная сумма
         if amount < MIN_WITHDRAW_AMOUNT:
-            return await cls._deny(f"Минимальная сумма вывода — {MIN_WITHDRAW_AMOUNT:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_WITHDRAW)
         if amount > MAX_WITHDRAW_AMOUNT:
-            return await cls._deny(f"Сумма превышает лимит {MAX_WITHDRAW_AMOUNT:.0f} UZT за одну операцию")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_WITHDRAW)
 
         # 2️⃣ Проверка частоты операций
-        now = datetime.utcnow()
-        since = now - timedelta(hours=24)
-        recent_tx = await transaction_repo.get_by_user(user_id)
-        recent_withdraws = [tx for tx in recent_tx if tx.type == "withdraw" and tx.created_at >= since]
-
-        if len(recent_withdraws) >= MAX_DAILY_WITHDRAW_COUNT:
-            return await cls._deny("Превышено количество операций вывода за сутки")
-
-        total_withdraw_sum = sum(abs(tx.amount) for tx in recent_withdraws)
-        if total_withdraw_sum + amount > MAX_DAILY_WITHDRAW_SUM:
-            return await cls._deny("Превышен дневной лимит суммы выводов")
+        # Колонки created_at хранят naive UTC — сравниваем в том же формате
+        now = datetime.now(_UTC).replace(tzinfo=None)
+        since = now - WITHDRAW_WINDOW
+        withdraw_count, withdraw_sum, _ = await transaction_repo.get_withdraw_stats_since(user_id, since)
+
+        if withdraw_count >= MAX_DAILY_WITHDRAW_COUNT:
+            return RuleResult.cached(
+                cls.rule_name, False, "Превышено количество операций вывода за сутки"
+            )
+        if withdraw_sum + amount > MAX_DAILY_WITHDRAW_SUM:
+            return RuleResult.cached(cls.rule_name, False, "Превышен дневной лимит суммы выводов")
 
         # 3️⃣ Проверка последней операции (anti-spam)
-        if recent_tx:
-            last_tx = max(recent_tx, key=lambda t: t.created_at)
-            if (now - last_tx.created_at) < COOLDOWN_BETWEEN_TX:
-                return await cls._deny("Слишком частые операции. Попробуйте через 30 секунд")
+        last_ts = await transaction_repo.get_last_tx_time(user_id)
+        if last_ts is not None and to_epoch(now) - to_epoch(last_ts) < COOLDOWN_BETWEEN_TX_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Слишком частые операции. Попробуйте через 30 секунд"
+            )
 
         # ✅ Всё хорошо
-        return await cls._allow("Вывод разрешён", {"amount": amount})
+        return RuleResult.cached(cls.rule_name, True, "Вывод разрешён", {"amount": amount})
 
     # -------------------------------------------------
     # 🔸 Проверка пополнения
@@ -98,10 +119,10 @@ class BalanceRules(BaseRule):
         Проверяет корректность суммы пополнения.
         """
         if amount < MIN_DEPOSIT_AMOUNT:
-            return await cls._deny(f"Минимальная сумма пополнения — {MIN_DEPOSIT_AMOUNT:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_DEPOSIT)
         if amount > MAX_WITHDRAW_AMOUNT:
-            return await cls._deny(f"Превышен лимит пополнения — {MAX_WITHDRAW_AMOUNT:.0f} UZT")
-        return await cls._allow("Пополнение разрешено", {"amount": amount})
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_DEPOSIT)
+        return RuleResult.cached(cls.rule_name, True, "Пополнение разрешено", {"amount": amount})
 
     # -------------------------------------------------
     # 🔸 Проверка перевода между пользователями
@@ -112,25 +133,16 @@ class BalanceRules(BaseRule):
         Проверяет допустимость перевода между пользователями.
         """
         if sender_id == receiver_id:
-            return await cls._deny("Невозможно перевести средства самому себе")
+            return RuleResult.cached(
+                cls.rule_name, False, "Невозможно перевести средства самому себе"
+            )
         if amount <= 0:
-            return await cls._deny("Сумма перевода должна быть больше нуля")
+            return RuleResult.cached(cls.rule_name, False, "Сумма перевода должна быть больше нуля")
         if amount < 1000:
-            return await cls._deny("Минимальная сумма перевода — 1000 UZT")
-        return await cls._allow("Перевод разрешён", {"sender_id": sender_id, "receiver_id": receiver_id})
-
-    # -------------------------------------------------
-    # 🔹 Вспомогательные методы
-    # -------------------------------------------------
-    @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await super().evaluate_result(True, message, meta)
-
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await super().evaluate_result(False, message, meta)
-
-    @classmethod
-    async def evaluate_result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(is_allowed=allowed, message=message, rule_name=cls.rule_name, metadata=meta or {})
+            return RuleResult.cached(cls.rule_name, False, "Минимальная сумма перевода — 1000 UZT")
+        return RuleResult.cached(
+            cls.rule_name,
+            True,
+            "Перевод разрешён",
+            {"sender_id": sender_id, "receiver_id": receiver_id},
+        )
@@ -20,25 +20,87 @@ Uzinex Boost — Domain Rules Base
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
-from datetime import datetime
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, Final, Hashable, Mapping, Optional, Tuple, Union
+from datetime import datetime, timezone
+from decimal import Decimal
 from loguru import logger
 
 
+_UTC = timezone.utc
+
+
+def _utcnow() -> datetime:
+    return datetime.now(_UTC)
+
+
+# -------------------------------------------------
+# 🔹 Время в секундах от эпохи (для сравнения сроков)
+# -------------------------------------------------
+def to_epoch(value: Union[datetime, int]) -> int:
+    """
+    Переводит момент времени в целые секунды от эпохи (UTC).
+    Naive datetime считается UTC (так хранятся даты в БД); int возвращается как есть,
+    поэтому вызывающий код может посчитать метку один раз на границе API.
+    """
+    if isinstance(value, int):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_UTC)
+    return int(value.timestamp())
+
+
+def epoch_now() -> int:
+    """Текущее время UTC в секундах от эпохи."""
+    return int(time.time())
+
+
+# -------------------------------------------------
+# 🔹 Денежные суммы в целых дробных единицах
+# -------------------------------------------------
+MINOR_UNITS = 100  # дробных единиц (тийинов) в 1 UZT
+
+
+def to_minor(amount: Union[float, Decimal, int]) -> int:
+    """
+    Переводит сумму в UZT в целые тийины (округление до ближайшего).
+    Арифметика и сравнения балансов выполняются над int — без накопления ошибки float.
+    """
+    return round(amount * MINOR_UNITS)
+
+
+def from_minor(amount_minor: int) -> float:
+    """Переводит тийины обратно в UZT для хранения и ответа API."""
+    return amount_minor / MINOR_UNITS
+
+
+# Общий неизменяемый пустой metadata для закэшированных результатов
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+# (rule_name, is_allowed, message) → RuleResult без metadata.
+# Размер ограничен: сообщения с подставленным вводом пользователя не должны раздувать кэш.
+_RESULT_CACHE: Dict[Tuple[str, bool, str], "RuleResult"] = {}
+_RESULT_CACHE_MAX = 1024
+
+
 # -------------------------------------------------
 # 🔹 Результат проверки правила
 # -------------------------------------------------
-class RuleResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RuleResult:
     """
     Унифицированный результат проверки бизнес-правила.
+    Поля заполняет доверенный внутренний код, поэтому валидация не нужна.
     """
 
-    is_allowed: bool = Field(..., description="Разрешено ли выполнение действия")
-    message: str = Field("", description="Описание результата (например, причина отказа)")
-    rule_name: str = Field("", description="Название правила")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Дополнительные данные")
-    checked_at: datetime = Field(default_factory=datetime.utcnow)
+    is_allowed: bool                      # Разрешено ли выполнение действия
+    message: str = ""                     # Описание результата (например, причина отказа)
+    rule_name: str = ""                   # Название правила
+    metadata: Mapping[str, Any] = field(default_factory=dict)  # Дополнительные данные
+    checked_at: datetime = field(default_factory=_utcnow)
 
     def __bool__(self) -> bool:
         return self.is_allowed
@@ -47,6 +109,63 @@ class RuleResult(BaseModel):
         status = "✅ ALLOWED" if self.is_allowed else "❌ DENIED"
         return f"[{status}] {self.rule_name}: {self.message or 'OK'}"
 
+    @classmethod
+    def cached(
+        cls,
+        rule_name: str,
+        is_allowed: bool,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "RuleResult":
+        """
+        Возвращает результат проверки; без metadata — переиспользуемый экземпляр
+        (результаты неизменяемы, поэтому один объект на сообщение безопасен).
+        Для переиспользуемых результатов `checked_at` — время первого создания.
+        """
+        if metadata:
+            return cls(is_allowed, message, rule_name, metadata)
+        key = (rule_name, is_allowed, message)
+        result = _RESULT_CACHE.get(key)
+        if result is None:
+            result = cls(is_allowed, message, rule_name, _EMPTY_META)
+            if len(_RESULT_CACHE) < _RESULT_CACHE_MAX:
+                _RESULT_CACHE[key] = result
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_allowed": self.is_allowed,
+            "message": self.message,
+            "rule_name": self.rule_name,
+            "metadata": dict(self.metadata),
+            "checked_at": self.checked_at,
+        }
+
+
+# -------------------------------------------------
+# 🔹 Кэш результатов в рамках запроса
+# -------------------------------------------------
+# Словарь заводится middleware на время HTTP-запроса (см. main); вне запроса — None,
+# и правила считаются без мемоизации. Значения не переживают запрос.
+_REQUEST_MEMO: ContextVar[Optional[Dict[Hashable, "RuleResult"]]] = ContextVar(
+    "rule_request_memo", default=None
+)
+
+
+def begin_request_memo() -> Token:
+    """Открывает кэш правил для текущего запроса; токен передаётся в end_request_memo."""
+    return _REQUEST_MEMO.set({})
+
+
+def end_request_memo(token: Token) -> None:
+    """Закрывает кэш правил текущего запроса."""
+    _REQUEST_MEMO.reset(token)
+
+
+def request_memo() -> Optional[Dict[Hashable, "RuleResult"]]:
+    """Кэш результатов правил текущего запроса или None вне запроса."""
+    return _REQUEST_MEMO.get()
+
 
 # -------------------------------------------------
 # 🔹 Базовый класс правила
@@ -57,7 +176,21 @@ class BaseRule(ABC):
     Каждое правило должно реализовать метод `evaluate`.
     """
 
-    rule_name: str = "UnnamedRule"
+    __slots__ = ()
+    rule_name: ClassVar[str] = "UnnamedRule"
+
+    # -------------------------------------------------
+    # 🔹 Конструкторы результата
+    # -------------------------------------------------
+    # Правила домена на горячем пути возвращают `RuleResult.cached(...)` напрямую;
+    # эти помощники — для кода, где читаемость важнее лишнего вызова.
+    @classmethod
+    def allow(cls, message: str, meta: Optional[Dict[str, Any]] = None) -> RuleResult:
+        return RuleResult.cached(cls.rule_name, True, message, meta)
+
+    @classmethod
+    def deny(cls, message: str, meta: Optional[Dict[str, Any]] = None) -> RuleResult:
+        return RuleResult.cached(cls.rule_name, False, message, meta)
 
     @classmethod
     async def evaluate(cls, *args, **kwargs) -> RuleResult:
@@ -72,7 +205,8 @@ class BaseRule(ABC):
                 rule_name=cls.rule_name,
                 metadata=meta or {},
             )
-            logger.debug(f"[Rule] {result}")
+            # Ленивая подстановка: RuleResult.__str__ вызывается, только если DEBUG включён
+            logger.debug("[Rule] {}", result)
             return result
         except Exception as e:
             logger.exception(f"[RuleError] {cls.rule_name}: {e}")
@@ -102,7 +236,8 @@ class ExampleRule(BaseRule):
     Проверяет, можно ли выполнить условное действие.
     """
 
-    rule_name = "ExampleRule"
+    __slots__ = ()
+    rule_name: Final[str] = "ExampleRule"
 
     @classmethod
     async def _evaluate(cls, value: int) -> tuple[bool, str, Dict[str, Any]]:
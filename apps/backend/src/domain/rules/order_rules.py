@@ -23,9 +23,9 @@ Uzinex Boost — Order Rules
 
 from __future__ import annotations
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Final, Optional, Tuple, Union
 
-from domain.rules.base import BaseRule
+from domain.rules.base import MINOR_UNITS, BaseRule, RuleResult, epoch_now, to_epoch
 
 
 # -------------------------------------------------
@@ -34,9 +34,26 @@ from domain.rules.base import BaseRule
 MIN_ORDER_PRICE = 10_000.0
 MAX_ORDER_PRICE = 50_000_000.0
 PLATFORM_FEE_PERCENT = 10.0  # комиссия платформы в %
+PLATFORM_FEE_BPS = round(PLATFORM_FEE_PERCENT * 100)  # та же комиссия в базисных пунктах
 MAX_ACTIVE_ORDERS_PER_CLIENT = 10
 MAX_ACTIVE_ORDERS_PER_PERFORMER = 5
 DEFAULT_ORDER_DURATION = timedelta(days=7)  # стандартный срок выполнения
+MAX_ORDER_DURATION_S = 30 * 86_400           # максимальный срок выполнения (сек)
+COMPLETION_GRACE_S = 3 * 86_400              # допуск на завершение после дедлайна (сек)
+
+# Множества статусов и ролей: хэш-поиск вместо сборки списка на каждый вызов
+_COMPLETABLE_STATUSES = frozenset({"active", "paused"})  # значения OrderStatus
+_CANCELLABLE_TERMINAL = frozenset({"completed", "cancelled"})
+_CANCEL_ROLES = frozenset({"client", "admin"})
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_MIN_ORDER_PRICE = f"Минимальная стоимость заказа — {MIN_ORDER_PRICE:.0f} UZT"
+_MSG_MAX_ORDER_PRICE = f"Сумма заказа превышает лимит {MAX_ORDER_PRICE:.0f} UZT"
+_MSG_CLIENT_NOT_VERIFIED = "Создание заказов доступно только верифицированным пользователям"
+_MSG_CLIENT_ORDER_LIMIT = "Превышен лимит активных заказов"
 
 
 # -------------------------------------------------
@@ -47,119 +64,161 @@ class OrderRules(BaseRule):
     Набор бизнес-правил, определяющих корректность и ограничения заказов.
     """
 
-    rule_name = "OrderRules"
+    __slots__ = ()
+    rule_name: Final[str] = "OrderRules"
 
     # -------------------------------------------------
     # 🔸 Проверка возможности создания заказа
     # -------------------------------------------------
     @classmethod
-    async def can_create_order(cls, client, price: float, active_orders_count: int):
+    def can_create_order(cls, client, price: float, active_orders_count: int):
         """
         Проверяет, может ли пользователь создать заказ с указанной ценой.
+        Полный `RuleResult` — для аудита и логирования.
         """
-        if not client.is_verified:
-            return await cls._deny("Создание заказов доступно только верифицированным пользователям")
+        denied = cls.can_create_order_check(client, price, active_orders_count)
+        if denied is not None:
+            return RuleResult.cached(cls.rule_name, False, denied)
+        return RuleResult.cached(cls.rule_name, True, "Создание заказа разрешено", {"price": price})
 
+    @staticmethod
+    def can_create_order_check(client, price: float, active_orders_count: int) -> Optional[str]:
+        """
+        Быстрый вариант `can_create_order` для вызывающих, которым нужен только итог:
+        возвращает None, если создание разрешено, иначе сообщение об отказе.
+        Не создаёт `RuleResult` и metadata.
+        """
+        if not client.is_verified:
+            return _MSG_CLIENT_NOT_VERIFIED
         if price < MIN_ORDER_PRICE:
-            return await cls._deny(f"Минимальная стоимость заказа — {MIN_ORDER_PRICE:.0f} UZT")
-
+            return _MSG_MIN_ORDER_PRICE
         if price > MAX_ORDER_PRICE:
-            return await cls._deny(f"Сумма заказа превышает лимит {MAX_ORDER_PRICE:.0f} UZT")
-
+            return _MSG_MAX_ORDER_PRICE
         if active_orders_count >= MAX_ACTIVE_ORDERS_PER_CLIENT:
-            return await cls._deny("Превышен лимит активных заказов")
-
-        return await cls._allow("Создание заказа разрешено", {"price": price})
+            return _MSG_CLIENT_ORDER_LIMIT
+        return None
 
     # -------------------------------------------------
     # 🔸 Проверка возможности принять заказ
     # -------------------------------------------------
     @classmethod
-    async def can_accept_order(cls, performer, active_orders_count: int):
+    def can_accept_order(cls, performer, active_orders_count: int):
         """
         Проверяет, может ли исполнитель взять заказ в работу.
         """
         if not performer.is_verified:
-            return await cls._deny("Для выполнения заказов требуется пройти верификацию")
+            return RuleResult.cached(
+                cls.rule_name, False, "Для выполнения заказов требуется пройти верификацию"
+            )
         if active_orders_count >= MAX_ACTIVE_ORDERS_PER_PERFORMER:
-            return await cls._deny("Превышен лимит активных заказов для исполнителя")
+            return RuleResult.cached(
+                cls.rule_name, False, "Превышен лимит активных заказов для исполнителя"
+            )
         if performer.rating < 2.5:
-            return await cls._deny("Рейтинг ниже минимального уровня для участия в заказах")
-        return await cls._allow("Исполнитель может принять заказ", {"rating": performer.rating})
+            return RuleResult.cached(
+                cls.rule_name, False, "Рейтинг ниже минимального уровня для участия в заказах"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Исполнитель может принять заказ", {"rating": performer.rating}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка допустимости срока выполнения
     # -------------------------------------------------
     @classmethod
-    async def validate_deadline(cls, deadline: datetime):
+    def validate_deadline(
+        cls,
+        deadline: Union[datetime, int],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, не превышает ли срок выполнения допустимое значение.
+        `now` передаётся агрегатором, чтобы не читать часы в каждом правиле.
+        Сравнение идёт по целым секундам от эпохи.
         """
-        now = datetime.utcnow()
-        max_deadline = now + timedelta(days=30)
-        if deadline > max_deadline:
-            return await cls._deny("Максимальный срок выполнения заказа — 30 дней")
-        if deadline < now:
-            return await cls._deny("Дата завершения не может быть в прошлом")
-        return await cls._allow("Срок выполнения корректен", {"deadline": deadline.isoformat()})
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        deadline_ts = to_epoch(deadline)
+        if deadline_ts > now_ts + MAX_ORDER_DURATION_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Максимальный срок выполнения заказа — 30 дней"
+            )
+        if deadline_ts < now_ts:
+            return RuleResult.cached(
+                cls.rule_name, False, "Дата завершения не может быть в прошлом"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Срок выполнения корректен", {"deadline_ts": deadline_ts}
+        )
 
     # -------------------------------------------------
     # 🔸 Расчёт комиссии платформы
     # -------------------------------------------------
+    @staticmethod
+    def calculate_fee_minor(price_minor: int) -> Tuple[int, int]:
+        """
+        Комиссия и чистая сумма в целых дробных единицах (тийинах).
+        Комиссия округляется вниз — остаток тийина остаётся исполнителю.
+        """
+        fee = price_minor * PLATFORM_FEE_BPS // 10_000
+        return fee, price_minor - fee
+
     @classmethod
-    async def calculate_fee(cls, price: float) -> Dict[str, Any]:
+    def calculate_fee(cls, price: float) -> Dict[str, Any]:
         """
         Рассчитывает комиссию платформы и чистую сумму исполнителя.
+        Расчёт идёт в целых тийинах; в UZT переводится только результат.
         """
-        fee = round(price * PLATFORM_FEE_PERCENT / 100, 2)
-        net = round(price - fee, 2)
-        return {"fee": fee, "net_amount": net, "percent": PLATFORM_FEE_PERCENT}
+        price_minor = round(price * MINOR_UNITS)
+        fee = price_minor * PLATFORM_FEE_BPS // 10_000
+        return {
+            "fee": fee / MINOR_UNITS,
+            "net_amount": (price_minor - fee) / MINOR_UNITS,
+            "percent": PLATFORM_FEE_PERCENT,
+        }
 
     # -------------------------------------------------
     # 🔸 Проверка завершения заказа
     # -------------------------------------------------
     @classmethod
-    async def can_complete_order(cls, order_status: str, deadline: datetime):
+    def can_complete_order(
+        cls,
+        order_status: str,
+        deadline: Optional[Union[datetime, int]],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, можно ли завершить заказ (статус и срок).
+        Без срока (`deadline=None`) проверяется только статус.
         """
-        if order_status not in ["in_progress", "review"]:
-            return await cls._deny(f"Невозможно завершить заказ в статусе '{order_status}'")
-        if datetime.utcnow() > deadline + timedelta(days=3):
-            return await cls._deny("Срок завершения заказа истёк — требуется модерация")
-        return await cls._allow("Завершение заказа разрешено")
+        if order_status not in _COMPLETABLE_STATUSES:
+            return RuleResult.cached(
+                cls.rule_name, False, f"Невозможно завершить заказ в статусе '{order_status}'"
+            )
+        if deadline is None:
+            return RuleResult.cached(cls.rule_name, True, "Завершение заказа разрешено")
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        if now_ts > to_epoch(deadline) + COMPLETION_GRACE_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Срок завершения заказа истёк — требуется модерация"
+            )
+        return RuleResult.cached(cls.rule_name, True, "Завершение заказа разрешено")
 
     # -------------------------------------------------
     # 🔸 Проверка отмены заказа
     # -------------------------------------------------
     @classmethod
-    async def can_cancel_order(cls, order_status: str, user_role: str):
+    def can_cancel_order(cls, order_status: str, user_role: str):
         """
         Проверяет, имеет ли пользователь право отменить заказ.
         """
-        if order_status in ["completed", "cancelled"]:
-            return await cls._deny("Заказ уже завершён или отменён")
-        if user_role not in ["client", "admin"]:
-            return await cls._deny("Отмену может выполнить только заказчик или администратор")
-        return await cls._allow("Отмена заказа разрешена", {"role": user_role})
-
-    # -------------------------------------------------
-    # 🔹 Вспомогательные методы
-    # -------------------------------------------------
-    @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(True, message, meta)
-
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(False, message, meta)
-
-    @classmethod
-    async def _result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(
-            is_allowed=allowed,
-            message=message,
-            rule_name=cls.rule_name,
-            metadata=meta or {},
+        if order_status in _CANCELLABLE_TERMINAL:
+            return RuleResult.cached(cls.rule_name, False, "Заказ уже завершён или отменён")
+        if user_role not in _CANCEL_ROLES:
+            return RuleResult.cached(
+                cls.rule_name, False, "Отмену может выполнить только заказчик или администратор"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Отмена заказа разрешена", {"role": user_role}
         )
@@ -21,22 +21,70 @@ Uzinex Boost — Payment Rules
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Final, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 
-from domain.rules.base import BaseRule
+from domain.rules.base import BaseRule, RuleResult
 from db.repositories.user_repository import UserRepository
 
 
 # -------------------------------------------------
 # 🔹 Константы политики
 # -------------------------------------------------
-SUPPORTED_METHODS = ["click", "payme", "uzcard", "crypto"]
-VERIFIED_ONLY_METHODS = ["crypto"]
+SUPPORTED_METHODS = frozenset({"click", "payme", "uzcard", "crypto"})
+VERIFIED_ONLY_METHODS = frozenset({"crypto"})
 MIN_PAYMENT_AMOUNT = 5_000.0
 MAX_PAYMENT_AMOUNT = 10_000_000.0
 DAILY_PAYMENT_LIMIT = 20_000_000.0
 MAX_PAYMENT_ATTEMPTS_PER_HOUR = 5
+ACTIVITY_WINDOW = timedelta(hours=24)  # окно для суточных лимитов
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_MIN_PAYMENT = f"Минимальная сумма платежа — {MIN_PAYMENT_AMOUNT:.0f} UZT"
+_MSG_MAX_PAYMENT = f"Превышен лимит: максимум {MAX_PAYMENT_AMOUNT:.0f} UZT"
+
+
+# -------------------------------------------------
+# 🔹 Индекс истории платежей
+# -------------------------------------------------
+@dataclass(slots=True, frozen=True)
+class PaymentHistory:
+    """
+    Отсортированные по времени метки и префиксные суммы платежей пользователя.
+    Строится один раз (например, кэшируется на пользователя и сбрасывается
+    при новом платеже); окно «за период» считается за O(log N) через bisect.
+    """
+
+    timestamps: List[datetime]
+    amount_prefix: List[float]  # amount_prefix[i] — сумма первых i платежей
+
+    @classmethod
+    def from_payments(cls, payments: Sequence[Any]) -> "PaymentHistory":
+        ordered = sorted(payments, key=lambda p: p.created_at)
+        return cls(
+            timestamps=[p.created_at for p in ordered],
+            amount_prefix=list(accumulate((p.amount for p in ordered), initial=0.0)),
+        )
+
+    @classmethod
+    def from_columns(cls, timestamps: List[datetime], amounts: Sequence[float]) -> "PaymentHistory":
+        """
+        Строит индекс из уже отсортированных по времени колонок
+        (см. PaymentRepository.get_activity_since) — без сортировки и обхода объектов.
+        """
+        return cls(timestamps=timestamps, amount_prefix=list(accumulate(amounts, initial=0.0)))
+
+    def window(self, since: datetime) -> Tuple[int, float]:
+        """Возвращает (количество, сумму) платежей начиная с `since`."""
+        idx = bisect_left(self.timestamps, since)
+        return len(self.timestamps) - idx, self.amount_prefix[-1] - self.amount_prefix[idx]
 
 
 # -------------------------------------------------
@@ -47,7 +95,38 @@ class PaymentRules(BaseRule):
     Набор правил для проверки допустимости и корректности платежей.
     """
 
-    rule_name = "PaymentRules"
+    __slots__ = ()
+    rule_name: Final[str] = "PaymentRules"
+
+    # -------------------------------------------------
+    # 🔸 Комплексная проверка платежа
+    # -------------------------------------------------
+    @classmethod
+    async def evaluate(
+        cls,
+        user_id: int,
+        amount: float,
+        method: str,
+        user_repo: UserRepository,
+        recent_payments: Union[PaymentHistory, Sequence[Any], None] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> RuleResult:
+        """
+        Проверяет платёж всеми правилами и возвращает первый отказ.
+        Синхронные проверки выполняются до обращения к БД — при отказе
+        запрос пользователя не выполняется.
+        """
+        result = cls.validate_amount(amount)
+        if not result.is_allowed:
+            return result
+
+        if recent_payments is not None:
+            result = cls.check_activity_limits(user_id, recent_payments, now=now)
+            if not result.is_allowed:
+                return result
+
+        return await cls.validate_method(user_id, method, user_repo)
 
     # -------------------------------------------------
     # 🔸 Проверка допустимости метода оплаты
@@ -62,86 +141,88 @@ class PaymentRules(BaseRule):
         """
         Проверяет, может ли пользователь использовать указанный метод оплаты.
         """
-        method = method.lower().strip()
+        method = sys.intern(method.lower().strip())
 
         if method not in SUPPORTED_METHODS:
-            return await cls._deny(f"Метод оплаты '{method}' не поддерживается системой")
+            return RuleResult.cached(
+                cls.rule_name, False, f"Метод оплаты '{method}' не поддерживается системой"
+            )
 
+        # Флаги читаются из БД на каждой проверке: бан или снятие верификации
+        # должны действовать сразу на всех воркерах
         user = await user_repo.get_by_id(user_id)
-        if not user:
-            return await cls._deny("Пользователь не найден")
+        if user is None:
+            return RuleResult.cached(cls.rule_name, False, "Пользователь не найден")
 
-        if method in VERIFIED_ONLY_METHODS and not user.is_verified:
-            return await cls._deny("Для использования этого метода необходимо пройти верификацию")
+        if method in VERIFIED_ONLY_METHODS and not getattr(user, "is_verified", False):
+            return RuleResult.cached(
+                cls.rule_name, False, "Для использования этого метода необходимо пройти верификацию"
+            )
 
-        return await cls._allow("Метод оплаты разрешён", {"method": method})
+        return RuleResult.cached(cls.rule_name, True, "Метод оплаты разрешён", {"method": method})
 
     # -------------------------------------------------
     # 🔸 Проверка суммы платежа
     # -------------------------------------------------
     @classmethod
-    async def validate_amount(cls, amount: float):
+    def validate_amount(cls, amount: float):
         """
         Проверяет, находится ли сумма в допустимом диапазоне.
         """
         if amount < MIN_PAYMENT_AMOUNT:
-            return await cls._deny(f"Минимальная сумма платежа — {MIN_PAYMENT_AMOUNT:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_PAYMENT)
         if amount > MAX_PAYMENT_AMOUNT:
-            return await cls._deny(f"Превышен лимит: максимум {MAX_PAYMENT_AMOUNT:.0f} UZT")
-        return await cls._allow("Сумма платежа корректна", {"amount": amount})
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_PAYMENT)
+        return RuleResult.cached(cls.rule_name, True, "Сумма платежа корректна", {"amount": amount})
 
     # -------------------------------------------------
     # 🔸 Проверка лимитов по активности
     # -------------------------------------------------
     @classmethod
-    async def check_activity_limits(cls, user_id: int, recent_payments: list):
+    def check_activity_limits(
+        cls,
+        user_id: int,
+        recent_payments: Union[PaymentHistory, Sequence[Any]],
+        *,
+        now: Optional[datetime] = None,
+    ):
         """
         Проверяет, не превышены ли лимиты по количеству и сумме платежей за сутки.
+        Принимает готовый `PaymentHistory` (быстрый путь) или список платежей.
         """
-        now = datetime.utcnow()
-        since = now - timedelta(hours=24)
+        now = now or datetime.utcnow()
+        since = now - ACTIVITY_WINDOW
+
+        if not isinstance(recent_payments, PaymentHistory):
+            recent_payments = PaymentHistory.from_payments(recent_payments)
+        recent_count, total_sum = recent_payments.window(since)
 
-        recent = [p for p in recent_payments if p.created_at >= since]
-        total_sum = sum(p.amount for p in recent)
         if total_sum > DAILY_PAYMENT_LIMIT:
-            return await cls._deny("Превышен дневной лимит платежей")
+            return RuleResult.cached(cls.rule_name, False, "Превышен дневной лимит платежей")
 
-        if len(recent) > MAX_PAYMENT_ATTEMPTS_PER_HOUR:
-            return await cls._deny("Слишком много попыток оплат за короткое время")
+        if recent_count > MAX_PAYMENT_ATTEMPTS_PER_HOUR:
+            return RuleResult.cached(
+                cls.rule_name, False, "Слишком много попыток оплат за короткое время"
+            )
 
-        return await cls._allow("Платёжная активность в норме", {"payments_today": len(recent)})
+        return RuleResult.cached(
+            cls.rule_name, True, "Платёжная активность в норме", {"payments_today": recent_count}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка статуса пользователя
     # -------------------------------------------------
     @classmethod
-    async def validate_user_status(cls, user):
+    def validate_user_status(cls, user):
         """
         Проверяет, активен ли пользователь и имеет ли право проводить платежи.
         """
         if not user.is_active:
-            return await cls._deny("Аккаунт неактивен — операции недоступны")
+            return RuleResult.cached(
+                cls.rule_name, False, "Аккаунт неактивен — операции недоступны"
+            )
         if user.is_blocked:
-            return await cls._deny("Платёж невозможен: пользователь заблокирован")
-        return await cls._allow("Пользователь активен и допущен к оплате")
-
-    # -------------------------------------------------
-    # 🔹 Вспомогательные методы
-    # -------------------------------------------------
-    @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(True, message, meta)
-
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(False, message, meta)
-
-    @classmethod
-    async def _result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(
-            is_allowed=allowed,
-            message=message,
-            rule_name=cls.rule_name,
-            metadata=meta or {},
-        )
+            return RuleResult.cached(
+                cls.rule_name, False, "Платёж невозможен: пользователь заблокирован"
+            )
+        return RuleResult.cached(cls.rule_name, True, "Пользователь активен и допущен к оплате")
@@ -22,9 +22,9 @@ Uzinex Boost — Referral Rules
 
 from __future__ import annotations
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Final, Optional, Union
 
-from domain.rules.base import BaseRule
+from domain.rules.base import BaseRule, RuleResult, epoch_now, to_epoch
 
 
 # -------------------------------------------------
@@ -42,6 +42,25 @@ LEVEL_UP_REQUIREMENTS = {                   # количество активн
 }
 MAX_REFERRAL_BONUS_PER_DAY = 50_000.0       # лимит бонусов за день
 BONUS_COOLDOWN = timedelta(hours=12)        # минимальный интервал между бонусами
+SIGNUP_BONUS_DELAY_S = 3_600                # задержка бонуса за регистрацию (сек)
+MIN_REFERRAL_ACTIVITY_S = MIN_REFERRAL_ACTIVITY_DAYS * 86_400
+BONUS_COOLDOWN_S = int(BONUS_COOLDOWN.total_seconds())
+
+# Требования уровней в виде кортежа, индексируемого номером уровня (индекс 0 не используется)
+_MAX_LEVEL = max(LEVEL_UP_REQUIREMENTS)
+_LEVEL_REQ = tuple(LEVEL_UP_REQUIREMENTS.get(i) for i in range(_MAX_LEVEL + 1))
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_MAX_REFERRALS = f"Превышен лимит приглашённых ({MAX_REFERRALS_PER_USER})"
+_MSG_MIN_ACTIVITY = f"Реферал должен быть активен не менее {MIN_REFERRAL_ACTIVITY_DAYS} дней"
+_MSG_MAX_LEVEL = "Достигнут максимальный уровень реферальной программы"
+_MSG_LEVEL_REQ = tuple(
+    f"Для перехода на уровень {level} требуется {required} активных рефералов" if required else None
+    for level, required in enumerate(_LEVEL_REQ)
+)
 
 
 # -------------------------------------------------
@@ -52,105 +71,112 @@ class ReferralRules(BaseRule):
     Набор бизнес-правил, связанных с начислением и управлением реферальными бонусами.
     """
 
-    rule_name = "ReferralRules"
+    __slots__ = ()
+    rule_name: Final[str] = "ReferralRules"
 
     # -------------------------------------------------
     # 🔸 Проверка лимита по приглашениям
     # -------------------------------------------------
     @classmethod
-    async def can_invite(cls, inviter_id: int, total_referrals: int):
+    def can_invite(cls, inviter_id: int, total_referrals: int):
         """
         Проверяет, может ли пользователь пригласить ещё одного участника.
         """
         if total_referrals >= MAX_REFERRALS_PER_USER:
-            return await cls._deny(f"Превышен лимит приглашённых ({MAX_REFERRALS_PER_USER})")
-        return await cls._allow("Можно пригласить нового участника", {"referrals": total_referrals})
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_REFERRALS)
+        return RuleResult.cached(
+            cls.rule_name, True, "Можно пригласить нового участника", {"referrals": total_referrals}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка права на бонус за регистрацию
     # -------------------------------------------------
     @classmethod
-    async def can_receive_signup_bonus(cls, referral_joined_at: datetime):
+    def can_receive_signup_bonus(
+        cls,
+        referral_joined_at: Union[datetime, int],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, может ли пользователь получить бонус за регистрацию реферала.
         """
-        now = datetime.utcnow()
-        if now - referral_joined_at < timedelta(hours=1):
-            return await cls._deny("Бонус за регистрацию начисляется не сразу, подождите немного")
-        return await cls._allow("Бонус за регистрацию разрешён")
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        if now_ts - to_epoch(referral_joined_at) < SIGNUP_BONUS_DELAY_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Бонус за регистрацию начисляется не сразу, подождите немного"
+            )
+        return RuleResult.cached(cls.rule_name, True, "Бонус за регистрацию разрешён")
 
     # -------------------------------------------------
     # 🔸 Проверка права на бонус за активность реферала
     # -------------------------------------------------
     @classmethod
-    async def can_receive_task_bonus(cls, referral_first_task_date: datetime):
+    def can_receive_task_bonus(
+        cls,
+        referral_first_task_date: Union[datetime, int],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, можно ли начислить бонус за активность реферала.
         """
-        if datetime.utcnow() - referral_first_task_date < timedelta(days=MIN_REFERRAL_ACTIVITY_DAYS):
-            return await cls._deny(f"Реферал должен быть активен не менее {MIN_REFERRAL_ACTIVITY_DAYS} дней")
-        return await cls._allow("Бонус за активность разрешён")
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        if now_ts - to_epoch(referral_first_task_date) < MIN_REFERRAL_ACTIVITY_S:
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_ACTIVITY)
+        return RuleResult.cached(cls.rule_name, True, "Бонус за активность разрешён")
 
     # -------------------------------------------------
     # 🔸 Проверка лимита бонусов за день
     # -------------------------------------------------
     @classmethod
-    async def check_daily_bonus_limit(cls, today_bonus_sum: float):
+    def check_daily_bonus_limit(cls, today_bonus_sum: float):
         """
         Проверяет, не превышен ли дневной лимит бонусов.
         """
         if today_bonus_sum >= MAX_REFERRAL_BONUS_PER_DAY:
-            return await cls._deny("Достигнут лимит начислений бонусов за день")
-        return await cls._allow("Начисление бонуса разрешено", {"today_bonus_sum": today_bonus_sum})
+            return RuleResult.cached(
+                cls.rule_name, False, "Достигнут лимит начислений бонусов за день"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Начисление бонуса разрешено", {"today_bonus_sum": today_bonus_sum}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка интервала между бонусами
     # -------------------------------------------------
     @classmethod
-    async def check_bonus_cooldown(cls, last_bonus_time: datetime | None):
+    def check_bonus_cooldown(
+        cls,
+        last_bonus_time: Union[datetime, int, None],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, прошло ли достаточно времени между начислениями.
         """
-        if last_bonus_time and datetime.utcnow() - last_bonus_time < BONUS_COOLDOWN:
-            return await cls._deny("Следующий бонус можно получить через несколько часов")
-        return await cls._allow("Можно начислить новый бонус")
+        if last_bonus_time is not None:
+            now_ts = to_epoch(now) if now is not None else epoch_now()
+            if now_ts - to_epoch(last_bonus_time) < BONUS_COOLDOWN_S:
+                return RuleResult.cached(
+                    cls.rule_name, False, "Следующий бонус можно получить через несколько часов"
+                )
+        return RuleResult.cached(cls.rule_name, True, "Можно начислить новый бонус")
 
     # -------------------------------------------------
     # 🔸 Проверка достижения нового уровня
     # -------------------------------------------------
     @classmethod
-    async def can_level_up(cls, active_referrals: int, current_level: int):
+    def can_level_up(cls, active_referrals: int, current_level: int):
         """
         Проверяет, достиг ли пользователь нового уровня реферальной программы.
         """
         next_level = current_level + 1
-        required = LEVEL_UP_REQUIREMENTS.get(next_level)
-        if not required:
-            return await cls._deny("Достигнут максимальный уровень реферальной программы")
+        if not 0 < next_level <= _MAX_LEVEL or not _LEVEL_REQ[next_level]:
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_LEVEL)
 
-        if active_referrals < required:
-            return await cls._deny(
-                f"Для перехода на уровень {next_level} требуется {required} активных рефералов"
-            )
-        return await cls._allow("Переход на новый уровень разрешён", {"new_level": next_level})
-
-    # -------------------------------------------------
-    # 🔹 Вспомогательные методы
-    # -------------------------------------------------
-    @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(True, message, meta)
-
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(False, message, meta)
-
-    @classmethod
-    async def _result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(
-            is_allowed=allowed,
-            message=message,
-            rule_name=cls.rule_name,
-            metadata=meta or {},
+        if active_referrals < _LEVEL_REQ[next_level]:
+            return RuleResult.cached(cls.rule_name, False, _MSG_LEVEL_REQ[next_level])
+        return RuleResult.cached(
+            cls.rule_name, True, "Переход на новый уровень разрешён", {"new_level": next_level}
         )
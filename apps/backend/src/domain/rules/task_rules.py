@@ -22,9 +22,9 @@ Uzinex Boost — Task Rules
 
 from __future__ import annotations
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Final, Optional, Union
 
-from domain.rules.base import BaseRule
+from domain.rules.base import BaseRule, RuleResult, epoch_now, to_epoch
 
 
 # -------------------------------------------------
@@ -36,6 +36,22 @@ MAX_ACTIVE_TASKS_PER_USER = 5
 DEFAULT_TASK_DURATION = timedelta(days=3)
 MAX_TASK_DURATION = timedelta(days=14)
 REVIEW_PERIOD = timedelta(days=2)  # срок проверки задания модератором
+MAX_TASK_DURATION_S = int(MAX_TASK_DURATION.total_seconds())
+REVIEW_PERIOD_S = int(REVIEW_PERIOD.total_seconds())
+
+# Множества статусов и ролей: хэш-поиск вместо сборки списка на каждый вызов
+_COMPLETABLE_STATUSES = frozenset({"in_progress", "review"})
+_APPROVE_ROLES = frozenset({"admin", "moderator"})
+_REVIEW_STATUS = "review"
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_MIN_TASK_REWARD_CREATE = f"Минимальное вознаграждение за задание — {MIN_TASK_REWARD:.0f} UZT"
+_MSG_MAX_TASK_REWARD_CREATE = f"Вознаграждение превышает лимит {MAX_TASK_REWARD:.0f} UZT"
+_MSG_MIN_TASK_REWARD = f"Минимальное вознаграждение — {MIN_TASK_REWARD:.0f} UZT"
+_MSG_MAX_TASK_REWARD = f"Превышено максимальное вознаграждение — {MAX_TASK_REWARD:.0f} UZT"
 
 
 # -------------------------------------------------
@@ -46,122 +62,162 @@ class TaskRules(BaseRule):
     Набор правил для проверки допустимости действий с заданиями.
     """
 
-    rule_name = "TaskRules"
+    __slots__ = ()
+    rule_name: Final[str] = "TaskRules"
 
     # -------------------------------------------------
     # 🔸 Проверка возможности создания задания
     # -------------------------------------------------
     @classmethod
-    async def can_create_task(cls, creator, reward: float, active_tasks_count: int):
+    def can_create_task(cls, creator, reward: float, active_tasks_count: int):
         """
         Проверяет, может ли пользователь опубликовать задание.
         """
         if not creator.is_verified:
-            return await cls._deny("Публиковать задания могут только верифицированные пользователи")
+            return RuleResult.cached(
+                cls.rule_name,
+                False,
+                "Публиковать задания могут только верифицированные пользователи",
+            )
 
         if reward < MIN_TASK_REWARD:
-            return await cls._deny(f"Минимальное вознаграждение за задание — {MIN_TASK_REWARD:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_TASK_REWARD_CREATE)
 
         if reward > MAX_TASK_REWARD:
-            return await cls._deny(f"Вознаграждение превышает лимит {MAX_TASK_REWARD:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_TASK_REWARD_CREATE)
 
         if active_tasks_count >= MAX_ACTIVE_TASKS_PER_USER:
-            return await cls._deny("Превышен лимит активных заданий")
+            return RuleResult.cached(cls.rule_name, False, "Превышен лимит активных заданий")
 
-        return await cls._allow("Создание задания разрешено", {"reward": reward})
+        return RuleResult.cached(
+            cls.rule_name, True, "Создание задания разрешено", {"reward": reward}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка возможности взять задание
     # -------------------------------------------------
     @classmethod
-    async def can_accept_task(cls, user, active_tasks_count: int):
+    def can_accept_task(cls, user, active_tasks_count: int):
         """
         Проверяет, может ли пользователь взять задание в работу.
         """
         if not user.is_verified:
-            return await cls._deny("Для выполнения заданий требуется верификация")
+            return RuleResult.cached(
+                cls.rule_name, False, "Для выполнения заданий требуется верификация"
+            )
         if active_tasks_count >= MAX_ACTIVE_TASKS_PER_USER:
-            return await cls._deny("Превышен лимит активных заданий в работе")
-        if getattr(user, "rating", 0) < 2.0:
-            return await cls._deny("Рейтинг слишком низкий для выполнения заданий")
-        return await cls._allow("Пользователь может взять задание", {"rating": user.rating})
+            return RuleResult.cached(
+                cls.rule_name, False, "Превышен лимит активных заданий в работе"
+            )
+        if user.rating < 2.0:
+            return RuleResult.cached(
+                cls.rule_name, False, "Рейтинг слишком низкий для выполнения заданий"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Пользователь может взять задание", {"rating": user.rating}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка срока выполнения задания
     # -------------------------------------------------
     @classmethod
-    async def validate_deadline(cls, deadline: datetime):
+    def validate_deadline(
+        cls,
+        deadline: Union[datetime, int],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, корректен ли срок выполнения задания.
         """
-        now = datetime.utcnow()
-        if deadline < now:
-            return await cls._deny("Срок выполнения не может быть в прошлом")
-        if deadline - now > MAX_TASK_DURATION:
-            return await cls._deny("Максимальный срок выполнения задания — 14 дней")
-        return await cls._allow("Срок выполнения корректен", {"deadline": deadline.isoformat()})
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        deadline_ts = to_epoch(deadline)
+        if deadline_ts < now_ts:
+            return RuleResult.cached(
+                cls.rule_name, False, "Срок выполнения не может быть в прошлом"
+            )
+        if deadline_ts - now_ts > MAX_TASK_DURATION_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Максимальный срок выполнения задания — 14 дней"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Срок выполнения корректен", {"deadline_ts": deadline_ts}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка возможности завершить задание
     # -------------------------------------------------
     @classmethod
-    async def can_complete_task(cls, task_status: str, deadline: datetime):
+    def can_complete_task(
+        cls,
+        task_status: str,
+        deadline: Union[datetime, int],
+        *,
+        now: Optional[Union[datetime, int]] = None,
+    ):
         """
         Проверяет, можно ли завершить задание.
         """
-        if task_status not in ["in_progress", "review"]:
-            return await cls._deny(f"Задание нельзя завершить в статусе '{task_status}'")
+        if task_status not in _COMPLETABLE_STATUSES:
+            return RuleResult.cached(
+                cls.rule_name, False, f"Задание нельзя завершить в статусе '{task_status}'"
+            )
 
-        if datetime.utcnow() > deadline + REVIEW_PERIOD:
-            return await cls._deny("Срок проверки задания истёк — требуется модерация")
+        now_ts = to_epoch(now) if now is not None else epoch_now()
+        if now_ts > to_epoch(deadline) + REVIEW_PERIOD_S:
+            return RuleResult.cached(
+                cls.rule_name, False, "Срок проверки задания истёк — требуется модерация"
+            )
 
-        return await cls._allow("Завершение задания разрешено")
+        return RuleResult.cached(cls.rule_name, True, "Завершение задания разрешено")
 
     # -------------------------------------------------
     # 🔸 Проверка вознаграждения за задание
     # -------------------------------------------------
     @classmethod
-    async def validate_reward(cls, reward: float):
+    def validate_reward(cls, reward: float):
         """
         Проверяет корректность суммы вознаграждения.
         """
         if reward < MIN_TASK_REWARD:
-            return await cls._deny(f"Минимальное вознаграждение — {MIN_TASK_REWARD:.0f} UZT")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_TASK_REWARD)
         if reward > MAX_TASK_REWARD:
-            return await cls._deny(f"Превышено максимальное вознаграждение — {MAX_TASK_REWARD:.0f} UZT")
-        return await cls._allow("Вознаграждение корректно", {"reward": reward})
+            return RuleResult.cached(cls.rule_name, False, _MSG_MAX_TASK_REWARD)
+        return RuleResult.cached(
+            cls.rule_name, True, "Вознаграждение корректно", {"reward": reward}
+        )
 
     # -------------------------------------------------
-    # 🔸 Проверка возможности одобрить задание
+    # 🔸 Проверка роли проверяющего (пакетное одобрение)
     # -------------------------------------------------
     @classmethod
-    async def can_approve_task(cls, reviewer_role: str, task_status: str):
+    def can_review_tasks(cls, reviewer_role: str):
         """
-        Проверяет, может ли модератор одобрить задание.
+        Проверяет роль проверяющего при одобрении (одного задания или пакета);
+        статус и вознаграждение заданий проверяются условием самого UPDATE.
         """
-        if reviewer_role not in ["admin", "moderator"]:
-            return await cls._deny("Только модератор или администратор может одобрить задание")
-        if task_status != "review":
-            return await cls._deny("Задание должно находиться на проверке")
-        return await cls._allow("Одобрение задания разрешено", {"role": reviewer_role})
+        if reviewer_role not in _APPROVE_ROLES:
+            return RuleResult.cached(
+                cls.rule_name, False, "Только модератор или администратор может одобрить задание"
+            )
+        return RuleResult.cached(
+            cls.rule_name, True, "Одобрение задания разрешено", {"role": reviewer_role}
+        )
 
     # -------------------------------------------------
-    # 🔹 Вспомогательные методы
+    # 🔸 Проверка возможности одобрить задание
     # -------------------------------------------------
     @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(True, message, meta)
-
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(False, message, meta)
-
-    @classmethod
-    async def _result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(
-            is_allowed=allowed,
-            message=message,
-            rule_name=cls.rule_name,
-            metadata=meta or {},
+    def can_approve_task(cls, reviewer_role: str, task_status: str):
+        """
+        Проверяет, может ли модератор одобрить задание.
+        """
+        if reviewer_role not in _APPROVE_ROLES:
+            return RuleResult.cached(
+                cls.rule_name, False, "Только модератор или администратор может одобрить задание"
+            )
+        if task_status != _REVIEW_STATUS:
+            return RuleResult.cached(cls.rule_name, False, "Задание должно находиться на проверке")
+        return RuleResult.cached(
+            cls.rule_name, True, "Одобрение задания разрешено", {"role": reviewer_role}
         )
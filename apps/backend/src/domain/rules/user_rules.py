@@ -20,10 +20,9 @@ Uzinex Boost — User Rules
 """
 
 from __future__ import annotations
-from typing import Dict, Any
-from datetime import datetime, timedelta
+from typing import Final
 
-from domain.rules.base import BaseRule
+from domain.rules.base import BaseRule, RuleResult, epoch_now, request_memo
 from db.models.user_model import User
 
 
@@ -34,6 +33,14 @@ MIN_RATING_TO_PUBLISH_ORDER = 3.5
 MIN_RATING_TO_TAKE_TASK = 2.0
 UNVERIFIED_ORDER_LIMIT = 2
 MAX_INACTIVE_DAYS = 180  # после этого пользователь считается "спящим"
+MAX_INACTIVE_S = MAX_INACTIVE_DAYS * 86_400
+
+
+# -------------------------------------------------
+# 🔹 Сообщения об отказе (форматируются один раз при импорте)
+# -------------------------------------------------
+_MSG_MIN_RATING_ORDER = f"Минимальный рейтинг для публикации заказов — {MIN_RATING_TO_PUBLISH_ORDER}"
+_MSG_MIN_RATING_TASK = f"Минимальный рейтинг для выполнения заданий — {MIN_RATING_TO_TAKE_TASK}"
 
 
 # -------------------------------------------------
@@ -42,99 +49,127 @@ MAX_INACTIVE_DAYS = 180  # после этого пользователь счи
 class UserRules(BaseRule):
     """
     Правила допустимости действий пользователя на платформе.
+    Проверки синхронные: в них нет ввода-вывода, только ветвления по полям User.
     """
 
-    rule_name = "UserRules"
+    __slots__ = ()
+    rule_name: Final[str] = "UserRules"
 
     # -------------------------------------------------
     # 🔸 Проверка активности пользователя
     # -------------------------------------------------
     @classmethod
-    async def is_active(cls, user: User):
+    def is_active(cls, user: User):
         """
         Проверяет, активен ли пользователь (не заблокирован и не спящий).
         """
         if not user.is_active:
-            return await cls._deny("Аккаунт неактивен — действия невозможны")
+            return RuleResult.cached(
+                cls.rule_name, False, "Аккаунт неактивен — действия невозможны"
+            )
         if user.is_blocked:
-            return await cls._deny("Пользователь заблокирован администрацией")
-        if user.last_login and (datetime.utcnow() - user.last_login) > timedelta(days=MAX_INACTIVE_DAYS):
-            return await cls._deny("Аккаунт долго не использовался — требуется повторная активация")
-        return await cls._allow("Пользователь активен", {"user_id": user.id})
+            return RuleResult.cached(
+                cls.rule_name, False, "Пользователь заблокирован администрацией"
+            )
+        if user.last_active_ts and epoch_now() - user.last_active_ts > MAX_INACTIVE_S:
+            return RuleResult.cached(
+                cls.rule_name,
+                False,
+                "Аккаунт долго не использовался — требуется повторная активация",
+            )
+        return RuleResult.cached(cls.rule_name, True, "Пользователь активен", {"user_id": user.id})
 
     # -------------------------------------------------
     # 🔸 Проверка верификации пользователя
     # -------------------------------------------------
     @classmethod
-    async def is_verified(cls, user: User):
+    def is_verified(cls, user: User):
         """
         Проверяет, прошёл ли пользователь верификацию.
         """
         if not user.is_verified:
-            return await cls._deny("Требуется верификация аккаунта для выполнения данного действия")
-        return await cls._allow("Пользователь верифицирован")
+            return RuleResult.cached(
+                cls.rule_name,
+                False,
+                "Требуется верификация аккаунта для выполнения данного действия",
+            )
+        return RuleResult.cached(cls.rule_name, True, "Пользователь верифицирован")
 
     # -------------------------------------------------
     # 🔸 Проверка возможности публиковать заказы
     # -------------------------------------------------
     @classmethod
-    async def can_publish_order(cls, user: User, existing_orders_count: int):
+    def can_publish_order(cls, user: User, existing_orders_count: int):
         """
         Проверяет, может ли пользователь создавать новые заказы.
+        В рамках HTTP-запроса результат для одних и тех же входных данных
+        переиспользуется (см. request_memo).
         """
+        memo = request_memo()
+        if memo is None:
+            return cls._can_publish_order(user, existing_orders_count)
+        key = ("can_publish_order", user.id, user.is_verified, user.rating, existing_orders_count)
+        result = memo.get(key)
+        if result is None:
+            result = memo[key] = cls._can_publish_order(user, existing_orders_count)
+        return result
+
+    @classmethod
+    def _can_publish_order(cls, user: User, existing_orders_count: int):
         if not user.is_verified and existing_orders_count >= UNVERIFIED_ORDER_LIMIT:
-            return await cls._deny("Неверифицированный пользователь может иметь максимум 2 активных заказа")
+            return RuleResult.cached(
+                cls.rule_name,
+                False,
+                "Неверифицированный пользователь может иметь максимум 2 активных заказа",
+            )
 
         if user.rating is not None and user.rating < MIN_RATING_TO_PUBLISH_ORDER:
-            return await cls._deny(f"Минимальный рейтинг для публикации заказов — {MIN_RATING_TO_PUBLISH_ORDER}")
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_RATING_ORDER)
 
-        return await cls._allow("Разрешено публиковать заказ", {"rating": user.rating})
+        return RuleResult.cached(
+            cls.rule_name, True, "Разрешено публиковать заказ", {"rating": user.rating}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка возможности брать задания
     # -------------------------------------------------
     @classmethod
-    async def can_take_task(cls, user: User):
+    def can_take_task(cls, user: User):
         """
         Проверяет, может ли пользователь брать задания на выполнение.
         """
         if not user.is_verified:
-            return await cls._deny("Для выполнения заданий требуется верификация")
+            return RuleResult.cached(
+                cls.rule_name, False, "Для выполнения заданий требуется верификация"
+            )
         if user.rating and user.rating < MIN_RATING_TO_TAKE_TASK:
-            return await cls._deny(f"Минимальный рейтинг для выполнения заданий — {MIN_RATING_TO_TAKE_TASK}")
-        return await cls._allow("Пользователь может выполнять задания", {"rating": user.rating})
+            return RuleResult.cached(cls.rule_name, False, _MSG_MIN_RATING_TASK)
+        return RuleResult.cached(
+            cls.rule_name, True, "Пользователь может выполнять задания", {"rating": user.rating}
+        )
 
     # -------------------------------------------------
     # 🔸 Проверка возможности переводить средства
     # -------------------------------------------------
     @classmethod
-    async def can_transfer(cls, user: User):
+    def can_transfer(cls, user: User):
         """
         Проверяет, может ли пользователь выполнять переводы.
+        Типичный случай (верифицирован, активен, не заблокирован) — одно условие
+        и заранее созданный результат; причины отказа разбираются только при отказе.
         """
+        if user.is_verified and user.is_active and not user.is_blocked:
+            return _ALLOW_TRANSFER
         if not user.is_verified:
-            return await cls._deny("Для перевода средств требуется верификация личности")
-        if not user.is_active or user.is_blocked:
-            return await cls._deny("Переводы недоступны: аккаунт неактивен или заблокирован")
-        return await cls._allow("Пользователь может переводить средства")
-
-    # -------------------------------------------------
-    # 🔹 Вспомогательные методы
-    # -------------------------------------------------
-    @classmethod
-    async def _allow(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(True, message, meta)
+            return RuleResult.cached(
+                cls.rule_name, False, "Для перевода средств требуется верификация личности"
+            )
+        return RuleResult.cached(
+            cls.rule_name, False, "Переводы недоступны: аккаунт неактивен или заблокирован"
+        )
 
-    @classmethod
-    async def _deny(cls, message: str, meta: Dict[str, Any] | None = None):
-        return await cls._result(False, message, meta)
 
-    @classmethod
-    async def _result(cls, allowed: bool, message: str, meta: Dict[str, Any] | None = None):
-        from domain.rules.base import RuleResult
-        return RuleResult(
-            is_allowed=allowed,
-            message=message,
-            rule_name=cls.rule_name,
-            metadata=meta or {},
-        )
+# Разрешающий результат без metadata — один экземпляр на все вызовы can_transfer
+_ALLOW_TRANSFER = RuleResult.cached(
+    UserRules.rule_name, True, "Пользователь может переводить средства"
+)
@@ -8,21 +8,42 @@ Uzinex Boost — Domain Services Package
 - не содержат зависимостей от FastAPI (чистая логика)
 
 Сервисы:
+- BaseService — базовый класс сервисов
 - HealthService — системная проверка статуса
 - StatsService — статистика платформы
 - UserService, PaymentService, BalanceService и др.
 """
 
-from .health_service import HealthService
-from .stats_service import StatsService
-from .user_service import UserService
-from .payment_service import PaymentService
-from .balance_service import BalanceService
-from .order_service import OrderService
-from .task_service import TaskService
-from .referral_service import ReferralService
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base import BaseService
+    from .health_service import HealthService
+    from .stats_service import StatsService
+    from .user_service import UserService
+    from .payment_service import PaymentService
+    from .balance_service import BalanceService
+    from .order_service import OrderService
+    from .task_service import TaskService
+    from .referral_service import ReferralService
+
+# Сервисы импортируются лениво (PEP 562): модуль сервиса и его зависимости
+# (модели, правила, события) загружаются при первом обращении к имени
+_LAZY = {
+    "BaseService": ".base",
+    "HealthService": ".health_service",
+    "StatsService": ".stats_service",
+    "UserService": ".user_service",
+    "PaymentService": ".payment_service",
+    "BalanceService": ".balance_service",
+    "OrderService": ".order_service",
+    "TaskService": ".task_service",
+    "ReferralService": ".referral_service",
+}
 
 __all__ = [
+    "BaseService",
     "HealthService",
     "StatsService",
     "UserService",
@@ -32,3 +53,16 @@ __all__ = [
     "TaskService",
     "ReferralService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # последующие обращения — без __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
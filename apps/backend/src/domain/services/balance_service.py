@@ -17,23 +17,33 @@ Uzinex Boost — Balance Service
 • domain.rules.balance_rules      — политика и ограничения;
 • domain.events.balance_events    — события операций;
 • db.repositories.transaction_repository — хранение транзакций;
-• db.repositories.user_repository       — обновление баланса пользователя.
+• db.repositories.user_repository       — обновление баланса пользователя;
+• adapters.cache                         — кэш текущего баланса (`bal:{user_id}`).
 """
 
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.services.base import BaseService
 from domain.rules.balance_rules import BalanceRules
+from domain.rules.base import from_minor, to_minor
 from domain.events.balance_events import (
     BalanceUpdatedEvent,
     BalanceWithdrawnEvent,
     BalanceDepositedEvent,
     BalanceTransferredEvent,
 )
+from db.models.balance_model import TransactionType
 from db.repositories.transaction_repository import TransactionRepository
 from db.repositories.user_repository import UserRepository
+from adapters.cache import get_cache
+from adapters.cache.base import CacheBackend
+from adapters.cache.exceptions import CacheConnectionError, CacheError
+
+
+# Время жизни закэшированного баланса (сек); ключ сбрасывается при каждом изменении
+BALANCE_CACHE_TTL = 30
 
 
 class BalanceService(BaseService):
@@ -41,10 +51,36 @@ class BalanceService(BaseService):
     Сервис для управления балансами пользователей (UZT).
     """
 
-    def __init__(self, session: AsyncSession):
+    __slots__ = ("tx_repo", "user_repo", "cache")
+
+    def __init__(self, session: AsyncSession, cache: Optional[CacheBackend] = None):
         super().__init__(session)
         self.tx_repo = TransactionRepository(session)
         self.user_repo = UserRepository(session)
+        if cache is None:
+            try:
+                cache = get_cache()
+            except CacheConnectionError:
+                cache = None  # кэш не инициализирован — работаем напрямую с БД
+        self.cache = cache
+
+    # -------------------------------------------------
+    # 🔹 Кэш баланса
+    # -------------------------------------------------
+    def _balance_key(self, user_id: int) -> str:
+        return self.cache.build_key("bal", user_id)
+
+    async def _invalidate_balance(self, *user_ids: int) -> None:
+        """
+        Сбрасывает закэшированные балансы (одной командой DEL).
+        Вызывается после commit в каждой операции, меняющей баланс.
+        """
+        if self.cache is None:
+            return
+        try:
+            await self.cache.delete_many(*(self._balance_key(uid) for uid in user_ids))
+        except CacheError as e:
+            self.logger.warning("Balance cache invalidation failed for {}: {}", user_ids, e)
 
     # -------------------------------------------------
     # 🔹 Получить баланс пользователя
@@ -52,11 +88,29 @@ class BalanceService(BaseService):
     async def get_balance(self, user_id: int) -> Optional[float]:
         """
         Возвращает текущий баланс пользователя.
+        Значение кэшируется на BALANCE_CACHE_TTL секунд; при недоступности кэша читается из БД.
         """
+        if self.cache is not None:
+            try:
+                cached = await self.cache.get(self._balance_key(user_id))
+                if cached is not None:
+                    return float(cached)
+            except CacheError as e:
+                self.logger.warning("Balance cache read failed for {}: {}", user_id, e)
+
         user = await self.user_repo.get_by_id(user_id)
         if not user:
             return None
-        return float(user.balance)
+        balance = float(user.balance)
+
+        if self.cache is not None:
+            try:
+                await self.cache.set(
+                    self._balance_key(user_id), str(balance), expire=BALANCE_CACHE_TTL
+                )
+            except CacheError as e:
+                self.logger.warning("Balance cache write failed for {}: {}", user_id, e)
+        return balance
 
     # -------------------------------------------------
     # 🔹 Пополнение баланса
@@ -65,32 +119,88 @@ class BalanceService(BaseService):
         """
         Пополняет баланс пользователя после успешного платежа.
         """
+        result = await self.deposit_nocommit(user_id, amount, payment_id)
+        if result["success"]:
+            # Баланс, транзакция и событие outbox фиксируются одним коммитом
+            if not await self.commit():
+                return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+            await self._invalidate_balance(user_id)
+            self.log("Баланс пополнен: {} (+{} UZT)", user_id, amount)
+        return result
+
+    async def deposit_nocommit(
+        self,
+        user_id: int,
+        amount: float,
+        payment_id: Optional[int] = None,
+        *,
+        description: str = "Пополнение баланса",
+        order_id: Optional[int] = None,
+    ):
+        """
+        То же, что `deposit`, но без коммита: изменения и событие остаются в транзакции
+        сессии и фиксируются коммитом вызывающего сервиса. После коммита вызывающий
+        сбрасывает кэш баланса (`_invalidate_balance`).
+        `description` и `order_id` попадают в запись транзакции.
+        Возвраты средств идут через `credit_nocommit` — без правил пополнения.
+        """
+        # Сумма округляется до тийина один раз: баланс, транзакция и событие получают одно значение
+        amount = from_minor(to_minor(amount))
         # Проверка правил
         result = await BalanceRules.can_deposit(amount)
         if not result.is_allowed:
             return {"success": False, "message": result.message}
 
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            return {"success": False, "message": "Пользователь не найден"}
+        return await self.credit_nocommit(
+            user_id,
+            amount,
+            TransactionType.DEPOSIT,
+            description=description,
+            order_id=order_id,
+            payment_id=payment_id,
+        )
 
-        user.balance += amount
+    async def credit_nocommit(
+        self,
+        user_id: int,
+        amount: float,
+        tx_type: TransactionType,
+        *,
+        description: str,
+        order_id: Optional[int] = None,
+        task_id: Optional[int] = None,
+        payment_id: Optional[int] = None,
+    ):
+        """
+        Зачисляет средства без правил пополнения: баланс, транзакция `tx_type` и событие
+        в транзакции сессии (коммит и сброс кэша — за вызывающим).
+        Для денег, которые уже были на платформе: возврат из эскроу (ESCROW),
+        возврат платежа. Границы can_deposit к таким суммам не применяются.
+        """
+        # Округление до тийина — как в deposit_nocommit
+        amount = from_minor(to_minor(amount))
+
+        # Один UPDATE ... RETURNING вместо SELECT + изменения в Python
+        balance = await self.user_repo.atomic_adjust(user_id, amount)
+        if balance is None:
+            return {"success": False, "message": "Пользователь не найден"}
 
         # Создаём запись о транзакции
         tx = await self.tx_repo.create_transaction(
             user_id=user_id,
             amount=amount,
-            tx_type="deposit",
-            description="Пополнение баланса",
+            tx_type=tx_type,
+            description=description,
+            order_id=order_id,
+            task_id=task_id,
             payment_id=payment_id,
         )
-        await self.publish_event(
-            BalanceDepositedEvent(user_id=user_id, amount=amount, transaction_id=tx.id)
+        self.publish_event(
+            BalanceDepositedEvent(
+                user_id=user_id, amount=amount, payment_id=payment_id, transaction_id=tx.id
+            )
         )
-
-        await self.commit()
-        await self.log(f"Баланс пополнен: {user_id} (+{amount} UZT)")
-        return {"success": True, "balance": user.balance, "transaction_id": tx.id}
+        return {"success": True, "balance": balance, "transaction_id": tx.id}
 
     # -------------------------------------------------
     # 🔹 Снятие средств (вывод)
@@ -99,33 +209,75 @@ class BalanceService(BaseService):
         """
         Списывает средства с баланса пользователя (вывод).
         """
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            return {"success": False, "message": "Пользователь не найден"}
-
+        result = await self.withdraw_nocommit(user_id, amount)
+        if result["success"]:
+            if not await self.commit():
+                return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+            await self._invalidate_balance(user_id)
+            self.log("Вывод средств: {} (-{} UZT)", user_id, amount)
+        return result
+
+    async def withdraw_nocommit(self, user_id: int, amount: float):
+        """
+        То же, что `withdraw`, но без коммита (см. `deposit_nocommit`).
+        """
+        # Округление до тийина — как в deposit_nocommit
+        amount = from_minor(to_minor(amount))
         # Проверка лимитов и ограничений
         rule_result = await BalanceRules.can_withdraw(user_id, amount, self.tx_repo)
         if not rule_result.is_allowed:
             return {"success": False, "message": rule_result.message}
 
-        if user.balance < amount:
-            return {"success": False, "message": "Недостаточно средств на балансе"}
+        return await self.debit_nocommit(
+            user_id,
+            amount,
+            TransactionType.WITHDRAW,
+            reason="withdraw",
+            description="Вывод средств",
+        )
 
-        user.balance -= amount
+    async def debit_nocommit(
+        self,
+        user_id: int,
+        amount: float,
+        tx_type: TransactionType,
+        *,
+        reason: str,
+        description: str,
+        order_id: Optional[int] = None,
+        task_id: Optional[int] = None,
+    ):
+        """
+        Списывает средства без правил вывода: проверка остатка в БД, транзакция `tx_type`
+        и событие в транзакции сессии (коммит и сброс кэша — за вызывающим).
+        Для удержания под заказ или задание (ESCROW): лимиты can_withdraw
+        относятся к выводу средств с платформы и к оплате заказов не применяются.
+        """
+        # Округление до тийина — как в deposit_nocommit
+        amount = from_minor(to_minor(amount))
+
+        # Списание и проверка остатка — одним UPDATE ... RETURNING на стороне БД
+        balance = await self.user_repo.atomic_adjust(user_id, -amount, require_funds=True)
+        if balance is None:
+            if await self.user_repo.get_by_id(user_id) is None:
+                return {"success": False, "message": "Пользователь не найден"}
+            return {"success": False, "message": "Недостаточно средств на балансе"}
 
         tx = await self.tx_repo.create_transaction(
             user_id=user_id,
             amount=-amount,
-            tx_type="withdraw",
-            description="Вывод средств",
+            tx_type=tx_type,
+            description=description,
+            order_id=order_id,
+            task_id=task_id,
         )
 
-        await self.publish_event(
-            BalanceWithdrawnEvent(user_id=user_id, amount=amount, transaction_id=tx.id)
+        self.publish_event(
+            BalanceWithdrawnEvent(
+                user_id=user_id, amount=amount, reason=reason, transaction_id=tx.id
+            )
         )
-        await self.commit()
-        await self.log(f"Вывод средств: {user_id} (-{amount} UZT)")
-        return {"success": True, "balance": user.balance, "transaction_id": tx.id}
+        return {"success": True, "balance": balance, "transaction_id": tx.id}
 
     # -------------------------------------------------
     # 🔹 Перевод между пользователями
@@ -134,49 +286,55 @@ class BalanceService(BaseService):
         """
         Переводит средства между пользователями.
         """
+        # Округление до тийина — как в deposit_nocommit
+        amount = from_minor(to_minor(amount))
         # Проверка правил
         rule_result = await BalanceRules.can_transfer(sender_id, receiver_id, amount)
         if not rule_result.is_allowed:
             return {"success": False, "message": rule_result.message}
 
-        sender = await self.user_repo.get_by_id(sender_id)
-        receiver = await self.user_repo.get_by_id(receiver_id)
-        if not sender or not receiver:
+        # Блокировка обоих пользователей, списание и зачисление — одним запросом
+        found, sender_balance, _ = await self.user_repo.atomic_transfer(
+            sender_id, receiver_id, amount
+        )
+        if found < 2:
             return {"success": False, "message": "Пользователь не найден"}
-
-        if sender.balance < amount:
+        if sender_balance is None:
             return {"success": False, "message": "Недостаточно средств для перевода"}
 
-        sender.balance -= amount
-        receiver.balance += amount
-
-        # Две записи о транзакциях
-        tx_sender = await self.tx_repo.create_transaction(
-            user_id=sender_id,
-            amount=-amount,
-            tx_type="transfer_out",
-            description=f"Перевод пользователю {receiver_id}",
-        )
-        tx_receiver = await self.tx_repo.create_transaction(
-            user_id=receiver_id,
-            amount=amount,
-            tx_type="transfer_in",
-            description=f"Перевод от пользователя {sender_id}",
+        # Две записи о транзакциях — одним INSERT. Тип TRANSFER: переводы не считаются
+        # выводами в лимитах can_withdraw
+        tx_sender_id, _ = await self.tx_repo.create_transactions_bulk(
+            [
+                {
+                    "user_id": sender_id,
+                    "amount": -amount,
+                    "type": TransactionType.TRANSFER,
+                    "description": f"Перевод пользователю {receiver_id}",
+                },
+                {
+                    "user_id": receiver_id,
+                    "amount": amount,
+                    "type": TransactionType.TRANSFER,
+                    "description": f"Перевод от пользователя {sender_id}",
+                },
+            ]
         )
 
-        await self.publish_event(
+        self.publish_event(
             BalanceTransferredEvent(
                 sender_id=sender_id,
                 receiver_id=receiver_id,
                 amount=amount,
-                sender_tx_id=tx_sender.id,
-                receiver_tx_id=tx_receiver.id,
+                transaction_id=tx_sender_id,
             )
         )
 
-        await self.commit()
-        await self.log(f"Перевод: {sender_id} → {receiver_id} ({amount} UZT)")
-        return {"success": True, "amount": amount, "sender_balance": sender.balance}
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self._invalidate_balance(sender_id, receiver_id)
+        self.log("Перевод: {} → {} ({} UZT)", sender_id, receiver_id, amount)
+        return {"success": True, "amount": amount, "sender_balance": sender_balance}
 
     # -------------------------------------------------
     # 🔹 История транзакций
@@ -193,12 +351,13 @@ class BalanceService(BaseService):
     # -------------------------------------------------
     async def get_balance_summary(self, user_id: int):
         """
-        Возвращает агрегированные данные по операциям пользователя.
+        Возвращает агрегированные данные по операциям пользователя
+        вместе с текущим балансом (один запрос к БД).
         """
-        summary = await self.tx_repo.get_summary_by_user(user_id)
-        current_balance = await self.get_balance(user_id)
-        summary["current_balance"] = current_balance
-        await self.log(f"Получен отчёт по балансу пользователя: {user_id}")
+        summary = await self.tx_repo.get_summary_with_balance(user_id)
+        if summary is None:
+            return {"success": False, "message": "Пользователь не найден"}
+        self.log("Получен отчёт по балансу пользователя: {}", user_id)
         return summary
 
     # -------------------------------------------------
@@ -208,21 +367,51 @@ class BalanceService(BaseService):
         """
         Принудительно корректирует баланс (используется администратором).
         """
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
+        result = await self.adjust_balances([user_id], amount, reason)
+        if not result["success"]:
+            return result
+        return {"success": True, "balance": result["balances"][user_id]}
+
+    async def adjust_balances(self, user_ids: Sequence[int], amount: float, reason: str):
+        """
+        Корректирует баланс нескольких пользователей на одну сумму
+        (массовые начисления администратором).
+        Один UPDATE ... RETURNING по всем пользователям и один INSERT транзакций.
+        """
+        # Округление до тийина — как в deposit_nocommit
+        amount = from_minor(to_minor(amount))
+        balances = await self.user_repo.bulk_adjust(user_ids, amount)
+        if not balances:
             return {"success": False, "message": "Пользователь не найден"}
 
-        user.balance += amount
-        tx = await self.tx_repo.create_transaction(
-            user_id=user_id,
-            amount=amount,
-            tx_type="adjustment",
-            description=reason,
+        tx_ids = await self.tx_repo.create_transactions_bulk(
+            [
+                {
+                    "user_id": uid,
+                    "amount": amount,
+                    "type": TransactionType.ADMIN_ADJUST,
+                    "description": reason,
+                }
+                for uid in balances
+            ]
         )
 
-        await self.publish_event(
-            BalanceUpdatedEvent(user_id=user_id, amount=amount, reason=reason, transaction_id=tx.id)
+        for (uid, balance), tx_id in zip(balances.items(), tx_ids):
+            self.publish_event(
+                BalanceUpdatedEvent(
+                    user_id=uid,
+                    amount=amount,
+                    balance_before=from_minor(to_minor(balance) - to_minor(amount)),
+                    balance_after=balance,
+                    source="admin",
+                    transaction_id=tx_id,
+                )
+            )
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self._invalidate_balance(*balances)
+        self.log(
+            "Корректировка баланса пользователей {}: {} UZT ({})", list(balances), amount, reason
         )
-        await self.commit()
-        await self.log(f"Корректировка баланса пользователя {user_id}: {amount} UZT ({reason})")
-        return {"success": True, "balance": user.balance}
+        missing = sorted(set(user_ids) - balances.keys())
+        return {"success": True, "balances": balances, "missing": missing}
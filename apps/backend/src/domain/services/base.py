@@ -23,11 +23,16 @@ Uzinex Boost — Base Service
 """
 
 from __future__ import annotations
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from domain.events.dispatcher import EventDispatcher
+from db.models.outbox_model import OutboxEvent
+from domain.events.codec import encode
+
+if TYPE_CHECKING:
+    from domain.services.balance_service import BalanceService
 
 
 # -------------------------------------------------
@@ -44,28 +49,69 @@ class BaseService:
     - унифицированную обработку ошибок.
     """
 
+    # Экземпляр создаётся на каждый запрос: без __dict__ он компактнее.
+    # Подклассы объявляют свои __slots__, иначе __dict__ вернётся.
+    __slots__ = ("session", "logger", "_log_prefix")
+
     def __init__(self, session: AsyncSession):
         self.session = session
         self.logger = logger.bind(service=self.__class__.__name__)
+        self._log_prefix = f"{self.__class__.__name__}: "
+
+    @property
+    def _pending_events(self) -> List[Dict[str, Any]]:
+        """
+        Строки outbox, записываемые одним INSERT при commit().
+        Хранятся в сессии: события, поставленные вложенным сервисом (например,
+        BalanceService в режиме *_nocommit), попадают в коммит вызывающего сервиса.
+        """
+        return self.session.info.setdefault("outbox_pending", [])
+
+    # -------------------------------------------------
+    # 🔸 Общий BalanceService сессии
+    # -------------------------------------------------
+    @property
+    def balance_service(self) -> BalanceService:
+        """
+        BalanceService, привязанный к сессии запроса: создаётся при первом обращении
+        и хранится в `session.info`, поэтому все сервисы запроса используют один экземпляр.
+        """
+        service = self.session.info.get("balance_service")
+        if service is None:
+            from domain.services.balance_service import BalanceService  # циклический импорт
+
+            service = self.session.info["balance_service"] = BalanceService(self.session)
+        return service
 
     # -------------------------------------------------
     # 🔸 Логирование действий
     # -------------------------------------------------
-    async def log(self, message: str, **kwargs: Any):
+    def log(self, template: str, *args: Any, **kwargs: Any):
         """
         Унифицированное логирование действий сервиса.
+        Аргументы подставляются в `template` (`{}`) самим loguru и только если
+        уровень INFO включён — на горячих путях без f-строк.
         """
-        self.logger.info(f"{self.__class__.__name__}: {message}", **kwargs)
+        self.logger.info(self._log_prefix + template, *args, **kwargs)
 
     # -------------------------------------------------
     # 🔸 Публикация событий
     # -------------------------------------------------
-    async def publish_event(self, event: Any):
+    def publish_event(self, event: Any):
         """
-        Отправляет доменное событие в шину событий (Event Bus).
+        Ставит доменное событие в очередь outbox текущей транзакции.
+        Все события сервиса записываются одним INSERT в commit() перед коммитом;
+        в шину (Event Bus) их доставляет фоновый OutboxRelay.
+        При откате событие не публикуется.
         """
-        await EventDispatcher.publish(event)
-        self.logger.debug(f"Event published: {event.event_type} ({event.__class__.__name__})")
+        self._pending_events.append(
+            {
+                "aggregate_id": getattr(event, "user_id", None),
+                "event_type": event.event_type,
+                "payload_json": encode(event).decode(),
+            }
+        )
+        self.logger.debug("Event queued: {} ({})", event.event_type, event.__class__.__name__)
 
     # -------------------------------------------------
     # 🔸 Безопасное выполнение операции
@@ -79,23 +125,31 @@ class BaseService:
             result = await func(*args, **kwargs)
             return result
         except Exception as e:
-            self.logger.exception(f"Error in {self.__class__.__name__}: {e}")
+            self.logger.exception("Error in {}: {}", self.__class__.__name__, e)
+            self._pending_events.clear()
             await self.session.rollback()
             return None
 
     # -------------------------------------------------
     # 🔸 Коммит транзакции
     # -------------------------------------------------
-    async def commit(self):
+    async def commit(self) -> bool:
         """
-        Подтверждает изменения в сессии.
+        Подтверждает изменения в сессии вместе с накопленными событиями outbox.
+        Изменения и события фиксируются или откатываются вместе.
+        Возвращает False, если коммит не удался (сессия уже откатана).
         """
+        events = self.session.info.pop("outbox_pending", None)
         try:
+            if events:
+                await self.session.execute(insert(OutboxEvent), events)
             await self.session.commit()
             self.logger.debug("Session committed successfully.")
+            return True
         except Exception as e:
-            self.logger.exception(f"Commit failed: {e}")
+            self.logger.exception("Commit failed: {}", e)
             await self.session.rollback()
+            return False
 
     # -------------------------------------------------
     # 🔸 Откат транзакции
@@ -104,5 +158,6 @@ class BaseService:
         """
         Откатывает все несохранённые изменения.
         """
+        self._pending_events.clear()
         await self.session.rollback()
         self.logger.warning("Session rolled back.")
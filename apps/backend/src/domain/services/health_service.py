@@ -11,11 +11,13 @@ Uzinex Boost — Health Service
 """
 
 from __future__ import annotations
+import asyncio
 import time
 import logging
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import aiohttp
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from core.config import settings
@@ -23,23 +25,81 @@ from adapters.cache.redis_cache import RedisCache
 
 logger = logging.getLogger("uzinex.domain.health")
 
+# Верхняя граница ожидания одной проверки: зависший Telegram API не должен блокировать /health
+HEALTH_PROBE_TIMEOUT_S = 6.0
+
+# Время жизни результата проверки: частые запросы мониторинга не множат нагрузку на зависимости
+PROBE_TTL_S = 5.0
+TELEGRAM_PROBE_TTL_S = 30.0  # внешний HTTPS-запрос — самая дорогая проверка
+
 
 class HealthService:
     """
     HealthService — центральный сервис проверки состояния системы.
     """
 
+    __slots__ = ("db_engine", "redis_client")
+
+    # Общая HTTP-сессия для внешних проверок: keep-alive и пул соединений
+    # избавляют от TCP+TLS рукопожатия с api.telegram.org на каждой проверке.
+    _http: Optional[aiohttp.ClientSession] = None
+
+    # Результаты проверок: имя → (значение, момент истечения по time.monotonic()).
+    # Хранятся на классе, т.к. экземпляр сервиса создаётся на каждый запрос.
+    _probe_cache: Dict[str, Tuple[bool, float]] = {}
+
     def __init__(self, db_engine: AsyncEngine, redis_client: RedisCache):
         self.db_engine = db_engine
         self.redis_client = redis_client
 
+    # -------------------------------------------------
+    # 🔹 HTTP-сессия
+    # -------------------------------------------------
+    @classmethod
+    async def _get_http(cls) -> aiohttp.ClientSession:
+        """Лениво создаёт общую ClientSession (в работающем event loop)."""
+        if cls._http is None or cls._http.closed:
+            cls._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+        return cls._http
+
+    @classmethod
+    async def close_http(cls) -> None:
+        """Закрывает общую HTTP-сессию (вызывается при остановке приложения)."""
+        if cls._http is not None and not cls._http.closed:
+            await cls._http.close()
+        cls._http = None
+
+    # -------------------------------------------------
+    # 🔹 Кэширование результатов проверок
+    # -------------------------------------------------
+    @classmethod
+    async def _memoized(
+        cls, name: str, ttl: float, probe: Callable[[], Awaitable[bool]], fresh: bool
+    ) -> bool:
+        """Возвращает результат проверки из кэша или выполняет её (`fresh=True` — всегда)."""
+        now = time.monotonic()
+        cached = cls._probe_cache.get(name)
+        if not fresh and cached is not None and now < cached[1]:
+            return cached[0]
+        value = await probe()
+        cls._probe_cache[name] = (value, time.monotonic() + ttl)
+        return value
+
     # -------------------------------------------------
     # 🔹 Проверка PostgreSQL
     # -------------------------------------------------
-    async def check_postgres(self) -> bool:
+    async def check_postgres(self, *, fresh: bool = False) -> bool:
+        return await self._memoized("postgres", PROBE_TTL_S, self._probe_postgres, fresh)
+
+    async def _probe_postgres(self) -> bool:
         try:
+            # AUTOCOMMIT: пинг без BEGIN/ROLLBACK вокруг запроса
             async with self.db_engine.connect() as conn:
-                await conn.execute("SELECT 1")
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("SELECT 1"))
             logger.debug("✅ PostgreSQL connection OK")
             return True
         except Exception as e:
@@ -49,7 +109,10 @@ class HealthService:
     # -------------------------------------------------
     # 🔹 Проверка Redis
     # -------------------------------------------------
-    async def check_redis(self) -> bool:
+    async def check_redis(self, *, fresh: bool = False) -> bool:
+        return await self._memoized("redis", PROBE_TTL_S, self._probe_redis, fresh)
+
+    async def _probe_redis(self) -> bool:
         try:
             client = await self.redis_client.ensure_connection()
             pong = await client.ping()
@@ -63,20 +126,23 @@ class HealthService:
     # -------------------------------------------------
     # 🔹 Проверка Telegram API (опционально)
     # -------------------------------------------------
-    async def check_telegram(self) -> bool:
+    async def check_telegram(self, *, fresh: bool = False) -> bool:
+        return await self._memoized("telegram", TELEGRAM_PROBE_TTL_S, self._probe_telegram, fresh)
+
+    async def _probe_telegram(self) -> bool:
         if not settings.TELEGRAM_BOT_TOKEN or settings.TELEGRAM_BOT_TOKEN.startswith("YOUR_"):
             logger.warning("⚠️ Telegram check skipped — bot token not configured")
             return False
 
         url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/getMe"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=5) as response:
-                    data = await response.json()
-                    if data.get("ok"):
-                        logger.debug("✅ Telegram API reachable")
-                        return True
-                    logger.error(f"❌ Telegram API responded with error: {data}")
+            session = await self._get_http()
+            async with session.get(url) as response:
+                data = await response.json()
+                if data.get("ok"):
+                    logger.debug("✅ Telegram API reachable")
+                    return True
+                logger.error(f"❌ Telegram API responded with error: {data}")
         except Exception as e:
             logger.error(f"❌ Telegram API check failed: {e}")
         return False
@@ -84,15 +150,25 @@ class HealthService:
     # -------------------------------------------------
     # 🔹 Основной метод
     # -------------------------------------------------
-    async def get_health_status(self) -> Dict[str, Any]:
+    async def get_health_status(self, *, fresh: bool = False) -> Dict[str, Any]:
         """
         Проверяет все ключевые сервисы и возвращает JSON-сводку.
+        Результаты проверок кэшируются на несколько секунд; `fresh=True` — принудительная проверка.
         """
         start_time = time.perf_counter()
 
-        postgres_ok = await self.check_postgres()
-        redis_ok = await self.check_redis()
-        telegram_ok = await self.check_telegram()
+        # Проверки независимы и ограничены вводом-выводом — выполняем параллельно:
+        # общее время ≈ самая медленная проверка, а не их сумма.
+        results = await asyncio.gather(
+            asyncio.wait_for(self.check_postgres(fresh=fresh), HEALTH_PROBE_TIMEOUT_S),
+            asyncio.wait_for(self.check_redis(fresh=fresh), HEALTH_PROBE_TIMEOUT_S),
+            asyncio.wait_for(self.check_telegram(fresh=fresh), HEALTH_PROBE_TIMEOUT_S),
+            return_exceptions=True,
+        )
+        for name, result in zip(("postgres", "redis", "telegram"), results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ {name} check failed: {result!r}")
+        postgres_ok, redis_ok, telegram_ok = (result is True for result in results)
 
         elapsed = round(time.perf_counter() - start_time, 3)
 
@@ -34,7 +34,9 @@ from domain.events.order_events import (
     OrderCompletedEvent,
     OrderCancelledEvent,
 )
-from domain.services.balance_service import BalanceService
+from domain.events.base import to_ms
+from db.models.balance_model import TransactionType
+from db.models.order_model import OrderStatus
 from db.repositories.order_repository import OrderRepository
 from db.repositories.user_repository import UserRepository
 
@@ -44,11 +46,12 @@ class OrderService(BaseService):
     Управляет заказами: создание, принятие, выполнение, отмена.
     """
 
+    __slots__ = ("order_repo", "user_repo")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.order_repo = OrderRepository(session)
         self.user_repo = UserRepository(session)
-        self.balance_service = BalanceService(session)
 
     # -------------------------------------------------
     # 🔹 Создание нового заказа
@@ -65,22 +68,26 @@ class OrderService(BaseService):
         Создаёт заказ от клиента.
         Проверяет правила, баланс и публикует событие.
         """
-        client = await self.user_repo.get_by_id(client_id)
-        if not client:
+        # Клиент, число его активных заказов и баланс — одним запросом
+        context = await self.order_repo.load_creation_context(client_id)
+        if context is None:
             return {"success": False, "message": "Клиент не найден"}
+        client, active_orders, balance = context
 
-        active_orders = await self.order_repo.count_active_by_client(client_id)
-        rule = await OrderRules.can_create_order(client, price, active_orders)
-        if not rule.is_allowed:
-            return {"success": False, "message": rule.message}
+        # Сервису нужен только итог проверки — используем быстрый путь без RuleResult
+        denied = OrderRules.can_create_order_check(client, price, active_orders)
+        if denied is not None:
+            return {"success": False, "message": denied}
+        if deadline is not None:
+            rule = OrderRules.validate_deadline(deadline)
+            if not rule.is_allowed:
+                return {"success": False, "message": rule.message}
 
         # Проверка баланса
-        balance = await self.balance_service.get_balance(client_id)
-        if balance is None or balance < price:
+        if balance < price:
             return {"success": False, "message": "Недостаточно средств на балансе"}
 
-        # Списываем средства под эскроу
-        await self.balance_service.withdraw(client_id, price)
+        now = datetime.utcnow()
 
         # Создаём заказ
         order = await self.order_repo.create_order(
@@ -88,14 +95,37 @@ class OrderService(BaseService):
             title=title,
             description=description,
             price=price,
-            deadline=deadline or datetime.utcnow() + timedelta(days=7),
+            deadline=deadline or now + timedelta(days=7),
         )
 
-        await self.publish_event(
-            OrderCreatedEvent(order_id=order.id, client_id=client_id, price=price)
+        # Удерживаем бюджет под эскроу: это оплата заказа, а не вывод, поэтому лимиты
+        # can_withdraw не применяются. Списание с проверкой остатка в БД может не пройти,
+        # если баланс успел измениться после чтения контекста — тогда заказ не создаётся
+        held = await self.balance_service.debit_nocommit(
+            client_id,
+            price,
+            TransactionType.ESCROW,
+            reason="order",
+            description=f"Оплата заказа {order.id}",
+            order_id=order.id,
         )
-        await self.commit()
-        await self.log(f"Создан заказ {order.id} клиентом {client_id}")
+        if not held["success"]:
+            await self.rollback()
+            return held
+
+        self.publish_event(
+            OrderCreatedEvent(
+                order_id=order.id,
+                client_id=client_id,
+                title=title,
+                price=price,
+                timestamp=to_ms(now),
+            )
+        )
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self.balance_service._invalidate_balance(client_id)
+        self.log("Создан заказ {} клиентом {}", order.id, client_id)
         return {"success": True, "order_id": order.id}
 
     # -------------------------------------------------
@@ -105,29 +135,33 @@ class OrderService(BaseService):
         """
         Исполнитель принимает заказ в работу.
         """
-        performer = await self.user_repo.get_by_id(performer_id)
-        order = await self.order_repo.get_by_id(order_id)
-        if not performer or not order:
+        # Исполнитель, заказ и его текущая нагрузка — одним запросом
+        context = await self.order_repo.load_acceptance_context(performer_id, order_id)
+        if context is None:
             return {"success": False, "message": "Исполнитель или заказ не найден"}
+        performer, _, active_orders = context
 
-        if order.status != "open":
-            return {"success": False, "message": "Заказ уже в работе или завершён"}
-
-        active_orders = await self.order_repo.count_active_by_performer(performer_id)
-        rule = await OrderRules.can_accept_order(performer, active_orders)
+        rule = OrderRules.can_accept_order(performer, active_orders)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        order.performer_id = performer_id
-        order.status = "in_progress"
-        order.accepted_at = datetime.utcnow()
-
-        await self.publish_event(
-            OrderAcceptedEvent(order_id=order.id, performer_id=performer_id)
+        # Исполнитель работает по заказу через задание. Статус, лимит действий, остаток
+        # бюджета и повторное принятие проверяются в самом INSERT под блокировкой заказа
+        now = datetime.utcnow()
+        task_id = await self.order_repo.accept(order_id, performer_id, now)
+        if task_id is None:
+            return {
+                "success": False,
+                "message": "Заказ недоступен: он не активен, исчерпан или уже принят вами",
+            }
+        await self.user_repo.adjust_active_tasks(performer_id, 1)
+
+        self.publish_event(
+            OrderAcceptedEvent(order_id=order_id, performer_id=performer_id, timestamp=to_ms(now))
         )
         await self.commit()
-        await self.log(f"Исполнитель {performer_id} принял заказ {order_id}")
-        return {"success": True, "status": "in_progress"}
+        self.log("Исполнитель {} принял заказ {}", performer_id, order_id)
+        return {"success": True, "task_id": task_id}
 
     # -------------------------------------------------
     # 🔹 Завершение заказа
@@ -140,32 +174,23 @@ class OrderService(BaseService):
         if not order:
             return {"success": False, "message": "Заказ не найден"}
 
-        rule = await OrderRules.can_complete_order(order.status, order.deadline)
+        # Срока выполнения в модели заказа нет — проверяется только статус
+        now = datetime.utcnow()
+        rule = OrderRules.can_complete_order(order.status, None, now=now)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        order.status = "completed"
-        order.completed_at = datetime.utcnow()
-
-        # Расчёт комиссии и выплата исполнителю
-        fee_data = await OrderRules.calculate_fee(order.price)
-        net = fee_data["net_amount"]
-        performer_id = order.performer_id
+        # Исполнители получают оплату за каждое одобренное задание, поэтому завершение
+        # только закрывает заказ. Переход из прочитанного статуса: гонку проиграет второй
+        order = await self.order_repo.transition(order_id, order.status, OrderStatus.COMPLETED)
+        if order is None:
+            return {"success": False, "message": "Статус заказа уже изменился"}
 
-        if performer_id:
-            await self.balance_service.deposit(performer_id, net)
-
-        await self.publish_event(
-            OrderCompletedEvent(
-                order_id=order.id,
-                performer_id=performer_id,
-                price=order.price,
-                net_amount=net,
-                platform_fee=fee_data["fee"],
-            )
+        self.publish_event(
+            OrderCompletedEvent(order_id=order_id, price=order.spent_budget, timestamp=to_ms(now))
         )
         await self.commit()
-        await self.log(f"Заказ {order_id} завершён, выплачено {net} UZT")
+        self.log("Заказ {} завершён, выплачено {} UZT", order_id, order.spent_budget)
         return {"success": True, "status": "completed"}
 
     # -------------------------------------------------
@@ -179,36 +204,62 @@ class OrderService(BaseService):
         if not order:
             return {"success": False, "message": "Заказ не найден"}
 
-        rule = await OrderRules.can_cancel_order(order.status, user_role)
+        rule = OrderRules.can_cancel_order(order.status, user_role)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        order.status = "cancelled"
-        order.cancelled_at = datetime.utcnow()
-
-        # Возврат средств клиенту, если заказ не начался
-        if order.status == "open":
-            await self.balance_service.deposit(order.client_id, order.price)
+        now = datetime.utcnow()
+        order = await self.order_repo.transition(order_id, order.status, OrderStatus.CANCELLED)
+        if order is None:
+            return {"success": False, "message": "Статус заказа уже изменился"}
+
+        # Возврат клиенту неизрасходованного бюджета из эскроу — в той же транзакции,
+        # что и отмена. Это не пополнение: правила can_deposit не применяются
+        refund = order.remaining_budget()
+        if refund > 0:
+            refunded = await self.balance_service.credit_nocommit(
+                order.user_id,
+                refund,
+                TransactionType.ESCROW,
+                description=f"Возврат по заказу {order.id}",
+                order_id=order.id,
+            )
+            if not refunded["success"]:
+                await self.rollback()
+                return refunded
 
-        await self.publish_event(
-            OrderCancelledEvent(order_id=order.id, user_id=user_id, role=user_role)
+        self.publish_event(
+            OrderCancelledEvent(
+                order_id=order.id,
+                cancelled_by=user_id,
+                refunded=refund > 0,
+                timestamp=to_ms(now),
+            )
         )
-        await self.commit()
-        await self.log(f"Заказ {order_id} отменён пользователем {user_id}")
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        if refund > 0:
+            await self.balance_service._invalidate_balance(order.user_id)
+        self.log("Заказ {} отменён пользователем {}", order_id, user_id)
         return {"success": True, "status": "cancelled"}
 
     # -------------------------------------------------
     # 🔹 Получение списка заказов
     # -------------------------------------------------
-    async def get_user_orders(self, user_id: int, role: str, limit: int = 50):
+    async def get_user_orders(
+        self, user_id: int, role: str, limit: int = 50, cursor: Optional[int] = None
+    ):
         """
-        Возвращает заказы клиента или исполнителя.
+        Возвращает страницу заказов клиента или исполнителя.
+        `cursor` — значение `next_cursor` из предыдущей страницы.
         """
         if role == "client":
-            orders = await self.order_repo.get_by_client(user_id, limit)
+            items, next_cursor = await self.order_repo.get_page_by_client(user_id, limit, cursor)
         else:
-            orders = await self.order_repo.get_by_performer(user_id, limit)
-        return [o.as_dict() for o in orders]
+            items, next_cursor = await self.order_repo.get_page_by_performer(
+                user_id, limit, cursor
+            )
+        return {"items": items, "next_cursor": next_cursor}
 
     # -------------------------------------------------
     # 🔹 Глобальная статистика по заказам
@@ -218,5 +269,5 @@ class OrderService(BaseService):
         Возвращает общую статистику по заказам.
         """
         stats = await self.order_repo.get_stats()
-        await self.log("Получена глобальная статистика заказов")
+        self.log("Получена глобальная статистика заказов")
         return stats
@@ -27,7 +27,6 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.services.base import BaseService
-from domain.services.balance_service import BalanceService
 from domain.rules.payment_rules import PaymentRules
 from domain.events.payment_events import (
     PaymentCreatedEvent,
@@ -35,8 +34,11 @@ from domain.events.payment_events import (
     PaymentFailedEvent,
     PaymentRefundedEvent,
 )
+from domain.events.base import short_reason, to_ms
+from db.models.balance_model import TransactionType
 from db.repositories.payment_repository import PaymentRepository
 from db.repositories.transaction_repository import TransactionRepository
+from db.repositories.user_repository import UserRepository
 
 
 class PaymentService(BaseService):
@@ -44,11 +46,13 @@ class PaymentService(BaseService):
     Управляет всеми платёжными процессами (депозиты, выводы, возвраты).
     """
 
+    __slots__ = ("payment_repo", "tx_repo", "user_repo")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.payment_repo = PaymentRepository(session)
         self.tx_repo = TransactionRepository(session)
-        self.balance_service = BalanceService(session)
+        self.user_repo = UserRepository(session)
 
     # -------------------------------------------------
     # 🔹 Создание нового платежа
@@ -64,8 +68,8 @@ class PaymentService(BaseService):
         """
         Создаёт запись о новом платеже (ожидание подтверждения).
         """
-        # Проверяем метод оплаты по правилам
-        rule = await PaymentRules.validate_method(user_id=user_id, method=method)
+        # Проверяем сумму и метод оплаты по правилам
+        rule = await PaymentRules.evaluate(user_id, amount, method, self.user_repo)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
@@ -78,17 +82,16 @@ class PaymentService(BaseService):
             metadata=metadata or {},
         )
 
-        await self.publish_event(
+        self.publish_event(
             PaymentCreatedEvent(
                 payment_id=payment.id,
                 user_id=user_id,
                 amount=amount,
                 method=method,
-                direction=direction,
             )
         )
         await self.commit()
-        await self.log(f"Создан платёж {payment.id} ({direction}, {amount} UZT, {method})")
+        self.log("Создан платёж {} ({}, {} UZT, {})", payment.id, direction, amount, method)
         return {"success": True, "payment_id": payment.id, "status": payment.status}
 
     # -------------------------------------------------
@@ -98,40 +101,33 @@ class PaymentService(BaseService):
         """
         Подтверждает успешное выполнение платежа.
         """
-        payment = await self.payment_repo.get_by_id(payment_id)
-        if not payment:
-            return {"success": False, "message": "Платёж не найден"}
-
-        if payment.status == "completed":
-            return {"success": False, "message": "Платёж уже подтверждён"}
-
-        payment.status = "completed"
-        payment.completed_at = datetime.utcnow()
-
-        # Синхронизация с балансом
-        if payment.direction == "in":
-            await self.balance_service.deposit(
-                user_id=payment.user_id,
-                amount=payment.amount,
-                payment_id=payment.id,
-            )
-        elif payment.direction == "out":
-            await self.balance_service.withdraw(
-                user_id=payment.user_id,
-                amount=payment.amount,
-            )
+        now = datetime.utcnow()
+        payment = await self.payment_repo.complete_and_return(payment_id, at=now)
+        if payment is None:
+            return {"success": False, "message": "Платёж не найден или уже обработан"}
+
+        # Зачисление на баланс — в той же транзакции, что и смена статуса платежа:
+        # при отказе пополнения платёж остаётся необработанным
+        deposited = await self.balance_service.deposit_nocommit(
+            payment.user_id, payment.amount, payment_id
+        )
+        if not deposited["success"]:
+            await self.rollback()
+            return deposited
 
-        await self.publish_event(
+        self.publish_event(
             PaymentCompletedEvent(
-                payment_id=payment.id,
+                payment_id=payment_id,
                 user_id=payment.user_id,
                 amount=payment.amount,
                 method=payment.method,
-                direction=payment.direction,
+                timestamp=to_ms(now),
             )
         )
-        await self.commit()
-        await self.log(f"Платёж подтверждён: {payment.id}")
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self.balance_service._invalidate_balance(payment.user_id)
+        self.log("Платёж подтверждён: {}", payment_id)
         return {"success": True, "status": "completed"}
 
     # -------------------------------------------------
@@ -141,24 +137,24 @@ class PaymentService(BaseService):
         """
         Помечает платёж как неуспешный.
         """
-        payment = await self.payment_repo.get_by_id(payment_id)
-        if not payment:
-            return {"success": False, "message": "Платёж не найден"}
-
-        payment.status = "failed"
-        payment.failed_reason = reason or "Неизвестная ошибка"
-        payment.failed_at = datetime.utcnow()
+        reason = reason or "Неизвестная ошибка"
+        now = datetime.utcnow()
+        payment = await self.payment_repo.fail_and_return(payment_id, reason, at=now)
+        if payment is None:
+            return {"success": False, "message": "Платёж не найден или уже обработан"}
 
-        await self.publish_event(
+        self.publish_event(
             PaymentFailedEvent(
-                payment_id=payment.id,
+                payment_id=payment_id,
                 user_id=payment.user_id,
                 amount=payment.amount,
-                reason=payment.failed_reason,
+                method=payment.method,
+                error_message=short_reason(reason),
+                timestamp=to_ms(now),
             )
         )
         await self.commit()
-        await self.log(f"Платёж неуспешен: {payment.id} ({reason})")
+        self.log("Платёж неуспешен: {} ({})", payment_id, reason)
         return {"success": True, "status": "failed"}
 
     # -------------------------------------------------
@@ -178,36 +174,49 @@ class PaymentService(BaseService):
             return {"success": False, "message": rule.message}
 
         payment.status = "refunded"
-        payment.refunded_at = datetime.utcnow()
-
-        # Возврат на баланс
-        await self.balance_service.deposit(
-            user_id=payment.user_id,
-            amount=payment.amount,
+        now = datetime.utcnow()
+        payment.refunded_at = now
+
+        # Возврат на баланс — в той же транзакции, что и смена статуса платежа
+        refunded = await self.balance_service.credit_nocommit(
+            payment.user_id,
+            payment.amount,
+            TransactionType.DEPOSIT,
+            description="Возврат платежа",
             payment_id=payment.id,
         )
+        if not refunded["success"]:
+            await self.rollback()
+            return refunded
 
-        await self.publish_event(
+        self.publish_event(
             PaymentRefundedEvent(
                 payment_id=payment.id,
                 user_id=payment.user_id,
                 amount=payment.amount,
-                reason=reason or "Возврат средств",
+                method=payment.method,
+                reason=short_reason(reason) or "Возврат средств",
+                timestamp=to_ms(now),
             )
         )
-        await self.commit()
-        await self.log(f"Платёж возвращён: {payment.id} (+{payment.amount} UZT)")
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self.balance_service._invalidate_balance(payment.user_id)
+        self.log("Платёж возвращён: {} (+{} UZT)", payment.id, payment.amount)
         return {"success": True, "status": "refunded"}
 
     # -------------------------------------------------
     # 🔹 Получить историю платежей
     # -------------------------------------------------
-    async def get_payment_history(self, user_id: int, limit: int = 50):
+    async def get_payment_history(
+        self, user_id: int, limit: int = 50, cursor: Optional[int] = None
+    ):
         """
-        Возвращает историю платежей пользователя.
+        Возвращает страницу истории платежей пользователя.
+        `cursor` — значение `next_cursor` из предыдущей страницы.
         """
-        payments = await self.payment_repo.get_by_user(user_id, limit)
-        return [p.as_dict() for p in payments]
+        items, next_cursor = await self.payment_repo.get_page_by_user(user_id, limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
 
     # -------------------------------------------------
     # 🔹 Глобальная статистика
@@ -217,5 +226,5 @@ class PaymentService(BaseService):
         Возвращает агрегированные данные по всем платежам.
         """
         stats = await self.payment_repo.get_stats()
-        await self.log("Получена глобальная статистика платежей")
+        self.log("Получена глобальная статистика платежей")
         return stats
@@ -23,7 +23,7 @@ Uzinex Boost — Referral Service
 
 from __future__ import annotations
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -34,7 +34,8 @@ from domain.events.referral_events import (
     ReferralBonusGrantedEvent,
     ReferralLevelUpEvent,
 )
-from domain.services.balance_service import BalanceService
+from domain.events.balance_events import BalanceDepositedEvent
+from domain.events.base import to_ms
 from db.repositories.referral_repository import ReferralRepository
 from db.repositories.user_repository import UserRepository
 
@@ -44,11 +45,12 @@ class ReferralService(BaseService):
     Управляет логикой реферальной программы Uzinex Boost.
     """
 
+    __slots__ = ("ref_repo", "user_repo")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.ref_repo = ReferralRepository(session)
         self.user_repo = UserRepository(session)
-        self.balance_service = BalanceService(session)
 
     # -------------------------------------------------
     # 🔹 Добавить нового реферала
@@ -58,21 +60,24 @@ class ReferralService(BaseService):
         Добавляет нового реферала (приглашённого пользователя).
         """
         total_referrals = await self.ref_repo.count_by_inviter(inviter_id)
-        rule = await ReferralRules.can_invite(inviter_id, total_referrals)
+        rule = ReferralRules.can_invite(inviter_id, total_referrals)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
+        now = datetime.utcnow()
         record = await self.ref_repo.create_referral(
             inviter_id=inviter_id,
             referral_id=referral_id,
-            joined_at=datetime.utcnow(),
+            joined_at=now,
         )
 
-        await self.publish_event(
-            ReferralRegisteredEvent(inviter_id=inviter_id, referral_id=referral_id)
+        self.publish_event(
+            ReferralRegisteredEvent(
+                inviter_id=inviter_id, referral_id=referral_id, timestamp=to_ms(now)
+            )
         )
         await self.commit()
-        await self.log(f"Новый реферал {referral_id} добавлен пользователем {inviter_id}")
+        self.log("Новый реферал {} добавлен пользователем {}", referral_id, inviter_id)
         return {"success": True, "referral_id": record.referral_id}
 
     # -------------------------------------------------
@@ -82,35 +87,40 @@ class ReferralService(BaseService):
         """
         Начисляет бонус за регистрацию приглашённого пользователя.
         """
-        rule = await ReferralRules.can_receive_signup_bonus(referral_joined_at)
+        rule = ReferralRules.can_receive_signup_bonus(referral_joined_at)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
         # Проверка дневного лимита
-        today_sum = await self.ref_repo.get_today_bonus_sum(inviter_id)
-        limit_check = await ReferralRules.check_daily_bonus_limit(today_sum)
+        today_sums = await self.ref_repo.get_today_bonus_sums([inviter_id])
+        today_sum = today_sums.get(inviter_id, 0.0)
+        limit_check = ReferralRules.check_daily_bonus_limit(today_sum)
         if not limit_check.is_allowed:
             return {"success": False, "message": limit_check.message}
 
-        await self.balance_service.deposit(inviter_id, amount=5000)
-
-        await self.ref_repo.add_bonus_record(
+        balance, _, tx_id = await self.ref_repo.grant_bonus_atomic(
             inviter_id=inviter_id,
             referral_id=referral_id,
-            bonus_amount=5000,
+            amount=5000,
             bonus_type="signup",
         )
+        if balance is None:
+            return {"success": False, "message": "Реферальная связь не найдена"}
 
-        await self.publish_event(
+        self.publish_event(
+            BalanceDepositedEvent(user_id=inviter_id, amount=5000, transaction_id=tx_id)
+        )
+        self.publish_event(
             ReferralBonusGrantedEvent(
                 inviter_id=inviter_id,
                 referral_id=referral_id,
                 amount=5000,
-                bonus_type="signup",
+                reason="signup",
             )
         )
         await self.commit()
-        await self.log(f"Бонус за регистрацию начислен пользователю {inviter_id}")
+        await self.balance_service._invalidate_balance(inviter_id)
+        self.log("Бонус за регистрацию начислен пользователю {}", inviter_id)
         return {"success": True, "amount": 5000}
 
     # -------------------------------------------------
@@ -120,37 +130,99 @@ class ReferralService(BaseService):
         """
         Начисляет бонус за активность реферала (выполнил первое задание).
         """
-        rule = await ReferralRules.can_receive_task_bonus(first_task_date)
+        rule = ReferralRules.can_receive_task_bonus(first_task_date)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
         # Проверка лимитов
-        today_sum = await self.ref_repo.get_today_bonus_sum(inviter_id)
-        limit_check = await ReferralRules.check_daily_bonus_limit(today_sum)
+        today_sums = await self.ref_repo.get_today_bonus_sums([inviter_id])
+        today_sum = today_sums.get(inviter_id, 0.0)
+        limit_check = ReferralRules.check_daily_bonus_limit(today_sum)
         if not limit_check.is_allowed:
             return {"success": False, "message": limit_check.message}
 
-        await self.balance_service.deposit(inviter_id, amount=3000)
-
-        await self.ref_repo.add_bonus_record(
+        balance, _, tx_id = await self.ref_repo.grant_bonus_atomic(
             inviter_id=inviter_id,
             referral_id=referral_id,
-            bonus_amount=3000,
+            amount=3000,
             bonus_type="task",
         )
+        if balance is None:
+            return {"success": False, "message": "Реферальная связь не найдена"}
 
-        await self.publish_event(
+        self.publish_event(
+            BalanceDepositedEvent(user_id=inviter_id, amount=3000, transaction_id=tx_id)
+        )
+        self.publish_event(
             ReferralBonusGrantedEvent(
                 inviter_id=inviter_id,
                 referral_id=referral_id,
                 amount=3000,
-                bonus_type="task",
+                reason="task",
             )
         )
         await self.commit()
-        await self.log(f"Бонус за активность начислен пользователю {inviter_id}")
+        await self.balance_service._invalidate_balance(inviter_id)
+        self.log("Бонус за активность начислен пользователю {}", inviter_id)
         return {"success": True, "amount": 3000}
 
+    # -------------------------------------------------
+    # 🔹 Пакетное начисление бонусов
+    # -------------------------------------------------
+    async def grant_bonuses_bulk(self, items: Sequence[Tuple[int, int, float, str]]):
+        """
+        Начисляет пачку бонусов `(inviter_id, referral_id, amount, bonus_type)`
+        (массовые регистрации в кампаниях): дневной лимит проверяется по одному
+        агрегирующему запросу, начисление — одним запросом, события — одним INSERT в outbox.
+        """
+        today_sums = await self.ref_repo.get_today_bonus_sums(item[0] for item in items)
+
+        # Лимит проверяется так же, как в одиночных начислениях, с учётом уже принятых в пачке
+        accepted: List[Tuple[int, int, float, str]] = []
+        skipped: List[Dict] = []
+        for inviter_id, referral_id, amount, bonus_type in items:
+            today_sum = today_sums.get(inviter_id, 0.0)
+            limit_check = ReferralRules.check_daily_bonus_limit(today_sum)
+            if not limit_check.is_allowed:
+                skipped.append(
+                    {
+                        "inviter_id": inviter_id,
+                        "referral_id": referral_id,
+                        "message": limit_check.message,
+                    }
+                )
+                continue
+            today_sums[inviter_id] = today_sum + amount
+            accepted.append((inviter_id, referral_id, amount, bonus_type))
+
+        granted = await self.ref_repo.grant_bonuses_bulk(accepted)
+        timestamp = to_ms(datetime.utcnow())
+        for inviter_id, referral_id, amount, bonus_type, _ in granted:
+            self.publish_event(
+                BalanceDepositedEvent(user_id=inviter_id, amount=amount, timestamp=timestamp)
+            )
+            self.publish_event(
+                ReferralBonusGrantedEvent(
+                    inviter_id=inviter_id,
+                    referral_id=referral_id,
+                    amount=amount,
+                    reason=bonus_type,
+                    timestamp=timestamp,
+                )
+            )
+        await self.commit()
+
+        inviters = {row[0] for row in granted}
+        if inviters:
+            await self.balance_service._invalidate_balance(*inviters)
+        self.log("Пакетно начислено бонусов: {} (пропущено {})", len(granted), len(skipped))
+        return {
+            "success": True,
+            "granted": len(granted),
+            "not_found": len(accepted) - len(granted),
+            "skipped": skipped,
+        }
+
     # -------------------------------------------------
     # 🔹 Проверка и повышение уровня
     # -------------------------------------------------
@@ -165,32 +237,34 @@ class ReferralService(BaseService):
         active_referrals = await self.ref_repo.count_active_referrals(inviter_id)
         current_level = inviter.referral_level or 0
 
-        rule = await ReferralRules.can_level_up(active_referrals, current_level)
+        rule = ReferralRules.can_level_up(active_referrals, current_level)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
         inviter.referral_level = rule.metadata.get("new_level")
-        await self.commit()
-
-        await self.publish_event(
+        self.publish_event(
             ReferralLevelUpEvent(
-                inviter_id=inviter_id,
+                user_id=inviter_id,
                 new_level=inviter.referral_level,
-                active_referrals=active_referrals,
             )
         )
-        await self.log(f"Пользователь {inviter_id} повысил уровень до {inviter.referral_level}")
+        await self.commit()
+
+        self.log("Пользователь {} повысил уровень до {}", inviter_id, inviter.referral_level)
         return {"success": True, "new_level": inviter.referral_level}
 
     # -------------------------------------------------
     # 🔹 Получение списка рефералов
     # -------------------------------------------------
-    async def get_user_referrals(self, inviter_id: int, limit: int = 50):
+    async def get_user_referrals(
+        self, inviter_id: int, limit: int = 50, cursor: Optional[int] = None
+    ):
         """
-        Возвращает список рефералов пользователя.
+        Возвращает страницу рефералов пользователя.
+        `cursor` — значение `next_cursor` из предыдущей страницы.
         """
-        refs = await self.ref_repo.get_by_inviter(inviter_id, limit)
-        return [r.as_dict() for r in refs]
+        items, next_cursor = await self.ref_repo.get_page_by_referrer(inviter_id, limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
 
     # -------------------------------------------------
     # 🔹 Получение общей статистики
@@ -200,5 +274,5 @@ class ReferralService(BaseService):
         Возвращает глобальную статистику по реферальной системе.
         """
         stats = await self.ref_repo.get_stats()
-        await self.log("Получена глобальная статистика реферальной программы")
+        self.log("Получена глобальная статистика реферальной программы")
         return stats
@@ -18,16 +18,95 @@ Uzinex Boost — Stats Service
 from __future__ import annotations
 import time
 import logging
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import TextClause, func, select, text
 
+import db.models  # noqa: F401 — регистрирует таблицы в Base.metadata
 from adapters.cache.redis_cache import RedisCache
+from db.base import Base
+from db.models.order_model import Order, OrderStatus
+from db.models.payment_model import Payment, PaymentStatus
+from db.models.task_model import Task
+from db.models.user_model import User
 
 logger = logging.getLogger("uzinex.domain.stats")
 
 
+# -------------------------------------------------
+# 🔹 Кэширование сводки
+# -------------------------------------------------
+STATS_CACHE_KEY = "stats:platform_summary"
+STATS_STALE_KEY = f"{STATS_CACHE_KEY}:stale"  # последняя сводка для проигравших блокировку
+STATS_LOCK_KEY = f"{STATS_CACHE_KEY}:lock"
+STATS_CACHE_TTL = 60
+STATS_STALE_TTL = 600
+STATS_LOCK_TTL = 10  # страховка: блокировка истечёт, даже если владелец упал
+STATS_LOCAL_TTL_S = 5.0  # повторные запросы в том же процессе — без Redis и json.loads
+
+# Разобранная сводка в памяти процесса: (момент истечения по time.monotonic(), данные)
+_local_stats: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+# Все агрегаты дашборда — скалярные подзапросы одного SELECT: один round-trip к БД.
+# Запрос строится по таблицам моделей: имена таблиц и значения статусов берутся из схемы
+_users = User.__table__
+_tasks = Task.__table__
+_orders = Order.__table__
+_payments = Payment.__table__
+
+_PLATFORM_STATS_SQL = select(
+    select(func.count()).select_from(_users).scalar_subquery().label("users"),
+    select(func.count()).select_from(_tasks).scalar_subquery().label("tasks"),
+    select(func.count())
+    .select_from(_orders)
+    .where(_orders.c.status == OrderStatus.ACTIVE)
+    .scalar_subquery()
+    .label("orders_active"),
+    select(func.coalesce(func.sum(_payments.c.amount), 0))
+    .where(_payments.c.status == PaymentStatus.VERIFIED)
+    .scalar_subquery()
+    .label("payments_total"),
+    select(func.coalesce(func.avg(_users.c.balance), 0))
+    .scalar_subquery()
+    .label("avg_balance"),
+)
+
+
+# Агрегатные функции вспомогательных методов: {} — имя столбца
+_AGGREGATES = {
+    "count": "COUNT(*)",
+    "sum": "COALESCE(SUM({}), 0)",
+    "avg": "COALESCE(AVG({}), 0)",
+}
+
+
+@lru_cache(maxsize=64)
+def _aggregate_stmt(
+    kind: str, table: str, column: Optional[str] = None, where: Optional[str] = None
+) -> TextClause:
+    """
+    Возвращает (и кэширует) SQL агрегата для формы запроса (kind, table, column, where).
+    Один и тот же объект `text()` переиспользуется: SQLAlchemy не разбирает его заново,
+    asyncpg берёт подготовленный запрос из кэша соединения.
+
+    Таблица и столбец подставляются в SQL, поэтому проверяются по схеме моделей;
+    `where` — только константные условия из кода сервиса, не из пользовательского ввода.
+    """
+    known = Base.metadata.tables.get(table)
+    if known is None:
+        raise ValueError(f"Unknown table for stats aggregate: {table!r}")
+    if column is not None and column not in known.c:
+        raise ValueError(f"Unknown column for stats aggregate: {table}.{column}")
+
+    query = f"SELECT {_AGGREGATES[kind].format(column)} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    return text(query)
+
+
 class StatsService:
     """
     StatsService — агрегатор аналитических данных о платформе.
@@ -49,30 +128,48 @@ class StatsService:
         - общий оборот (сумма всех платежей)
         - средний баланс пользователя
         """
-        cache_key = "stats:platform_summary"
-        if use_cache and self.cache:
-            cached = await self.cache.get(cache_key)
-            if cached:
-                logger.debug("📦 Stats fetched from cache")
-                return self.cache.from_json(cached)
+        locked = False
+        if use_cache:
+            if _local_stats is not None and _local_stats[0] > time.monotonic():
+                return _local_stats[1]
+            if self.cache:
+                cached = await self.cache.get(STATS_CACHE_KEY)
+                if cached:
+                    logger.debug("📦 Stats fetched from cache")
+                    return self._remember(self.cache.from_json(cached))
+
+                # Промах: агрегаты считает один воркер, остальные отдают прошлую сводку
+                locked = await self.cache.set_nx(STATS_LOCK_KEY, "1", expire=STATS_LOCK_TTL)
+                if not locked:
+                    stale = await self.cache.get(STATS_STALE_KEY)
+                    if stale:
+                        logger.debug("📦 Stats served stale while another worker refreshes")
+                        return self.cache.from_json(stale)
 
+        try:
+            return await self._collect_platform_stats()
+        finally:
+            if locked:
+                await self.cache.delete(STATS_LOCK_KEY)
+
+    @staticmethod
+    def _remember(stats: Dict[str, Any]) -> Dict[str, Any]:
+        global _local_stats
+        _local_stats = (time.monotonic() + STATS_LOCAL_TTL_S, stats)
+        return stats
+
+    async def _collect_platform_stats(self) -> Dict[str, Any]:
+        """Считает сводку в БД и обновляет свежий и «устаревший» ключи кэша."""
         start = time.perf_counter()
 
         try:
-            # Общее количество пользователей
-            users = await self._count("users")
-
-            # Общее количество заданий
-            tasks = await self._count("tasks")
-
-            # Активные заказы
-            orders_active = await self._count("orders", where="status = 'active'")
-
-            # Общая сумма платежей
-            total_payments = await self._sum("payments", "amount", where="status = 'completed'")
-
-            # Средний баланс пользователя
-            avg_balance = await self._avg("balances", "amount")
+            # Пользователи, задания, активные заказы, оборот и средний баланс — одним запросом
+            row = (await self.db.execute(_PLATFORM_STATS_SQL)).mappings().one()
+            users = int(row["users"])
+            tasks = int(row["tasks"])
+            orders_active = int(row["orders_active"])
+            total_payments = row["payments_total"]
+            avg_balance = row["avg_balance"]
 
             stats = {
                 "users_total": users,
@@ -83,9 +180,10 @@ class StatsService:
                 "elapsed_seconds": round(time.perf_counter() - start, 3),
             }
 
-            # Сохраняем в кэш (TTL = 60 сек)
             if self.cache:
-                await self.cache.set(cache_key, stats, expire=60)
+                await self.cache.set(STATS_CACHE_KEY, stats, expire=STATS_CACHE_TTL)
+                await self.cache.set(STATS_STALE_KEY, stats, expire=STATS_STALE_TTL)
+            self._remember(stats)
 
             logger.info(
                 f"📊 Stats summary → users={users}, tasks={tasks}, orders={orders_active}, "
@@ -102,24 +200,15 @@ class StatsService:
     # -------------------------------------------------
     async def _count(self, table: str, where: Optional[str] = None) -> int:
         """Подсчитывает количество строк в таблице."""
-        query = f"SELECT COUNT(*) FROM {table}"
-        if where:
-            query += f" WHERE {where}"
-        result = await self.db.execute(text(query))
+        result = await self.db.execute(_aggregate_stmt("count", table, None, where))
         return int(result.scalar() or 0)
 
     async def _sum(self, table: str, column: str, where: Optional[str] = None) -> float:
         """Суммирует значения столбца."""
-        query = f"SELECT COALESCE(SUM({column}), 0) FROM {table}"
-        if where:
-            query += f" WHERE {where}"
-        result = await self.db.execute(text(query))
+        result = await self.db.execute(_aggregate_stmt("sum", table, column, where))
         return float(result.scalar() or 0)
 
     async def _avg(self, table: str, column: str, where: Optional[str] = None) -> float:
         """Вычисляет среднее значение по столбцу."""
-        query = f"SELECT COALESCE(AVG({column}), 0) FROM {table}"
-        if where:
-            query += f" WHERE {where}"
-        result = await self.db.execute(text(query))
+        result = await self.db.execute(_aggregate_stmt("avg", table, column, where))
         return float(result.scalar() or 0)
@@ -22,7 +22,8 @@ Uzinex Boost — Task Service
 """
 
 from __future__ import annotations
-from typing import Optional
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -36,21 +37,32 @@ from domain.events.task_events import (
     TaskApprovedEvent,
     TaskRejectedEvent,
 )
-from domain.services.balance_service import BalanceService
+from domain.events.balance_events import BalanceDepositedEvent
+from domain.events.base import short_reason, to_ms
+from db.models.balance_model import TransactionType
 from db.repositories.task_repository import TaskRepository
+from db.repositories.transaction_repository import TransactionRepository
 from db.repositories.user_repository import UserRepository
 
 
+TASK_STATS_LOCAL_TTL_S = 30.0  # глобальная статистика допускает устаревание на десятки секунд
+
+# Сводка в памяти процесса: (момент истечения по time.monotonic(), данные)
+_local_task_stats: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 class TaskService(BaseService):
     """
     Управляет заданиями пользователей: создание, выполнение, проверка, оплата.
     """
 
+    __slots__ = ("task_repo", "tx_repo", "user_repo")
+
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.task_repo = TaskRepository(session)
+        self.tx_repo = TransactionRepository(session)
         self.user_repo = UserRepository(session)
-        self.balance_service = BalanceService(session)
 
     # -------------------------------------------------
     # 🔹 Создание нового задания
@@ -70,29 +82,52 @@ class TaskService(BaseService):
         if not creator:
             return {"success": False, "message": "Пользователь не найден"}
 
-        active_tasks = await self.task_repo.count_active_by_user(creator_id)
-        rule = await TaskRules.can_create_task(creator, reward, active_tasks)
+        rule = TaskRules.can_create_task(creator, reward, creator.active_tasks_count)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        # Проверка баланса (создатель должен заморозить вознаграждение)
-        balance = await self.balance_service.get_balance(creator_id)
-        if balance is None or balance < reward:
+        # Проверка баланса (создатель должен заморозить вознаграждение): строка создателя
+        # уже загружена выше — отдельный запрос баланса не нужен
+        if creator.balance < reward:
             return {"success": False, "message": "Недостаточно средств на балансе"}
 
-        await self.balance_service.withdraw(creator_id, reward)
+        now = datetime.utcnow()
 
         task = await self.task_repo.create_task(
             creator_id=creator_id,
             title=title,
             description=description,
             reward=reward,
-            deadline=deadline or datetime.utcnow() + timedelta(days=3),
+            deadline=deadline or now + timedelta(days=3),
         )
 
-        await self.publish_event(TaskCreatedEvent(task_id=task.id, creator_id=creator_id, reward=reward))
-        await self.commit()
-        await self.log(f"Создано задание {task.id} пользователем {creator_id}")
+        # Удержание вознаграждения (ESCROW), задание и события фиксируются одним коммитом
+        # ниже; лимиты вывода к удержанию не применяются
+        held = await self.balance_service.debit_nocommit(
+            creator_id,
+            reward,
+            TransactionType.ESCROW,
+            reason="task",
+            description=f"Удержание за задание {task.id}",
+            task_id=task.id,
+        )
+        if not held["success"]:
+            await self.rollback()
+            return held
+
+        self.publish_event(
+            TaskCreatedEvent(
+                task_id=task.id,
+                creator_id=creator_id,
+                title=title,
+                reward=reward,
+                timestamp=to_ms(now),
+            )
+        )
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self.balance_service._invalidate_balance(creator_id)
+        self.log("Создано задание {} пользователем {}", task.id, creator_id)
         return {"success": True, "task_id": task.id}
 
     # -------------------------------------------------
@@ -102,26 +137,29 @@ class TaskService(BaseService):
         """
         Исполнитель принимает задание в выполнение.
         """
-        performer = await self.user_repo.get_by_id(performer_id)
-        task = await self.task_repo.get_by_id(task_id)
-
-        if not performer or not task:
+        # Исполнитель, задание и его текущая нагрузка — одним запросом
+        context = await self.task_repo.get_task_with_context(task_id, performer_id)
+        if context is None:
             return {"success": False, "message": "Пользователь или задание не найдено"}
+        performer, task, active_tasks = context
         if task.status != "open":
             return {"success": False, "message": "Задание недоступно для принятия"}
 
-        active_tasks = await self.task_repo.count_active_by_user(performer_id)
-        rule = await TaskRules.can_accept_task(performer, active_tasks)
+        rule = TaskRules.can_accept_task(performer, active_tasks)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
         task.performer_id = performer_id
         task.status = "in_progress"
-        task.accepted_at = datetime.utcnow()
+        now = datetime.utcnow()
+        task.accepted_at = now
+        await self.user_repo.adjust_active_tasks(performer_id, 1)
 
-        await self.publish_event(TaskAcceptedEvent(task_id=task.id, performer_id=performer_id))
+        self.publish_event(
+            TaskAcceptedEvent(task_id=task.id, user_id=performer_id, timestamp=to_ms(now))
+        )
         await self.commit()
-        await self.log(f"Исполнитель {performer_id} принял задание {task_id}")
+        self.log("Исполнитель {} принял задание {}", performer_id, task_id)
         return {"success": True, "status": "in_progress"}
 
     # -------------------------------------------------
@@ -135,16 +173,21 @@ class TaskService(BaseService):
         if not task or task.performer_id != performer_id:
             return {"success": False, "message": "Неверный исполнитель или задание"}
 
-        rule = await TaskRules.can_complete_task(task.status, task.deadline)
+        now = datetime.utcnow()
+        rule = TaskRules.can_complete_task(task.status, task.deadline, now=now)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
         task.status = "review"
-        task.completed_at = datetime.utcnow()
+        task.completed_at = now
 
-        await self.publish_event(TaskCompletedEvent(task_id=task.id, performer_id=performer_id))
+        self.publish_event(
+            TaskCompletedEvent(
+                task_id=task.id, user_id=performer_id, reward=task.reward, timestamp=to_ms(now)
+            )
+        )
         await self.commit()
-        await self.log(f"Задание {task_id} завершено исполнителем {performer_id}")
+        self.log("Задание {} завершено исполнителем {}", task_id, performer_id)
         return {"success": True, "status": "review"}
 
     # -------------------------------------------------
@@ -153,24 +196,24 @@ class TaskService(BaseService):
     async def approve_task(self, task_id: int, reviewer_role: str):
         """
         Модератор утверждает выполнение задания.
+        Одобрение одного задания — пакет из одного (`_approve`): те же статусы,
+        выплата и тип транзакции, что и в `approve_tasks`.
         """
-        task = await self.task_repo.get_by_id(task_id)
-        if not task:
-            return {"success": False, "message": "Задание не найдено"}
-
-        rule = await TaskRules.can_approve_task(reviewer_role, task.status)
+        rule = TaskRules.can_review_tasks(reviewer_role)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        task.status = "approved"
-        task.reviewed_at = datetime.utcnow()
-
-        # Выплата исполнителю
-        await self.balance_service.deposit(task.performer_id, task.reward)
-
-        await self.publish_event(TaskApprovedEvent(task_id=task.id, performer_id=task.performer_id, reward=task.reward))
-        await self.commit()
-        await self.log(f"Задание {task.id} одобрено модератором")
+        approved = await self._approve([task_id])
+        if approved is None:
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        if not approved:
+            # Ничего не обновлено — выясняем причину для ответа
+            task = await self.task_repo.get_by_id(task_id)
+            if not task:
+                return {"success": False, "message": "Задание не найдено"}
+            return {"success": False, "message": "Задание должно находиться на проверке"}
+
+        self.log("Задание {} одобрено модератором", task_id)
         return {"success": True, "status": "approved"}
 
     # -------------------------------------------------
@@ -179,26 +222,127 @@ class TaskService(BaseService):
     async def reject_task(self, task_id: int, reviewer_role: str, reason: str):
         """
         Модератор отклоняет выполнение задания.
+        Вознаграждение возвращается из бюджета заказа заказчику, задание снимается
+        со счётчика исполнителя — одним коммитом.
         """
-        task = await self.task_repo.get_by_id(task_id)
-        if not task:
-            return {"success": False, "message": "Задание не найдено"}
+        rule = TaskRules.can_review_tasks(reviewer_role)
+        if not rule.is_allowed:
+            return {"success": False, "message": rule.message}
+
+        # Статус проверяется в самом UPDATE: повторное отклонение ничего не вернёт
+        rejected = await self.task_repo.reject_pending(task_id)
+        if rejected is None:
+            if await self.task_repo.get_by_id(task_id) is None:
+                return {"success": False, "message": "Задание не найдено"}
+            return {"success": False, "message": "Задание должно находиться на проверке"}
+        performer_id, order_id, creator_id, reward = rejected
+
+        # Возврат удержанного вознаграждения заказчику — в той же транзакции,
+        # что и смена статуса; без возврата отклонение не фиксируется
+        refunded = await self.balance_service.credit_nocommit(
+            creator_id,
+            reward,
+            TransactionType.ESCROW,
+            description=f"Возврат за отклонённое задание {task_id}",
+            order_id=order_id,
+            task_id=task_id,
+        )
+        if not refunded["success"]:
+            await self.rollback()
+            return refunded
+        await self.user_repo.adjust_active_tasks(performer_id, -1)
+
+        now = datetime.utcnow()
+        self.publish_event(
+            TaskRejectedEvent(
+                task_id=task_id,
+                user_id=performer_id,
+                reason=short_reason(reason),
+                timestamp=to_ms(now),
+            )
+        )
+        if not await self.commit():
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        await self.balance_service._invalidate_balance(creator_id)
+        self.log("Задание {} отклонено: {}", task_id, reason)
+        return {"success": True, "status": "rejected"}
 
-        rule = await TaskRules.can_approve_task(reviewer_role, task.status)
+    # -------------------------------------------------
+    # 🔹 Пакетное одобрение заданий
+    # -------------------------------------------------
+    async def approve_tasks(self, task_ids: Sequence[int], reviewer_role: str):
+        """
+        Одобряет несколько заданий сразу: один UPDATE заданий, один UPDATE балансов
+        исполнителей, один INSERT транзакций и один коммит на всю пачку.
+        """
+        rule = TaskRules.can_review_tasks(reviewer_role)
         if not rule.is_allowed:
             return {"success": False, "message": rule.message}
 
-        task.status = "rejected"
-        task.reviewed_at = datetime.utcnow()
-        task.reject_reason = reason
+        approved = await self._approve(task_ids)
+        if approved is None:
+            return {"success": False, "message": "Операция не сохранена, попробуйте позже"}
+        self.log("Пакетно одобрено заданий: {} из {}", len(approved), len(task_ids))
+        return {"success": True, "approved": approved}
 
-        # Возврат средств заказчику
-        await self.balance_service.deposit(task.creator_id, task.reward)
+    async def _approve(self, task_ids: Sequence[int]) -> Optional[List[int]]:
+        """
+        Общий путь одобрения (одно задание или пакет): PENDING → COMPLETED с учётом
+        выплат в бюджетах заказов, выплата исполнителям с транзакциями TASK_REWARD и события — одним коммитом.
+        Вознаграждение — цена действия заказа, уже удержанная в эскроу, поэтому
+        границы пополнения (BalanceRules.can_deposit) к выплате не применяются.
+        Возвращает ID одобренных заданий или None, если коммит не удался.
+        """
+        now = datetime.utcnow()
+        approved = await self.task_repo.approve_many(task_ids, now)
+        if not approved:
+            return []
+
+        # Одобренное задание снимается со счётчика исполнителя (users.active_tasks_count)
+        rewards: Dict[int, float] = {}
+        finished: Dict[int, int] = {}
+        for _, performer_id, _, reward in approved:
+            rewards[performer_id] = rewards.get(performer_id, 0.0) + reward
+            finished[performer_id] = finished.get(performer_id, 0) - 1
+        balances = await self.user_repo.bulk_credit(rewards)
+        await self.user_repo.bulk_adjust_active_tasks(finished)
+
+        paid = [
+            (task_id, performer_id, reward)
+            for task_id, performer_id, _, reward in approved
+            if performer_id in balances
+        ]
+        tx_ids = await self.tx_repo.create_transactions_bulk(
+            [
+                {
+                    "user_id": user_id,
+                    "amount": reward,
+                    "type": TransactionType.TASK_REWARD,
+                    "description": f"Вознаграждение за задание {task_id}",
+                    "task_id": task_id,
+                }
+                for task_id, user_id, reward in paid
+            ]
+        )
 
-        await self.publish_event(TaskRejectedEvent(task_id=task.id, reason=reason))
-        await self.commit()
-        await self.log(f"Задание {task.id} отклонено: {reason}")
-        return {"success": True, "status": "rejected"}
+        timestamp = to_ms(now)
+        for (task_id, user_id, reward), tx_id in zip(paid, tx_ids):
+            self.publish_event(
+                BalanceDepositedEvent(
+                    user_id=user_id, amount=reward, transaction_id=tx_id, timestamp=timestamp
+                )
+            )
+            self.publish_event(
+                TaskApprovedEvent(
+                    task_id=task_id, user_id=user_id, reward=reward, timestamp=timestamp
+                )
+            )
+        if not await self.commit():
+            return None
+
+        if balances:
+            await self.balance_service._invalidate_balance(*balances)
+        return [row[0] for row in approved]
 
     # -------------------------------------------------
     # 🔹 Получение заданий пользователя
@@ -208,18 +352,21 @@ class TaskService(BaseService):
         Возвращает список заданий пользователя (созданных или выполняемых).
         """
         if role == "creator":
-            tasks = await self.task_repo.get_by_creator(user_id, limit)
-        else:
-            tasks = await self.task_repo.get_by_performer(user_id, limit)
-        return [t.as_dict() for t in tasks]
+            return await self.task_repo.get_rows_by_creator(user_id, limit)
+        return await self.task_repo.get_rows_by_performer(user_id, limit)
 
     # -------------------------------------------------
     # 🔹 Аналитика по заданиям
     # -------------------------------------------------
     async def get_global_stats(self):
         """
-        Возвращает статистику по заданиям.
+        Возвращает статистику по заданиям (кэшируется в памяти процесса).
         """
+        global _local_task_stats
+        if _local_task_stats is not None and _local_task_stats[0] > time.monotonic():
+            return _local_task_stats[1]
+
         stats = await self.task_repo.get_stats()
-        await self.log("Получена глобальная статистика заданий")
+        _local_task_stats = (time.monotonic() + TASK_STATS_LOCAL_TTL_S, stats)
+        self.log("Получена глобальная статистика заданий")
         return stats
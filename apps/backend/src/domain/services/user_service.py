@@ -21,7 +21,8 @@ Uzinex Boost — User Service
 """
 
 from __future__ import annotations
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -34,14 +35,23 @@ from domain.events.user_events import (
     UserDeactivatedEvent,
     UserDeletedEvent,
 )
+from domain.events.base import short_reason
 from db.repositories.user_repository import UserRepository
 
 
+USER_STATS_LOCAL_TTL_S = 30.0  # сводка по пользователям допускает устаревание на десятки секунд
+
+# Сводка в памяти процесса: (момент истечения по time.monotonic(), данные)
+_local_user_stats: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 class UserService(BaseService):
     """
     Управляет жизненным циклом пользователей.
     """
 
+    __slots__ = ("user_repo",)
+
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.user_repo = UserRepository(session)
@@ -71,7 +81,7 @@ class UserService(BaseService):
             referral_id=referral_id,
         )
 
-        await self.publish_event(
+        self.publish_event(
             UserRegisteredEvent(
                 user_id=user.id,
                 email=user.email,
@@ -80,7 +90,7 @@ class UserService(BaseService):
             )
         )
         await self.commit()
-        await self.log(f"Пользователь зарегистрирован: {username}")
+        self.log("Пользователь зарегистрирован: {}", username)
         return {"success": True, "user_id": user.id}
 
     # -------------------------------------------------
@@ -95,10 +105,10 @@ class UserService(BaseService):
             return {"success": False, "message": "Пользователь не найден"}
 
         user.is_verified = True
+        self.publish_event(UserVerifiedEvent(user_id=user.id, email=user.email))
         await self.commit()
 
-        await self.publish_event(UserVerifiedEvent(user_id=user.id, email=user.email))
-        await self.log(f"Пользователь верифицирован: {user.email}")
+        self.log("Пользователь верифицирован: {}", user.email)
         return {"success": True, "message": "Аккаунт подтверждён"}
 
     # -------------------------------------------------
@@ -126,7 +136,7 @@ class UserService(BaseService):
             user_id=user_id, username=username, full_name=full_name, bio=bio
         )
 
-        await self.publish_event(
+        self.publish_event(
             UserProfileUpdatedEvent(
                 user_id=user_id,
                 username=updated_user.username,
@@ -135,7 +145,7 @@ class UserService(BaseService):
             )
         )
         await self.commit()
-        await self.log(f"Профиль обновлён: {user_id}")
+        self.log("Профиль обновлён: {}", user_id)
         return {"success": True, "message": "Профиль успешно обновлён"}
 
     # -------------------------------------------------
@@ -150,12 +160,12 @@ class UserService(BaseService):
             return {"success": False, "message": "Пользователь не найден"}
 
         user.is_active = False
+        self.publish_event(
+            UserDeactivatedEvent(user_id=user_id, reason=short_reason(reason) or "Manual block")
+        )
         await self.commit()
 
-        await self.publish_event(
-            UserDeactivatedEvent(user_id=user_id, reason=reason or "Manual block")
-        )
-        await self.log(f"Пользователь деактивирован: {user_id}")
+        self.log("Пользователь деактивирован: {}", user_id)
         return {"success": True, "message": "Пользователь деактивирован"}
 
     # -------------------------------------------------
@@ -170,11 +180,11 @@ class UserService(BaseService):
             return {"success": False, "message": "Пользователь не найден"}
 
         await self.user_repo.delete(user_id)
-        await self.publish_event(
+        self.publish_event(
             UserDeletedEvent(user_id=user_id, deleted_by_admin=deleted_by_admin)
         )
         await self.commit()
-        await self.log(f"Пользователь удалён: {user_id}")
+        self.log("Пользователь удалён: {}", user_id)
         return {"success": True, "message": "Аккаунт успешно удалён"}
 
     # -------------------------------------------------
@@ -183,16 +193,14 @@ class UserService(BaseService):
     async def get_user_stats(self):
         """
         Возвращает агрегированную статистику по пользователям.
+        Все счётчики считаются одним запросом; результат кэшируется в памяти процесса.
         """
-        total_users = await self.user_repo.count_all()
-        verified_users = await self.user_repo.count_verified()
-        active_users = await self.user_repo.count_active()
+        global _local_user_stats
+        if _local_user_stats is not None and _local_user_stats[0] > time.monotonic():
+            return _local_user_stats[1]
 
-        stats = {
-            "total": total_users,
-            "verified": verified_users,
-            "active": active_users,
-        }
+        stats = await self.user_repo.get_stats()
+        _local_user_stats = (time.monotonic() + USER_STATS_LOCAL_TTL_S, stats)
 
-        await self.log(f"Получена статистика пользователей: {stats}")
+        self.log("Получена статистика пользователей: {}", stats)
         return stats
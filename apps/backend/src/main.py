@@ -102,6 +102,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# -------------------------------------------------
+# 🔹 Кэш бизнес-правил на время запроса
+# -------------------------------------------------
+from domain.rules.base import begin_request_memo, end_request_memo
+
+
+@app.middleware("http")
+async def rule_request_memo(request, call_next):
+    """Повторные проверки правил с теми же данными в одном запросе не пересчитываются."""
+    token = begin_request_memo()
+    try:
+        return await call_next(request)
+    finally:
+        end_request_memo(token)
+
+
 # -------------------------------------------------
 # 🔹 Логирование и запуск
 # -------------------------------------------------
@@ -143,6 +159,9 @@ async def on_startup():
         app.state.startup_errors.append(error_message)
     else:
         app.state.database_ready = True
+        from domain.events.outbox import outbox_relay
+
+        outbox_relay.start()
     await init_app()
     logger.success("✅ Application startup completed.")
 
@@ -151,8 +170,17 @@ async def on_startup():
 async def on_shutdown():
     """Выполняется при завершении приложения."""
     logger.info("🧹 Shutting down Uzinex Boost backend...")
+    from domain.events.bus import event_batcher
+    from domain.events.outbox import outbox_relay
+    from domain.services.health_service import HealthService
+
+    if app.state.database_ready:
+        await outbox_relay.stop()
+    await event_batcher.close()
+    await HealthService.close_http()
     await asyncio.sleep(0.1)
     logger.success("🛑 Application stopped gracefully.")
+    await logger.complete()
 
 # -------------------------------------------------
 # 🔹 Healthcheck Endpoint